@@ -54,6 +54,7 @@ setup(name='openmdao.devtools',
                 "release=openmdao.devtools.releasetools:release",
                 "push_dists=openmdao.devtools.push_dists:main",
                 "remote_build=openmdao.devtools.remote_build:main",
+                "import_timing=openmdao.devtools.import_timing:main",
               ],
       }
     )
@@ -0,0 +1,95 @@
+"""
+Measure the startup cost of the public OpenMDAO API modules.
+
+Each module is imported in a fresh interpreter so that the times don't
+depend on what was imported before. For each module the wall clock time of
+the import is reported along with which of the heavy optional dependencies
+it caused to be loaded.
+"""
+
+import os
+import subprocess
+import sys
+from optparse import OptionParser
+
+API_MODULES = [
+    'openmdao.main.api',
+    'openmdao.main.datatypes.api',
+    'openmdao.lib.datatypes.api',
+    'openmdao.lib.components.api',
+    'openmdao.lib.drivers.api',
+    'openmdao.lib.casehandlers.api',
+    'openmdao.lib.doegenerators.api',
+    'openmdao.lib.differentiators.api',
+    'openmdao.lib.surrogatemodels.api',
+    'openmdao.lib.architectures.api',
+    'openmdao.lib.optproblems.api',
+]
+
+HEAVY_MODULES = ['sympy', 'scipy', 'networkx', 'pkg_resources', 'numpy',
+                 'enthought.traits.api', 'zope.interface']
+
+_TIMER = """
+import sys, time
+start = time.time()
+__import__(%(module)r)
+elapsed = time.time() - start
+loaded = [name for name in %(heavy)r if name in sys.modules]
+print '%%f %%s' %% (elapsed, ','.join(loaded))
+"""
+
+
+def time_import(module, python=None):
+    """
+    Import `module` in a new `python` process. Returns ``(seconds, loaded)``
+    where `loaded` is the list of :data:`HEAVY_MODULES` that the import
+    brought in.
+    """
+    python = python or sys.executable
+    code = _TIMER % dict(module=module, heavy=HEAVY_MODULES)
+    proc = subprocess.Popen([python, '-c', code], stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE)
+    out, err = proc.communicate()
+    if proc.returncode:
+        raise RuntimeError("import of %s failed: %s" % (module, err.strip()))
+    elapsed, _, loaded = out.strip().splitlines()[-1].partition(' ')
+    return (float(elapsed), [name for name in loaded.split(',') if name])
+
+
+def main(argv=None):
+    """
+    Time the import of each public API module (or those given on the
+    command line) and print a table, optionally recording it as CSV.
+    """
+    parser = OptionParser(usage="%prog [options] [MODULE ...]")
+    parser.add_option("-n", "--repeat", type="int", default=3,
+                      help="number of imports per module, best is reported")
+    parser.add_option("-o", "--output", help="append results to this CSV file")
+    parser.add_option("--python", help="python interpreter to use")
+    (options, args) = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    modules = args or API_MODULES
+    results = []
+    for module in modules:
+        try:
+            runs = [time_import(module, options.python)
+                    for i in range(max(options.repeat, 1))]
+        except RuntimeError as err:
+            print str(err)
+            continue
+        elapsed = min(run[0] for run in runs)
+        loaded = runs[0][1]
+        results.append((module, elapsed, loaded))
+        print '%-36s %8.3f  %s' % (module, elapsed, ' '.join(loaded))
+
+    if options.output:
+        new = not os.path.exists(options.output)
+        with open(options.output, 'a') as out:
+            if new:
+                out.write('module,seconds,%s\n' % ','.join(HEAVY_MODULES))
+            for module, elapsed, loaded in results:
+                flags = [str(int(name in loaded)) for name in HEAVY_MODULES]
+                out.write('%s,%f,%s\n' % (module, elapsed, ','.join(flags)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+"""A CaseRecorder and CaseIterator that store cases by column in a
+directory. Each numeric variable is kept in its own binary file that grows
+as cases are recorded, so all values of a variable can be accessed as a
+single memory-mapped NumPy array without reading the rest of the cases.
+A second file per variable holds a byte per case telling whether the
+variable was present in that case.
+"""
+
+import json
+import os
+from cPickle import dump, load, HIGHEST_PROTOCOL
+
+from numpy import array, can_cast, dtype, memmap, nan, ndarray, generic, \
+                  zeros
+
+# pylint: disable-msg=E0611,F0401
+from openmdao.main.interfaces import implements, ICaseRecorder, ICaseIterator
+from openmdao.main.case import Case
+
+_INDEX_FILE = 'index.json'
+_CASES_FILE = 'cases.pkl'
+_PRESENT = '\x01'
+_MISSING = '\x00'
+
+
+def _column_info(value):
+    """Return a tuple of the form (dtype, shape, is_python_scalar) if value
+    can be stored in a column, or None if it can't.
+    """
+    if isinstance(value, bool):
+        return (dtype(bool), (), True)
+    if isinstance(value, (int, float)):
+        typ = dtype(type(value))
+        return (typ, (), not isinstance(value, generic))
+    if isinstance(value, (ndarray, generic)) and value.dtype.kind in 'biuf':
+        return (value.dtype, value.shape, False)
+    return None
+
+def _fill_row(typ, shape):
+    """Return the bytes used for a case where a variable is missing."""
+    row = zeros(shape, dtype=typ)
+    if typ.kind == 'f':
+        row.fill(nan)
+    return row.tostring()
+
+
+class ArrayCaseIterator(object):
+    """Pulls Cases from a directory written by an :class:`ArrayCaseRecorder`.
+    If `varnames` is given, only those variables are included in the Cases.
+    The values of a numeric variable over all cases can be obtained from
+    :meth:`get_column` without building any Cases.
+    """
+
+    implements(ICaseIterator)
+
+    def __init__(self, dirname='cases', varnames=None):
+        self.varnames = varnames
+        self.dirname = dirname
+
+    @property
+    def dirname(self):
+        """The directory containing the case data."""
+        return self._dirname
+
+    @dirname.setter
+    def dirname(self, value):
+        """Set the directory and read its index."""
+        self._dirname = value
+        self._columns = {}
+        with open(os.path.join(value, _INDEX_FILE), 'r') as inp:
+            index = json.load(inp)
+        self._ncases = index['ncases']
+        self._vars = index['vars']
+        self._var_info = dict([(info['name'], info) for info in self._vars])
+
+    def __len__(self):
+        return self._ncases
+
+    def get_names(self):
+        """Return the names of the variables stored as columns."""
+        return [info['name'] for info in self._vars]
+
+    def _get_present(self, info):
+        """Return an array that is nonzero for the cases where the variable
+        described by `info` is present."""
+        if self._ncases:
+            return memmap(os.path.join(self._dirname, info['mask']),
+                          dtype='u1', mode='r', shape=(self._ncases,))
+        return zeros((0,), dtype='u1')
+
+    def get_column(self, name):
+        """Return a read-only array containing the values of the named
+        variable for all cases. The array is memory-mapped from the file,
+        so no data is read until it is accessed. Entries for cases where
+        the variable was missing are NaN for floating point variables and
+        zero otherwise.
+        """
+        col = self._columns.get(name)
+        if col is None:
+            try:
+                info = self._var_info[name]
+            except KeyError:
+                raise KeyError("'%s' is not a column in '%s'"
+                               % (name, self._dirname))
+            typ = dtype(str(info['dtype']))
+            shape = (self._ncases,)+tuple(info['shape'])
+            if self._ncases:
+                col = memmap(os.path.join(self._dirname, info['file']),
+                             dtype=typ, mode='r', shape=shape)
+            else:
+                col = zeros(shape, dtype=typ)
+            self._columns[name] = col
+        return col
+
+    def __iter__(self):
+        return self._next_case()
+
+    def _next_case(self):
+        """ Generator which returns Cases one at a time. """
+        if not self._ncases:
+            return
+
+        if self.varnames is None:
+            wanted = None
+            infos = self._vars
+        else:
+            wanted = set(self.varnames)
+            infos = [info for info in self._vars if info['name'] in wanted]
+        columns = [(info, self.get_column(info['name']),
+                    self._get_present(info)) for info in infos]
+
+        with open(os.path.join(self._dirname, _CASES_FILE), 'rb') as inp:
+            for i in range(self._ncases):
+                uuid, parent_uuid, label, msg, retries, max_retries, \
+                    others = load(inp)
+                inputs = []
+                outputs = []
+                for info, col, present in columns:
+                    if not present[i]:
+                        continue
+                    if info['item']:
+                        value = col[i].item()
+                    elif info['shape']:
+                        value = array(col[i])
+                    else:
+                        value = col[i]
+                    if info['sense'] == 'i':
+                        inputs.append((info['name'], value))
+                    else:
+                        outputs.append((info['name'], value))
+                for name, (sense, value) in others.items():
+                    if wanted is None or name in wanted:
+                        if sense == 'i':
+                            inputs.append((name, value))
+                        else:
+                            outputs.append((name, value))
+                yield Case(inputs=inputs, outputs=outputs, label=label,
+                           retries=retries, max_retries=max_retries,
+                           case_uuid=uuid, parent_uuid=parent_uuid, msg=msg)
+
+    def get_attributes(self, io_only=True):
+        """ We need a custom get_attributes because we aren't using Traits to
+        manage our changeable settings. This is unfortunate and should be
+        changed to something that automates this somehow."""
+
+        attrs = {}
+        attrs['type'] = type(self).__name__
+        variables = []
+
+        attr = {}
+        attr['name'] = "dirname"
+        attr['type'] = type(self.dirname).__name__
+        attr['value'] = str(self.dirname)
+        attr['connected'] = ''
+        attr['desc'] = 'Name of the directory containing the cases.'
+        variables.append(attr)
+
+        attrs["Inputs"] = variables
+        return attrs
+
+
+class ArrayCaseRecorder(object):
+    """Stores cases by column in a directory. Defaults to ``cases``.
+
+    Ints, floats, bools and numeric arrays are appended to a binary file per
+    variable. Other values, along with each Case's uuid, label, msg, etc.,
+    are pickled into a separate file. Recorded Cases are written every
+    `buffer_size` Cases and by :meth:`flush`, :meth:`close` and
+    :meth:`get_iterator`, at which point they become visible to an
+    :class:`ArrayCaseIterator`.
+    """
+
+    implements(ICaseRecorder)
+
+    def __init__(self, dirname='cases', append=False, buffer_size=100):
+        self.buffer_size = buffer_size
+        self._dirname = dirname
+        self._vars = []
+        self._columns = {}
+        self._rows = {}
+        self._masks = {}
+        self._cases = []
+        self._ncases = 0
+        self._closed = False
+
+        index_file = os.path.join(dirname, _INDEX_FILE)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        elif append and os.path.exists(index_file):
+            with open(index_file, 'r') as inp:
+                index = json.load(inp)
+            self._ncases = index['ncases']
+            self._vars = index['vars']
+            for info in self._vars:
+                info['dtype'] = dtype(str(info['dtype']))
+                info['shape'] = tuple(info['shape'])
+                self._columns[info['name']] = info
+                self._rows[info['name']] = []
+                self._masks[info['name']] = []
+
+        if not self._ncases:
+            # Start a new set of cases.
+            for name in os.listdir(dirname):
+                if name.endswith('.dat') or name.endswith('.mask') or \
+                   name in (_INDEX_FILE, _CASES_FILE):
+                    os.remove(os.path.join(dirname, name))
+            self._write_index()
+
+    @property
+    def dirname(self):
+        """The directory containing the case data."""
+        return self._dirname
+
+    def startup(self):
+        """ Nothing needed for an array case."""
+        pass
+
+    def record(self, case):
+        """Record the given Case."""
+        if self._closed:
+            raise RuntimeError('Attempt to record on closed recorder')
+
+        icase = self._ncases + len(self._cases)
+        others = {}
+        present = set()
+        for sense, iotype in (('i', 'in'), ('o', 'out')):
+            for name, value in case.items(iotype=iotype):
+                info = _column_info(value)
+                col = self._columns.get(name)
+                if col is None and info is not None:
+                    col = self._add_column(name, sense, info, icase)
+                if col is not None and info is not None and \
+                   info[1] == col['shape'] and can_cast(info[0], col['dtype']):
+                    self._rows[name].append(array(value,
+                                                  dtype=col['dtype']).tostring())
+                    self._masks[name].append(_PRESENT)
+                    present.add(name)
+                else:
+                    others[name] = (sense, value)
+
+        for name, col in self._columns.items():
+            if name not in present:
+                self._rows[name].append(_fill_row(col['dtype'], col['shape']))
+                self._masks[name].append(_MISSING)
+
+        self._cases.append((case.uuid, case.parent_uuid, case.label, case.msg,
+                            case.retries, case.max_retries, others))
+        if len(self._cases) >= self.buffer_size:
+            self.flush()
+
+    def _add_column(self, name, sense, info, icase):
+        """Add a new column, filling in rows for the preceding cases."""
+        col = { 'name': name,
+                'file': 'v%d.dat' % len(self._vars),
+                'mask': 'v%d.mask' % len(self._vars),
+                'sense': sense,
+                'dtype': info[0],
+                'shape': info[1],
+                'item': info[2],
+              }
+        self._vars.append(col)
+        self._columns[name] = col
+        self._rows[name] = [_fill_row(info[0], info[1])*icase]
+        self._masks[name] = [_MISSING*icase]
+        return col
+
+    def flush(self):
+        """Write all recorded Cases to disk."""
+        if not self._cases:
+            return
+        dirname = self._dirname
+        for col in self._vars:
+            name = col['name']
+            if self._rows[name]:
+                with open(os.path.join(dirname, col['file']), 'ab') as out:
+                    out.write(''.join(self._rows[name]))
+                with open(os.path.join(dirname, col['mask']), 'ab') as out:
+                    out.write(''.join(self._masks[name]))
+                self._rows[name] = []
+                self._masks[name] = []
+        with open(os.path.join(dirname, _CASES_FILE), 'ab') as out:
+            for entry in self._cases:
+                dump(entry, out, HIGHEST_PROTOCOL)
+        self._ncases += len(self._cases)
+        self._cases = []
+
+        # The index is written last so a reader never sees partial cases.
+        self._write_index()
+
+    def _write_index(self):
+        """Write the index file describing the columns. Its size depends
+        only on the number of columns, not on the number of cases."""
+        index = { 'ncases': self._ncases,
+                  'vars': [dict(col, dtype=col['dtype'].str,
+                                shape=list(col['shape']))
+                           for col in self._vars],
+                }
+        path = os.path.join(self._dirname, _INDEX_FILE)
+        with open(path+'.tmp', 'w') as out:
+            json.dump(index, out)
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(path+'.tmp', path)
+
+    def close(self):
+        """Write any remaining Cases and close the recorder."""
+        self.flush()
+        self._closed = True
+
+    def get_iterator(self):
+        """Return an ArrayCaseIterator that points to our current data."""
+        self.flush()
+        return ArrayCaseIterator(self._dirname)
+
+    def get_attributes(self, io_only=True):
+        """ We need a custom get_attributes because we aren't using Traits to
+        manage our changeable settings. This is unfortunate and should be
+        changed to something that automates this somehow."""
+
+        attrs = {}
+        attrs['type'] = type(self).__name__
+        variables = []
+
+        attr = {}
+        attr['name'] = "dirname"
+        attr['id'] = attr['name']
+        attr['type'] = type(self.dirname).__name__
+        attr['value'] = str(self.dirname)
+        attr['connected'] = ''
+        attr['desc'] = 'Name of the directory where cases are recorded.'
+        variables.append(attr)
+
+        attrs["Inputs"] = variables
+        return attrs
@@ -1,30 +1,73 @@
 
+from cPickle import dumps, HIGHEST_PROTOCOL
+
+from numpy import array, bool_, delete, float16, float32, float64, integer, \
+                  ndarray, vstack, zeros
+
 from openmdao.main.case import Case
 from openmdao.main.interfaces import implements, ICaseRecorder, ICaseIterator
 
+# A name's values are kept in the numeric array only while they all have
+# the same one of these types (its 'kind'), so that they can be converted
+# back on the way out.
+_EXACT_KINDS = frozenset([bool, bool_, float, float16, float32, float64])
+
+_MAXINT = 2**53  # largest int that converts to a float without loss
+
+
+def _num_kind(value):
+    """Return the type of the given value if it can be stored in the
+    numeric array and converted back without loss, else None.
+    """
+    kind = type(value)
+    if kind in _EXACT_KINDS:
+        return kind
+    if kind is int or kind is long or issubclass(kind, integer):
+        if -_MAXINT <= value <= _MAXINT:
+            return kind
+    return None
+
+def _hashable(value):
+    """Return a hashable stand-in for value."""
+    try:
+        hash(value)
+    except TypeError:
+        if isinstance(value, ndarray):
+            return (value.dtype.str, value.shape, value.tostring())
+        return dumps(value, HIGHEST_PROTOCOL)
+    return value
+
+
 class CaseArray(object):
     """A CaseRecorder/CaseIterator containing Cases having the same set of
     input/output strings but different data. Cases are not necessarily unique.
+
+    Values that are ints, floats or bools are kept in a 2-D float array
+    with a row per Case. Any other values are kept in a list of tuples
+    alongside it. Each row also has a key, based on its data, that is used
+    to quickly test for membership.
     """
-    
+
     implements(ICaseIterator, ICaseRecorder)
-    
+
+    _unique = False
+
     def __init__(self, obj=None, parent_uuid=None, names=None):
         """
         obj: dict, Case, or None
             If obj is a dict, it is assumed to contain all var names/exprs as keys, with
             values that are lists.  All lists are assumed to have the same length.
-            
+
             If obj is a Case, the inputs and outputs of the Case will become those
             of the CaseSet, and any subsequent Cases that are added must have the
             same set of inputs and outputs.
-            
+
             If obj is None, the first Case that is recorded will be used to set
             the inputs and outputs for the CaseArray.
-        
+
         parent_uuid: UUID
             The id of the parent Case (if any).
-            
+
         names: iter of str
             Names/expressions that the Cases will contain. This is useful if you
             only want this container to keep track of some subset of the contents
@@ -35,7 +78,8 @@ class CaseArray(object):
             self._names = []
         else:
             self._names = names[:]
-        self._values = []
+        self._split_idx = 0
+        self._reset_columns()
         if isinstance(obj, dict):
             self._add_dict_cases(obj)
         elif isinstance(obj, Case):
@@ -44,20 +88,38 @@ class CaseArray(object):
             pass
         else:
             raise TypeError("obj must be a dict, a Case, or None")
-    
+
+    def _reset_columns(self):
+        """Remove all data, along with the layout of the columns."""
+        self._kinds = None    # kind of each name, or None for objects
+        self._numcols = []    # indices of names stored in self._data
+        self._objcols = []    # indices of names stored in self._objects
+        self.clear()
+
     def copy(self):
-        ca = CaseArray(parent_uuid=self._parent_uuid, names=self._names)
-        ca._values = self._values[:]
+        ca = self.__class__(parent_uuid=self._parent_uuid, names=self._names)
         ca._split_idx = self._split_idx
+        if self._kinds is not None:
+            ca._kinds = self._kinds[:]
+        ca._numcols = self._numcols[:]
+        ca._objcols = self._objcols[:]
+        ca._data = self._data[:self._nrows].copy()
+        ca._nrows = self._nrows
+        ca._objects = self._objects[:]
+        ca._keys = self._keys[:]
+        ca._index = self._index.copy()
         return ca
-        
+
     def remove(self, case):
         """Remove the given Case from this CaseArray."""
         try:
-            values = self._get_case_data(case)
+            key = self._make_key(self._get_case_data(case))
         except KeyError:
-            raise KeyError("Case to be removed is not a member of this CaseArray")
-        self._values.remove(values)
+            key = None
+        if key is None or key not in self._index:
+            raise KeyError("Case to be removed is not a member of this %s"
+                           % self.__class__.__name__)
+        self._delete_row(self._keys.index(key))
 
     def _add_dict_cases(self, dct):
         length = -1
@@ -68,6 +130,7 @@ class CaseArray(object):
         else:
             self._names = dct.keys()
         self._split_idx = len(self._names) # treat all names as inputs
+        self._reset_columns()
         biglist = []
         for key in self._names:
             val = dct[key]
@@ -79,12 +142,9 @@ class CaseArray(object):
                 raise ValueError("number of values at key '%s' (%d) differs " % (key,len(val)) +
                                  "from number of other values (%d) in CaseSet" % length)
             biglist.append(val)
-        self._values = []
         if length > 0:
-            idxs = range(len(self._names))
-            for i in range(length):
-                lst = [biglist[j][i] for j in idxs]
-                self._add_values(lst)
+            for lst in zip(*biglist):
+                self._add_values(list(lst))
 
     def _record_first_case(self, case):
         """Called the first time we record a Case"""
@@ -106,15 +166,16 @@ class CaseArray(object):
             tmp.extend(case.values(iotype='out'))
 
         self._names = names
+        self._reset_columns()
         self._add_values(tmp)
-        
+
     def record(self, case):
         """Record the given Case."""
-        if not self._values:
+        if not self._nrows:
             self._record_first_case(case)
         else:
             self._add_values(self._get_case_data(case))
-    
+
     def close(self):
         """Does nothing."""
         return
@@ -123,33 +184,49 @@ class CaseArray(object):
         return self._next_case()
 
     def _next_case(self):
-        for i in range(len(self._values)):
+        for i in range(self._nrows):
             yield self.__getitem__(i)
-    
+
     def __getitem__(self, key):
         """If key is a varname or expression, returns a list of
-        all of the recorded values corresponding to that string. If key is an integer 
-        index 'i', returns a Case object containing the data for the i'th recorded 
+        all of the recorded values corresponding to that string. If key is an integer
+        index 'i', returns a Case object containing the data for the i'th recorded
         case.
         """
         if isinstance(key, basestring): # return all of the values for the given name
-            try: 
-                idx = self._names.index(key)
-            except ValueError as err: 
-                raise KeyError("CaseSet has no input or outputs named %s"%key )
-            return [lst[idx] for lst in self._values]
-        else:  # key is the case numbe
-            return self._case_from_values(self._values[key])
-        
-    
-            
+            return self._column_values(self._name_index(key))
+        else:  # key is the case number
+            if key < 0:
+                key += self._nrows
+            if key < 0 or key >= self._nrows:
+                raise IndexError("%s index out of range"
+                                 % self.__class__.__name__)
+            return self._case_from_values(self._row_values(key))
+
+    def get_column(self, name):
+        """Return an array of all of the recorded values corresponding to the
+        given varname or expression. If all of the values are ints, floats or
+        bools, the result is a float array that is a view into our storage,
+        so it should not be modified. Otherwise it is an object array.
+        """
+        j = self._name_index(name)
+        if not self._nrows or self._kinds[j] is None:
+            return array(self._column_values(j), dtype=object)
+        return self._data[:self._nrows, self._numcols.index(j)]
+
+    def _name_index(self, name):
+        try:
+            return self._names.index(name)
+        except ValueError:
+            raise KeyError("CaseSet has no input or outputs named %s" % name)
+
     def _case_from_values(self, values):
         return Case(inputs=[(n,v) for n,v in zip(self._names[0:self._split_idx],
                                                  values[0:self._split_idx])],
                     outputs=[(n,v) for n,v in zip(self._names[self._split_idx:],
                                                   values[self._split_idx:])],
                     parent_uuid=self._parent_uuid)
-        
+
     def _get_case_data(self, case):
         """Return a list of values for the case in the same order as our values.
         Raise a KeyError if any of our names are missing from the case.
@@ -158,13 +235,195 @@ class CaseArray(object):
             return [case[n] for n in self._names]
         except KeyError, err:
             raise KeyError("input or output is missing from case: %s" % str(err))
-        
+
+    def _row_values(self, i):
+        """Return the list of values for row i, in the same order as our
+        names.
+        """
+        vals = [None]*len(self._names)
+        kinds = self._kinds
+        for j, val in zip(self._numcols, self._data[i].tolist()):
+            kind = kinds[j]
+            vals[j] = val if kind is float else kind(val)
+        for j, val in zip(self._objcols, self._objects[i]):
+            vals[j] = val
+        return vals
+
+    def _column_values(self, j):
+        """Return the list of values of the name at index j."""
+        if not self._nrows:
+            return []
+        kind = self._kinds[j]
+        if kind is None:
+            pos = self._objcols.index(j)
+            return [objs[pos] for objs in self._objects]
+        col = self._data[:self._nrows, self._numcols.index(j)]
+        if kind is float:
+            return col.tolist()
+        if kind is int or kind is bool:
+            return col.astype(kind).tolist()
+        return [kind(val) for val in col.tolist()]
+
+    def _init_columns(self, vals):
+        """Decide where each name's values are stored based on the first
+        set of values.
+        """
+        self._kinds = [_num_kind(val) for val in vals]
+        self._numcols = [j for j, kind in enumerate(self._kinds)
+                                           if kind is not None]
+        self._objcols = [j for j, kind in enumerate(self._kinds)
+                                           if kind is None]
+        self._data = zeros((0, len(self._numcols)))
+
+    def _demote(self, j):
+        """Move the values of the name at index j from the numeric array
+        to the object tuples. Since this changes our layout, all keys are
+        recomputed.
+        """
+        colvals = self._column_values(j)
+        pos = self._numcols.index(j)
+        self._data = delete(self._data[:self._nrows], pos, axis=1)
+        del self._numcols[pos]
+        self._kinds[j] = None
+        self._objcols.append(j)
+        self._objcols.sort()
+        pos = self._objcols.index(j)
+        self._objects = [objs[:pos]+(val,)+objs[pos:]
+                         for objs, val in zip(self._objects, colvals)]
+        self._rebuild_keys()
+
+    def _rebuild_keys(self):
+        # adding 0.0 turns -0.0 into 0.0 so that they have the same key
+        self._keys = [((self._data[i] + 0.0).tostring(),
+                       tuple([_hashable(v) for v in self._objects[i]]))
+                      for i in range(self._nrows)]
+        self._index = {}
+        for key in self._keys:
+            self._index[key] = self._index.get(key, 0) + 1
+
+    def _match_columns(self, case_container, inplace=False):
+        """Make sure that both containers store each name in the same place
+        so that their keys can be compared. Returns a tuple of this container
+        and the given one, where either may be replaced by a copy if its
+        layout had to change. The given container is never changed, and this
+        one is only changed if inplace is True.
+        """
+        mine, theirs = self, case_container
+        if self._kinds is None or case_container._kinds is None:
+            return mine, theirs
+        for j in range(len(self._kinds)):
+            kind, other = mine._kinds[j], theirs._kinds[j]
+            if kind is other:
+                continue
+            if other is not None:
+                if theirs is case_container:
+                    theirs = theirs.copy()
+                theirs._demote(j)
+            if kind is not None:
+                if mine is self and not inplace:
+                    mine = mine.copy()
+                mine._demote(j)
+        return mine, theirs
+
+    def _make_row(self, vals):
+        """Return a tuple of the form (row, objects, key) for the given
+        values, or None if they don't fit in our columns.
+        """
+        nums = []
+        for j in self._numcols:
+            if _num_kind(vals[j]) is None:
+                return None
+            nums.append(vals[j])
+        row = array(nums, dtype=float)
+        objs = tuple([vals[j] for j in self._objcols])
+        return (row, objs, ((row + 0.0).tostring(),
+                            tuple([_hashable(v) for v in objs])))
+
+    def _make_key(self, vals):
+        if self._kinds is None:
+            return None
+        row = self._make_row(vals)
+        if row is None:
+            return None
+        return row[2]
+
     def _add_values(self, vals):
-        self._values.append(vals)
+        if self._kinds is None:
+            self._init_columns(vals)
+        for j in self._numcols[:]:
+            if _num_kind(vals[j]) is not self._kinds[j]:
+                self._demote(j)
+        row, objs, key = self._make_row(vals)
+        if self._unique and key in self._index:
+            return
+        n = self._nrows
+        if n == len(self._data):
+            data = zeros((max(2*n, 16), len(self._numcols)))
+            data[:n] = self._data[:n]
+            self._data = data
+        self._data[n] = row
+        self._nrows += 1
+        self._objects.append(objs)
+        self._keys.append(key)
+        self._index[key] = self._index.get(key, 0) + 1
+
+    def _extend(self, case_container):
+        """Add all of the rows of the given compatible container."""
+        if not case_container._nrows:
+            return
+        if self._kinds is None:
+            self._init_columns(case_container._row_values(0))
+        case_container = self._match_columns(case_container, inplace=True)[1]
+        index = self._index
+        rows = []
+        for i, key in enumerate(case_container._keys):
+            if self._unique and key in index:
+                continue
+            rows.append(i)
+            index[key] = index.get(key, 0) + 1
+        if not rows:
+            return
+        self._data = vstack((self._data[:self._nrows],
+                             case_container._data[rows]))
+        self._nrows += len(rows)
+        objects = case_container._objects
+        keys = case_container._keys
+        self._objects.extend([objects[i] for i in rows])
+        self._keys.extend([keys[i] for i in rows])
+
+    def take(self, rows):
+        """Return a new container of the same type holding the Cases at the
+        given indices, in the given order.
+        """
+        cs = self.__class__(parent_uuid=self._parent_uuid)
+        cs._names = self._names[:]
+        cs._split_idx = self._split_idx
+        cs._kinds = self._kinds[:]
+        cs._numcols = self._numcols[:]
+        cs._objcols = self._objcols[:]
+        cs._data = self._data[rows]
+        cs._nrows = len(rows)
+        cs._objects = [self._objects[i] for i in rows]
+        cs._keys = [self._keys[i] for i in rows]
+        cs._index = {}
+        for key in cs._keys:
+            cs._index[key] = cs._index.get(key, 0) + 1
+        return cs
+
+    def _delete_row(self, i):
+        self._data = delete(self._data[:self._nrows], i, axis=0)
+        self._nrows -= 1
+        del self._objects[i]
+        key = self._keys.pop(i)
+        count = self._index[key]-1
+        if count:
+            self._index[key] = count
+        else:
+            del self._index[key]
 
     def __len__(self):
-        return len(self._values)
-    
+        return self._nrows
+
     def __contains__(self, case):
         if not isinstance(case, Case):
             return False
@@ -172,193 +431,171 @@ class CaseArray(object):
             values = self._get_case_data(case)
         except KeyError:
             return False
-        for val in self._values:
-            if val == values:
-                return True
-        return False
-    
+        return self._make_key(values) in self._index
+
     def clear(self):
         """Remove all case values from this container but leave list of
         variables intact.
         """
-        self._values = []
+        self._data = zeros((0, len(self._numcols)))
+        self._nrows = 0
+        self._objects = []
+        self._keys = []   # key for each row
+        self._index = {}  # number of rows having each key
 
     def update(self, *case_containers):
         """Add Cases from other CaseSets or CaseArrays to this one."""
         for cset in case_containers:
-            for case in cset:
-                self.record(case)
-                
+            if self._nrows and isinstance(cset, CaseArray) and cset._nrows \
+               and self._names == cset._names \
+               and self._split_idx == cset._split_idx:
+                self._extend(cset)
+            else:
+                for case in cset:
+                    self.record(case)
+
     def pop(self, idx=-1):
-        return self._case_from_values(self._values.pop(idx))
-                
+        if idx < 0:
+            idx += self._nrows
+        if idx < 0 or idx >= self._nrows:
+            raise IndexError("pop index out of range")
+        values = self._row_values(idx)
+        self._delete_row(idx)
+        return self._case_from_values(values)
+
     def _check_compatability(self, case_container):
         if self._names != case_container._names:
             raise ValueError("case containers have different sets of variables")
         if self._split_idx != case_container._split_idx:
             raise ValueError("case containers don't agree on input/output designations")
+        return self._match_columns(case_container)
 
 
 class CaseSet(CaseArray):
     """A CaseRecorder/CaseIterator containing Cases having the same set of
     input/output strings but different data.  All Cases in the set are unique.
     """
-    
+
+    _unique = True
+
     def __init__(self, obj=None, parent_uuid=None, names=None):
         """
         obj: dict, Case, or None
             If obj is a dict, it is assumed to contain all var names as keys, with
             values that are lists.  All lists are assumed to have the same length.
-            
+
             If obj is a Case, the inputs and outputs of the Case will become those
             of the CaseSet, and any subsequent Cases that are added must have the
             same set of inputs and outputs.
-            
+
             If obj is None, the first Case that is recorded will be used to set
             the inputs and outputs for the CaseSet.
-        
+
         parent_uuid: UUID (optional)
             The id of the parent Case (if any).
-            
+
         names: iter of str (optional)
             Names/expressions that the Cases will contain. This is useful if you
             only want this container to keep track of some subset of the contents
             of Cases that are recorded in it.
         """
-        self._tupset = set()
         super(CaseSet, self).__init__(obj, parent_uuid, names)
 
-    def copy(self):
-        cs = CaseSet(parent_uuid=self._parent_uuid, names=self._names)
-        cs._values = self._values[:]
-        cs._tupset = self._tupset.copy()
-        cs._split_idx = self._split_idx
-        return cs
-        
-    def _add_values(self, vals):
-        tup = tuple(vals)
-        if tup not in self._tupset:
-            self._tupset.add(tup)
-            self._values.append(tup)
+    def _select(self, case_sets, keep):
+        """Return a new CaseSet with the rows of this one where
+        keep(key, indices) is True, where indices are those of the
+        given CaseSets.
+        """
+        mine = self
+        for cset in case_sets:
+            mine = mine._check_compatability(cset)[0]
+        # mine now has every name stored where any of the others do
+        indices = [mine._check_compatability(cset)[1]._index
+                   for cset in case_sets]
+        return self.take([i for i, key in enumerate(mine._keys)
+                                         if keep(key, indices)])
 
-    def __contains__(self, case):
-        if not isinstance(case, Case):
-            return False
-        try:
-            values = tuple(self._get_case_data(case))
-        except KeyError:
-            return False
-        return values in self._tupset
-    
-    def _make_case_set(self, tupset):
-        cs = CaseSet(parent_uuid=self._parent_uuid)
-        cs._names = self._names[:]
-        cs._values = list(tupset)
-        cs._tupset = tupset
-        cs._split_idx = self._split_idx
-        return cs
-    
     def isdisjoint(self, case_set):
         """Return True if this CaseSet has no Cases in common with the
         given CaseSet.
         """
-        self._check_compatability(case_set)
-        return self._tupset.isdisjoint(case_set._tupset)
-    
+        mine, theirs = self._check_compatability(case_set)
+        small, big = sorted([mine._index, theirs._index], key=len)
+        for key in small:
+            if key in big:
+                return False
+        return True
+
     def issubset(self, case_set):
         """Return True if every Case in this one is in the given CaseSet."""
-        self._check_compatability(case_set)
-        return self._tupset.issubset(case_set._tupset)
-    
+        mine, theirs = self._check_compatability(case_set)
+        return mine._index.viewkeys() <= theirs._index.viewkeys()
+
     def issuperset(self, case_set):
         """Return True if every Case in the given CaseSet is in this one."""
-        self._check_compatability(case_set)
-        return self._tupset.issuperset(case_set._tupset)
-    
+        mine, theirs = self._check_compatability(case_set)
+        return mine._index.viewkeys() >= theirs._index.viewkeys()
+
     def union(self, *case_sets):
         """Return a new CaseSet with Cases from this one
         and all others.
         """
-        tupsets = []
         for cset in case_sets:
             self._check_compatability(cset)
-            tupsets.append(cset._tupset)
-        return self._make_case_set(self._tupset.union(*tupsets))
-    
+        cs = self.copy()
+        for cset in case_sets:
+            cs._extend(cset)
+        return cs
+
     def intersection(self, *case_sets):
         """Return a new CaseSet with Cases that are common to this
         and all others.
         """
-        tupsets = []
-        for cset in case_sets:
-            self._check_compatability(cset)
-            tupsets.append(cset._tupset)
-        return self._make_case_set(self._tupset.intersection(*tupsets))
-    
+        return self._select(case_sets,
+                     lambda key, indices: all([key in idx for idx in indices]))
+
     def difference(self, *case_sets):
         """Return a new CaseSet with Cases in this that are not in the
         others.
         """
-        tupsets = []
-        for cset in case_sets:
-            self._check_compatability(cset)
-            tupsets.append(cset._tupset)
-        return self._make_case_set(self._tupset.difference(*tupsets))
-    
+        return self._select(case_sets,
+                     lambda key, indices: not any([key in idx for idx in indices]))
+
     def symmetric_difference(self, case_set):
         """Return a new CaseSet with Cases in either this one or the other but
         not both.
         """
-        self._check_compatability(case_set)
-        return self._make_case_set(self._tupset.symmetric_difference(case_set._tupset))
-    
-    def clear(self):
-        """Remove all case values from this CaseSet but leave list of
-        variables intact.
-        """
-        super(CaseSet, self).clear()
-        self._tupset = set()
-
-    def pop(self, idx=-1):
-        vals = self._values.pop(idx)
-        self._tupset.remove(vals)
-        return self._case_from_values(vals)
-                
-    def remove(self, case):
-        try:
-            values = tuple(self._get_case_data(case))
-        except KeyError:
-            raise KeyError("Case to be removed is not a member of this CaseSet")
-        self._tupset.remove(values)
-        self._values.remove(values)
+        cs = self.difference(case_set)
+        cs._extend(case_set.difference(self))
+        return cs
 
     def __eq__(self, caseset):
-        self._check_compatability(caseset)
-        return self._tupset == caseset._tupset
-    
+        mine, theirs = self._check_compatability(caseset)
+        return mine._index.viewkeys() == theirs._index.viewkeys()
+
     def __lt__(self, caseset):
-        self._check_compatability(caseset)
-        return self._tupset < caseset._tupset
-        
+        mine, theirs = self._check_compatability(caseset)
+        return mine._index.viewkeys() < theirs._index.viewkeys()
+
     def __le__(self, caseset):
-        self._check_compatability(caseset)
-        return self._tupset <= caseset._tupset
-        
+        mine, theirs = self._check_compatability(caseset)
+        return mine._index.viewkeys() <= theirs._index.viewkeys()
+
     def __gt__(self, caseset):
-        self._check_compatability(caseset)
-        return self._tupset > caseset._tupset
-        
+        mine, theirs = self._check_compatability(caseset)
+        return mine._index.viewkeys() > theirs._index.viewkeys()
+
     def __ge__(self, caseset):
-        self._check_compatability(caseset)
-        return self._tupset >= caseset._tupset
-        
+        mine, theirs = self._check_compatability(caseset)
+        return mine._index.viewkeys() >= theirs._index.viewkeys()
+
     def __or__(self, caseset): return self.union(caseset)
-    
+
     def __and__(self, caseset): return self.intersection(caseset)
-    
+
     def __sub__(self, caseset): return self.difference(caseset)
-    
-    
+
+
 def caseiter_to_caseset(caseiter, varnames=None, include_errors=False):
     """
     Retrieve the values of specified variables from cases in a CaseIterator.
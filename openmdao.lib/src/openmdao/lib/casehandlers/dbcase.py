@@ -4,6 +4,7 @@ DB (Python's sqlite.)
 
 import sys
 import sqlite3
+import time
 import uuid
 from cPickle import dumps, loads, HIGHEST_PROTOCOL, UnpicklingError
 from optparse import OptionParser
@@ -29,15 +30,56 @@ def _query_split(query):
         raise ValueError("No allowable operator found in query '%s'" % query)
 
 
+class _UnpickleDict(dict):
+    """A dict holding Case values read from the DB. Pickled (BLOB) values
+    are unpickled the first time they are accessed.
+    """
+    
+    def __getitem__(self, name):
+        value = dict.__getitem__(self, name)
+        if isinstance(value, buffer):
+            try:
+                value = loads(str(value))
+            except UnpicklingError as err:
+                raise UnpicklingError("can't unpickle value '%s' from database: %s" %
+                                      (name, str(err)))
+            dict.__setitem__(self, name, value)
+        return value
+    
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+    
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+    
+    def values(self):
+        return [self[name] for name in self.keys()]
+    
+    def iteritems(self):
+        for name in self.keys():
+            yield (name, self[name])
+    
+    def itervalues(self):
+        for name in self.keys():
+            yield self[name]
+
+
 class DBCaseIterator(object):
     """Pulls Cases from a relational DB (sqlite). It doesn't support
     general sql queries, but it does allow for a series of boolean
-    selectors, e.g., 'x<=y', that are ANDed together.
+    selectors, e.g., 'x<=y', that are ANDed together. If `varnames` is
+    given, only those variables are retrieved from each Case.
+    
+    Cases are streamed from a single query, and pickled values are only
+    unpickled when they are first accessed.
     """
     
     implements(ICaseIterator)
     
-    def __init__(self, dbfile=':memory:', selectors=None, connection=None):
+    def __init__(self, dbfile=':memory:', selectors=None, connection=None,
+                 varnames=None):
         if connection is not None:
             self._dbfile = dbfile
             self._connection = connection
@@ -45,6 +87,7 @@ class DBCaseIterator(object):
             self._connection = None
             self.dbfile = dbfile
         self.selectors = selectors
+        self.varnames = varnames
         self._connection.text_factory = sqlite3.OptimizedUnicode
 
     @property
@@ -67,48 +110,59 @@ class DBCaseIterator(object):
 
     def _next_case(self):
         """ Generator which returns Cases one at a time. """
+        sql = ["SELECT c.id,c.uuid,c.parent,c.label,c.msg,c.retries,"
+               "v.name,v.sense,v.value",
+               "FROM cases c JOIN casevars v ON v.case_id=c.id"]
+        where = []
+        args = []
+        
         # figure out which selectors are for cases and which are for variables
-        sql = ["SELECT * FROM cases"]
         if self.selectors is not None:
             for sel in self.selectors:
                 rhs,rel,lhs = _query_split(sel)
                 if rhs in _casetable_attrs:
-                    if len(sql) == 1:
-                        sql.append("WHERE %s%s%s" % (rhs,rel,lhs))
-                    else:
-                        sql.append("AND %s%s%s" % (rhs,rel,lhs))
+                    where.append("c.%s%s%s" % (rhs,rel,lhs))
+                elif rhs in _vartable_attrs:
+                    where.append("v.%s%s%s" % (rhs,rel,lhs))
+                    
+        if self.varnames is not None:
+            where.append("v.name IN (%s)" % ','.join(['?']*len(self.varnames)))
+            args.extend(self.varnames)
             
-        casecur = self._connection.cursor()
-        casecur.execute(' '.join(sql))
-          
-        sql = ['SELECT var_id,name,case_id,sense,value from casevars WHERE case_id=%s']
-        if self.selectors is not None:
-            for sel in self.selectors:
-                rhs,rel,lhs = _query_split(sel)
-                if rhs in _vartable_attrs:
-                    sql.append("AND %s%s%s" % (rhs,rel,lhs))
-        combined = ' '.join(sql)
-        varcur = self._connection.cursor()
-        
-        for cid,text_id,parent,label,msg,retries,model_id,timeEnter in casecur:
-            varcur.execute(combined % cid)
-            inputs = []
-            outputs = []
-            for var_id, vname, case_id, sense, value in varcur:
-                if not isinstance(value, (float,int,str)):
-                    try:
-                        value = loads(str(value))
-                    except UnpicklingError as err:
-                        raise UnpicklingError("can't unpickle value '%s' for case '%s' from database: %s" %
-                                              (vname, cname, str(err)))
-                if sense=='i':
-                    inputs.append((vname, value))
-                else:
-                    outputs.append((vname, value))
-            if len(inputs) > 0 or len(outputs) > 0:
-                yield Case(inputs=inputs, outputs=outputs,
-                           retries=retries,msg=msg,label=label,
-                           case_uuid=text_id, parent_uuid=parent)
+        if where:
+            sql.append("WHERE %s" % ' AND '.join(where))
+        sql.append("ORDER BY c.id")
+            
+        cur = self._connection.cursor()
+        cur.execute(' '.join(sql), args)
+        
+        last_id = None
+        for cid,text_id,parent,label,msg,retries,vname,sense,value in cur:
+            if cid != last_id:
+                if last_id is not None:
+                    yield self._make_case(info, inputs, outputs)
+                last_id = cid
+                info = (text_id, parent, label, msg, retries)
+                inputs = []
+                outputs = []
+            if sense=='i':
+                inputs.append((vname, value))
+            else:
+                outputs.append((vname, value))
+                
+        if last_id is not None:
+            yield self._make_case(info, inputs, outputs)
+            
+    def _make_case(self, info, inputs, outputs):
+        """Return a Case whose pickled values will be unpickled on demand."""
+        text_id, parent, label, msg, retries = info
+        case = Case(inputs=inputs, outputs=outputs,
+                    retries=retries,msg=msg,label=label,
+                    case_uuid=text_id, parent_uuid=parent)
+        case._inputs = _UnpickleDict(case._inputs)
+        if case._outputs is not None:
+            case._outputs = _UnpickleDict(case._outputs)
+        return case
 
     def get_attributes(self, io_only=True):
         """ We need a custom get_attributes because we aren't using Traits to
@@ -143,14 +197,31 @@ class DBCaseIterator(object):
 class DBCaseRecorder(object):
     """Records Cases to a relational DB (sqlite). Values other than floats,
     ints or strings are pickled and are opaque to SQL queries.
+    
+    By default each Case is committed as soon as it is recorded. If
+    `buffer_size` is greater than one, Cases are accumulated in memory and
+    written in a single transaction once `buffer_size` Cases are waiting or
+    `flush_interval` seconds have elapsed since the last write, whichever 
+    comes first. Buffered Cases are also written by :meth:`flush`,
+    :meth:`close` and :meth:`get_iterator`. If `wal` is True, a file-based
+    DB uses sqlite's write-ahead log journal mode.
     """
     
     implements(ICaseRecorder)
     
-    def __init__(self, dbfile=':memory:', model_id='', append=False):
+    def __init__(self, dbfile=':memory:', model_id='', append=False,
+                 buffer_size=1, flush_interval=None, wal=False):
+        self._connection = None
+        self._buffer = []
+        self._last_flush = time.time()
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
         self.dbfile = dbfile  # this creates the connection
         self.model_id = model_id
         
+        if wal and dbfile != ':memory:':
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        
         if append:
             exstr = 'if not exists'
         else:
@@ -176,6 +247,11 @@ class DBCaseRecorder(object):
          sense TEXT,
          value BLOB
          )""" % exstr)
+        
+        self._connection.execute("""
+        create index if not exists casevars_case_id on casevars(case_id)""")
+        self._connection.execute("""
+        create index if not exists casevars_name on casevars(name)""")
 
     @property
     def dbfile(self):
@@ -187,6 +263,8 @@ class DBCaseRecorder(object):
     @dbfile.setter
     def dbfile(self, value):
         """Set the DB file and connect to it."""
+        if self._connection is not None:
+            self.flush()
         self._dbfile = value
         self._connection = sqlite3.connect(value)
         self._iter_conn = sqlite3.connect(value)
@@ -200,42 +278,57 @@ class DBCaseRecorder(object):
         if self._connection is None:
             raise RuntimeError('Attempt to record on closed recorder')
 
-        cur = self._connection.cursor()
-        
-        cur.execute("""insert into cases(id,uuid,parent,label,msg,retries,model_id,timeEnter) 
-                           values (?,?,?,?,?,?,?,DATETIME('NOW'))""", 
-                                     (None, case.uuid, case.parent_uuid, case.label,
-                                      case.msg or '', case.retries, 
-                                      self.model_id))
-        case_id = cur.lastrowid
-        # insert the inputs and outputs into the vars table.  Pickle them if they're not one of the
+        # Pickle the inputs and outputs if they're not one of the
         # built-in types int, float, or str.
+        casevars = []
+        for sense, iotype in (('i', 'in'), ('o', 'out')):
+            for name,value in case.items(iotype=iotype):
+                if not isinstance(value, (float,int,str)):
+                    value = sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL))
+                casevars.append((name, sense, value))
         
-        for name,value in case.items(iotype='in'):
-            if isinstance(value, (float,int,str)):
-                v = (None, name, case_id, 'i', value)
-            else:
-                v = (None, name, case_id, 'i', sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)", 
-                        v)
-        for name,value in case.items(iotype='out'):
-            if isinstance(value, (float,int,str)):
-                v = (None, name, case_id, 'o', value)
-            else:
-                v = (None, name, case_id, 'o', sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)", 
-                        v)
-        self._connection.commit()
+        self._buffer.append(((case.uuid, case.parent_uuid, case.label,
+                              case.msg or '', case.retries, self.model_id,
+                              time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())),
+                             casevars))
+        
+        if len(self._buffer) >= self.buffer_size or \
+           (self.flush_interval is not None and
+            time.time() - self._last_flush >= self.flush_interval):
+            self.flush()
+            
+    def flush(self):
+        """Write all buffered Cases to the DB in a single transaction."""
+        if self._buffer:
+            cur = self._connection.cursor()
+            try:
+                casevars = []
+                for caseinfo, varinfo in self._buffer:
+                    cur.execute("""insert into cases(uuid,parent,label,msg,retries,model_id,timeEnter) 
+                                   values (?,?,?,?,?,?,?)""", caseinfo)
+                    case_id = cur.lastrowid
+                    casevars.extend([(name, case_id, sense, value)
+                                     for name, sense, value in varinfo])
+                cur.executemany("insert into casevars(name,case_id,sense,value) values(?,?,?,?)",
+                                casevars)
+            except Exception:
+                self._connection.rollback()
+                raise
+            self._connection.commit()
+            self._buffer = []
+        self._last_flush = time.time()
     
     def close(self):
         """Commit and close DB connection if not using ``:memory:``."""
-        if self._connection is not None and self._dbfile != ':memory:':
-            self._connection.commit()
-            self._connection.close()
-            self._connection = None
+        if self._connection is not None:
+            self.flush()
+            if self._dbfile != ':memory:':
+                self._connection.close()
+                self._connection = None
 
     def get_iterator(self):
         """Return a DBCaseIterator that points to our current DB."""
+        self.flush()
         return DBCaseIterator(dbfile=self._dbfile, connection=self._connection)
 
     def get_attributes(self, io_only=True):
@@ -0,0 +1,125 @@
+"""
+Test for ArrayCaseRecorder and ArrayCaseIterator.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from numpy import array, isnan
+
+from openmdao.lib.casehandlers.api import ArrayCaseIterator, \
+                                          ArrayCaseRecorder, \
+                                          ListCaseIterator
+from openmdao.lib.drivers.api import SimpleCaseIterDriver
+from openmdao.main.api import Assembly, Case, set_as_top
+from openmdao.test.execcomp import ExecComp
+
+
+class ArrayCaseRecorderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.dirname = os.path.join(self.tempdir, 'cases')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_record(self):
+        recorder = ArrayCaseRecorder(self.dirname, buffer_size=3)
+        for i in range(10):
+            inputs = [('comp.x', float(i)), ('comp.n', i),
+                      ('comp.v', array([i, i+1.]))]
+            outputs = [('comp.z', 2.*i), ('comp.s', 'case%d' % i)]
+            if i % 2:
+                outputs.append(('comp.odd', i))
+            recorder.record(Case(inputs=inputs, outputs=outputs,
+                                 label='case%d' % i))
+
+        # Only flushed cases are visible.
+        self.assertEqual(len(ArrayCaseIterator(self.dirname)), 9)
+
+        iterator = recorder.get_iterator()
+        recorder.close()
+        self.assertEqual(len(iterator), 10)
+        self.assertEqual(iterator.get_column('comp.z').tolist(),
+                         [2.*i for i in range(10)])
+        self.assertEqual(iterator.get_column('comp.v').shape, (10, 2))
+        self.assertEqual(iterator.get_column('comp.odd').tolist(),
+                         [0, 1, 0, 3, 0, 5, 0, 7, 0, 9])
+        self.assertFalse('comp.s' in iterator.get_names())
+        try:
+            iterator.get_column('comp.s')
+        except KeyError as err:
+            self.assertEqual(str(err),
+                "\"'comp.s' is not a column in '%s'\"" % self.dirname)
+        else:
+            self.fail('KeyError expected')
+
+        for i, case in enumerate(iterator):
+            self.assertEqual(case.label, 'case%d' % i)
+            self.assertEqual(case['comp.x'], float(i))
+            self.assertEqual(case['comp.n'], i)
+            self.assertTrue(isinstance(case['comp.n'], int))
+            self.assertEqual(case['comp.v'].tolist(), [i, i+1.])
+            self.assertEqual(case['comp.z'], 2.*i)
+            self.assertEqual(case['comp.s'], 'case%d' % i)
+            if i % 2:
+                self.assertEqual(case['comp.odd'], i)
+            else:
+                self.assertFalse('comp.odd' in case.keys())
+
+        iterator.varnames = ['comp.x', 'comp.s']
+        case = list(iterator)[3]
+        self.assertEqual(sorted(case.keys()), ['comp.s', 'comp.x'])
+
+    def test_append(self):
+        recorder = ArrayCaseRecorder(self.dirname)
+        recorder.record(Case(inputs=[('x', 1.)], outputs=[('y', 2.)]))
+        recorder.close()
+
+        recorder = ArrayCaseRecorder(self.dirname, append=True)
+        recorder.record(Case(inputs=[('x', 3.)], outputs=[('w', 4.)]))
+        recorder.close()
+        iterator = ArrayCaseIterator(self.dirname)
+        self.assertEqual(iterator.get_column('x').tolist(), [1., 3.])
+        self.assertEqual(iterator.get_column('y')[0], 2.)
+        self.assertTrue(isnan(iterator.get_column('y')[1]))
+        self.assertTrue(isnan(iterator.get_column('w')[0]))
+
+        recorder = ArrayCaseRecorder(self.dirname)
+        recorder.close()
+        self.assertEqual(len(ArrayCaseIterator(self.dirname)), 0)
+        self.assertEqual(list(ArrayCaseIterator(self.dirname)), [])
+
+    def test_driver(self):
+        top = set_as_top(Assembly())
+        driver = top.add('driver', SimpleCaseIterDriver())
+        top.add('comp1', ExecComp(exprs=['z=x+y']))
+        driver.workflow.add('comp1')
+        cases = []
+        for i in range(5):
+            cases.append(Case(inputs=[('comp1.x', i+0.1), ('comp1.y', i*2.)],
+                              outputs=['comp1.z'], label='case%s' % i))
+        driver.iterator = ListCaseIterator(cases)
+        driver.recorders = [ArrayCaseRecorder(self.dirname)]
+        top.run()
+        driver.recorders[0].close()
+
+        iterator = ArrayCaseIterator(self.dirname)
+        z = iterator.get_column('comp1.z')
+        x = iterator.get_column('comp1.x')
+        y = iterator.get_column('comp1.y')
+        self.assertEqual(z.tolist(), (x+y).tolist())
+
+        # Rerun the cases pulled out of the recorded directory.
+        driver.iterator = iterator
+        driver.recorders = [ArrayCaseRecorder(self.dirname+'2')]
+        top.run()
+        self.assertEqual(driver.recorders[0].get_iterator()
+                         .get_column('comp1.z').tolist(), z.tolist())
+        driver.recorders[0].close()
+
+
+if __name__ == '__main__':
+    unittest.main()
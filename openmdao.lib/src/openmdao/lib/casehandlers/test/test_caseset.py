@@ -259,6 +259,70 @@ class CaseSetTestCase(unittest.TestCase):
         cs1.record(c1)
         cs1.close()
 
+    def test_columns(self):
+        cs = CaseSet()
+        for i in range(5):
+            cs.record(Case(inputs=[('x',i), ('flag',i>2)],
+                           outputs=[('y',i*.5), ('s',None)]))
+        col = cs.get_column('y')
+        self.assertEqual(col.tolist(), [0., .5, 1., 1.5, 2.])
+        self.assertEqual(cs['x'], [0, 1, 2, 3, 4])
+        self.assertTrue(isinstance(cs['x'][0], int))
+        self.assertEqual(cs['flag'], [False, False, False, True, True])
+        self.assertEqual(cs.get_column('s').tolist(), [None]*5)
+
+        # values of different types come back with their own types
+        cs2 = CaseArray()
+        for x in (1, 2, True, 1.5, -0.0):
+            cs2.record(Case(inputs=[('x',x)]))
+        self.assertEqual([(type(x), x) for x in cs2['x']],
+                         [(int, 1), (int, 2), (bool, True), (float, 1.5),
+                          (float, 0.)])
+        self.assertEqual([type(case['x']) for case in cs2],
+                         [int, int, bool, float, float])
+        self.assertEqual(str(cs2[4]['x']), '-0.0')
+
+        # a value that isn't a number moves the column out of the array
+        cs.record(Case(inputs=[('x','abc'), ('flag',True)],
+                       outputs=[('y',3.), ('s','def')]))
+        self.assertEqual(len(cs), 6)
+        self.assertEqual(cs['x'], [0, 1, 2, 3, 4, 'abc'])
+        self.assertEqual(cs[5]['s'], 'def')
+        self.assertTrue(cs[2] in cs)
+        cs.record(cs[2])
+        self.assertEqual(len(cs), 6)
+
+    def test_set_ops_mixed(self):
+        cs1 = CaseSet()
+        cs2 = CaseSet()
+        for i in range(10):
+            cs1.record(Case(inputs=[('x',i)], outputs=[('y',float(i))]))
+        for i in range(5, 15):
+            cs2.record(Case(inputs=[('x',i)], outputs=[('y',None)]))
+        cs2.clear()
+        for i in range(5, 15):
+            cs2.record(Case(inputs=[('x',i)], outputs=[('y',float(i))]))
+        self.assertEqual((cs1 | cs2)['x'], range(15))
+        self.assertEqual((cs1 & cs2)['x'], range(5, 10))
+        self.assertEqual((cs1 - cs2)['x'], range(5))
+        self.assertEqual(sorted(cs1.symmetric_difference(cs2)['x']),
+                         range(5)+range(10, 15))
+
+        # cs3 stores 'y' as objects, so cs1 has to be converted to match
+        cs3 = CaseSet()
+        cs3.record(Case(inputs=[('x',20)], outputs=[('y','z')]))
+        cs3.record(Case(inputs=[('x',3)], outputs=[('y',3.)]))
+        self.assertEqual((cs1 & cs3)['x'], [3])
+        self.assertEqual(len(cs1 | cs3), 11)
+        self.assertTrue(cs1[4] in cs1)
+
+        # neither operand's storage is changed by the conversion
+        self.assertEqual((cs3 & cs1)['x'], [3])
+        self.assertTrue(cs3 <= cs1 | cs3)
+        self.assertEqual(cs1.get_column('y').dtype, float)
+        self.assertTrue(isinstance(cs1['x'][0], int))
+        self.assertEqual(cs3.get_column('x').dtype, float)
+
 
 if __name__ == "__main__":
     unittest.main()
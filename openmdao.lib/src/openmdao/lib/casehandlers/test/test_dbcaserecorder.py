@@ -10,6 +10,7 @@ import tempfile
 import logging
 import shutil
 import copy
+import sqlite3
 
 from openmdao.main.api import Component, Assembly, Case, set_as_top
 from openmdao.test.execcomp import ExecComp
@@ -122,6 +123,56 @@ class DBCaseRecorderTestCase(unittest.TestCase):
                 self.assertTrue(value >= 0 and value<3)
         self.assertEqual(count, 3)
 
+    def test_varnames(self):
+        recorder = DBCaseRecorder()
+        for i in range(10):
+            inputs = [('comp1.x', i), ('comp1.y', i*2.)]
+            outputs = [('comp1.z', i*1.5), ('comp2.normal', NormalDistribution(float(i),0.5))]
+            recorder.record(Case(inputs=inputs, outputs=outputs, label='case%s'%i))
+        iterator = recorder.get_iterator()
+        iterator.varnames = ['comp1.y', 'comp2.normal']
+        
+        count = 0
+        for i,case in enumerate(iterator):
+            count += 1
+            self.assertEqual(case.label, 'case%s'%i)
+            self.assertEqual(case.keys(), ['comp1.y', 'comp2.normal'])
+            self.assertEqual(case['comp1.y'], i*2.)
+            self.assertEqual(case['comp2.normal'].mu, float(i))
+        self.assertEqual(count, 10)
+        
+    def test_buffered(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            dfile = os.path.join(tmpdir, 'junk.db')
+            recorder = DBCaseRecorder(dfile, buffer_size=4, wal=True)
+            for i in range(10):
+                inputs = [('comp1.x', i), ('comp1.y', i*2.)]
+                outputs = [('comp1.z', i*1.5)]
+                recorder.record(Case(inputs=inputs, outputs=outputs, 
+                                     label='case%s'%i))
+            # last 2 cases are still buffered
+            self.assertEqual(len(list(DBCaseIterator(dfile))), 8)
+            recorder.close()
+            cases = list(DBCaseIterator(dfile))
+            self.assertEqual(len(cases), 10)
+            for i,case in enumerate(cases):
+                self.assertEqual(case.label, 'case%s'%i)
+                self.assertEqual(case['comp1.y'], i*2.)
+                self.assertEqual(case['comp1.z'], i*1.5)
+                
+            connection = sqlite3.connect(dfile)
+            cur = connection.cursor()
+            cur.execute("SELECT name FROM sqlite_master WHERE type='index'")
+            self.assertEqual(sorted([row[0] for row in cur]),
+                             ['casevars_case_id', 'casevars_name'])
+            connection.close()
+        finally:
+            try:
+                shutil.rmtree(tmpdir)
+            except OSError:
+                logging.error("problem removing directory %s" % tmpdir)
+                
     def test_tables_already_exist(self):
         dbdir = tempfile.mkdtemp()
         dbname = os.path.join(dbdir,'junk_dbfile')
@@ -9,7 +9,7 @@ from enthought.traits.has_traits import _clone_trait
 from openmdao.main.api import Component, Case
 from openmdao.lib.datatypes.api import Slot, List, Str, Float, Int, Event, Dict, Bool
 from openmdao.main.interfaces import IComponent, ISurrogate, ICaseRecorder, \
-     ICaseIterator, IUncertainVariable
+     ICaseIterator, IUncertainVariable, IIncrementalSurrogate
 from openmdao.main.mp_support import has_interface
 from openmdao.util.log import logger
 from openmdao.main.datatypes.uncertaindist import UncertainDistVar
@@ -64,6 +64,8 @@ class MetaModel(Component):
         self._training_data = {}
         self._training_input_history = []
         self._const_inputs = {}  # dict of constant training inputs indices and their values
+        self._trained_const = None  # constant input indices when surrogates were last trained
+        self._trained_counts = {}  # output name -> (surrogate, number of points it was trained with)
         self._train = False
         self._new_train_data = False
         self._failed_training_msgs = []
@@ -84,6 +86,8 @@ class MetaModel(Component):
     def _reset_training_data_fired(self):
         self._training_input_history = []
         self._const_inputs = {}
+        self._trained_const = None
+        self._trained_counts = {}
         self._failed_training_msgs = []
 
         # remove output history from training_data
@@ -111,7 +115,7 @@ class MetaModel(Component):
                     if inp_val is not None:
                         inputs.append(inp_val)
             #print "inputs", inputs
-            self._training_input_history.append(inputs)
+            self._add_training_inputs(inputs)
 
             for output_name in self.surrogate_output_names():
                 #grab value from case data
@@ -148,7 +152,7 @@ class MetaModel(Component):
                 else:
                     self._failed_training_msgs.append(str(err))
             else:  # if no exceptions are generated, save the data
-                self._training_input_history.append(inputs)
+                self._add_training_inputs(inputs)
                 self.update_outputs_from_model()
                 case_outputs = []
 
@@ -176,33 +180,29 @@ class MetaModel(Component):
                     self.raise_exception("ERROR: need at least 2 training points!",
                                          RuntimeError)
 
-                # figure out if we have any constant training inputs
-                tcases = self._training_input_history
-                in_hist = tcases[0][:]
-                # start off assuming every input is constant
-                idxlist = range(len(in_hist))
-                self._const_inputs = dict(zip(idxlist, in_hist))
-                for i in idxlist:
-                    val = in_hist[i]
-                    for case in range(1, len(tcases)):
-                        if val != tcases[case][i]:
-                            del self._const_inputs[i]
-                            break
-
-                if len(self._const_inputs) == len(in_hist):
+                if len(self._const_inputs) == len(self._training_input_history[0]):
                     self.raise_exception("ERROR: all training inputs are constant.")
-                elif len(self._const_inputs) > 0:
-                    # some inputs are constant, so we have to remove them from the training set
-                    training_input_history = []
-                    for inputs in self._training_input_history:
-                        training_input_history.append([val for i, val in enumerate(inputs)
-                                                       if i not in self._const_inputs])
-                else:
-                    training_input_history = self._training_input_history
+
+                # surrogates can only be updated with the new points if the
+                # constant inputs haven't changed since they were trained
+                const = frozenset(self._const_inputs)
+                if const != self._trained_const:
+                    self._trained_counts = {}
+                    self._trained_const = const
+
+                ntrain = len(self._training_input_history)
                 for name, output_history in self._training_data.items():
                     surrogate = self._get_surrogate(name)
                     if surrogate is not None:
-                        surrogate.train(training_input_history, output_history)
+                        trained, count = self._trained_counts.get(name, (None, 0))
+                        if trained is surrogate and count < ntrain and \
+                           has_interface(surrogate, IIncrementalSurrogate):
+                            surrogate.add_points(self._get_training_inputs(count),
+                                                 output_history[count:])
+                        elif trained is not surrogate or count != ntrain:
+                            surrogate.train(self._get_training_inputs(),
+                                            output_history)
+                        self._trained_counts[name] = (surrogate, ntrain)
 
                 self._new_train_data = False
 
@@ -225,6 +225,28 @@ class MetaModel(Component):
                 else:
                     setattr(self, name, surrogate.predict(inputs))
 
+    def _add_training_inputs(self, inputs):
+        """Add the given inputs to the training input history, and remove
+        any that differ from their first value from the constant inputs.
+        """
+        if self._training_input_history:
+            for i, val in self._const_inputs.items():
+                if val != inputs[i]:
+                    del self._const_inputs[i]
+        else:
+            # start off assuming every input is constant
+            self._const_inputs = dict(enumerate(inputs))
+        self._training_input_history.append(inputs)
+
+    def _get_training_inputs(self, start=0):
+        """Return the training input history from the given index on, with
+        the constant inputs removed.
+        """
+        if self._const_inputs:
+            return [[val for i, val in enumerate(inputs) if i not in self._const_inputs]
+                    for inputs in self._training_input_history[start:]]
+        return self._training_input_history[start:]
+
     def _post_run(self):
         self._train = False
         super(MetaModel, self)._post_run()
@@ -1,13 +1,93 @@
 """ Pareto Filter -- finds non-dominated cases. """
 
+from numpy import all as npall, any as npany, arange, argsort, asarray, \
+                  concatenate, empty, inf, lexsort, maximum, minimum, ones, \
+                  where, zeros
+
 # pylint: disable-msg=E0611,F0401
-from openmdao.main.datatypes.api import Slot, List, Str
+from openmdao.main.datatypes.api import Slot, List, Str, Bool
 from openmdao.lib.casehandlers.api import CaseSet, caseiter_to_caseset
 
 from openmdao.main.component import Component
 from openmdao.main.interfaces import ICaseIterator
 
 
+def is_nondominated(y):
+    """Return a boolean array that is True for each row of the 2-D array `y`
+    that is not dominated by any other row. Row a is dominated by row b if
+    b is not equal to a and no element of b is larger than the corresponding
+    element of a, i.e., smaller is better.
+    """
+    y = asarray(y, dtype=float)
+    n, m = y.shape
+    if n == 0 or m == 0:
+        return ones(n, dtype=bool)
+    if m == 1:
+        return y[:, 0] == y[:, 0].min()
+    if m == 2:
+        return _sweep_2d(y)
+    return _filter_nd(y)
+
+def pareto_ranks(y):
+    """Return an int array giving the non-dominated front that each row of
+    the 2-D array `y` belongs to. Rows in front 0 are not dominated by any
+    other row, rows in front 1 are only dominated by rows in front 0, etc.
+    """
+    y = asarray(y, dtype=float)
+    ranks = empty(len(y), dtype=int)
+    remaining = arange(len(y))
+    rank = 0
+    while len(remaining):
+        mask = is_nondominated(y[remaining])
+        ranks[remaining[mask]] = rank
+        remaining = remaining[~mask]
+        rank += 1
+    return ranks
+
+def _sweep_2d(y):
+    """Non-dominated rows for two objectives. After sorting by the first
+    column, a row is dominated if and only if some earlier row that isn't
+    equal to it has a second column value that is no larger.
+    """
+    n = len(y)
+    order = lexsort((y[:, 1], y[:, 0]))
+    ys = y[order]
+    f2 = ys[:, 1]
+
+    # index of the first row in each run of equal rows
+    first = ones(n, dtype=bool)
+    first[1:] = npany(ys[1:] != ys[:-1], axis=1)
+    start = maximum.accumulate(where(first, arange(n), 0))
+
+    # smallest f2 of the rows before each run
+    best = concatenate(([inf], minimum.accumulate(f2)))[start]
+
+    mask = empty(n, dtype=bool)
+    mask[order] = f2 < best
+    return mask
+
+def _filter_nd(y):
+    """Non-dominated rows for any number of objectives. Each remaining row
+    in turn removes all of the rows that it dominates. Rows are visited in
+    order of increasing sum so that a row is never dominated by one that
+    comes after it, and the rows that dominate the most are used first.
+    """
+    order = argsort(y.sum(axis=1), kind='mergesort')
+    ys = y[order]
+    idx = arange(len(ys))
+    i = 0
+    while i < len(ys):
+        point = ys[i]
+        keep = npany(ys < point, axis=1) | npall(ys == point, axis=1)
+        ys = ys[keep]
+        idx = idx[keep]
+        i = keep[:i].sum() + 1
+
+    mask = zeros(len(y), dtype=bool)
+    mask[order[idx]] = True
+    return mask
+
+
 class ParetoFilter(Component):
     """Takes a set of cases and filters out the subset of cases which are
     pareto optimal. Assumes that smaller values for model responses are
@@ -28,22 +108,18 @@ class ParetoFilter(Component):
                      desc="CaseSet with the cases to be filtered to "
                      "find the pareto optimal subset.")
 
+    find_fronts = Bool(False, iotype="in",
+                       desc="If True, sort all of the cases into "
+                            "non-dominated fronts.")
+
     pareto_set = Slot(CaseSet, iotype="out",
                         desc="Resulting collection of pareto optimal cases.", copy="shallow")
     dominated_set = Slot(CaseSet, iotype="out",
                            desc="Resulting collection of dominated cases.", copy="shallow")
-
-    def _is_dominated(self, y1, y2):
-        """Tests to see if the point y1 is dominated by the point y2.
-        True if y1 is dominated by y2, False otherwise.
-        """
-        if y1 == y2:
-            return False
-        for a, b in zip(y1, y2):
-            if a < b:
-                return False
-
-        return True
+    fronts = List(Slot(CaseSet), value=[], iotype="out",
+                  desc="Collections of cases in each non-dominated front, "
+                       "starting with the pareto optimal cases. Only "
+                       "filled in if find_fronts is True.", copy="shallow")
 
     def execute(self):
         """Finds and removes pareto optimal points in the given case set.
@@ -58,35 +134,30 @@ class ParetoFilter(Component):
             else:
                 case_sets.append(ci)
 
-        y_list = []
         if len(case_sets) > 1:
             case_set = case_sets[0].union(*case_sets[1:])
         else:
             case_set = case_sets[0]
-        criteria_count = len(self.criteria)
 
         try:
-            # need to transpose the list of outputs
-            y_list = zip(*[case_set[crit] for crit in self.criteria])
+            y = empty((len(case_set), len(self.criteria)))
+            for i, crit in enumerate(self.criteria):
+                y[:, i] = case_set.get_column(crit)
         except KeyError:
             self.raise_exception('no cases provided had all of the outputs '
                  'matching the provided criteria, %s' % self.criteria, ValueError)
 
-        y_temp = list(y_list)
-
-        self.dominated_set = CaseSet()
-        self.pareto_set = CaseSet()  # TODO: need a way to copy casesets
-
-        for point1, case in zip(y_list, iter(case_set)):
-            dominated = False
-            for point2 in y_temp:
-                if self._is_dominated(point1, point2):
-                    self.dominated_set.record(case)
-                    y_temp.remove(point1)
-                    dominated = True
-                    break
-            if not dominated:
-                self.pareto_set.record(case)
+        if self.find_fronts:
+            ranks = pareto_ranks(y)
+            self.fronts = [case_set.take(where(ranks == rank)[0])
+                           for rank in range(ranks.max()+1 if len(ranks) else 0)]
+            mask = ranks == 0
+        else:
+            self.fronts = []
+            mask = is_nondominated(y)
+
+        self.pareto_set = case_set.take(where(mask)[0])
+        self.dominated_set = case_set.take(where(~mask)[0])
 
 if __name__ == "__main__":  # pragma: no cover
 
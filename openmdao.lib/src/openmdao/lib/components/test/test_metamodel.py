@@ -105,6 +105,20 @@ class DummyError(Component):
     def execute(self): 
         self.raise_exception("Test Error",RuntimeError)
 
+class CountingKriging(KrigingSurrogate):
+    def __init__(self):
+        super(CountingKriging, self).__init__()
+        self.calls = []
+
+    def train(self, X, Y):
+        self.calls.append(('train', len(X)))
+        super(CountingKriging, self).train(X, Y)
+
+    def add_points(self, X, Y):
+        self.calls.append(('add', len(X)))
+        super(CountingKriging, self).add_points(X, Y)
+
+
 class Sim(Assembly):
     def configure(self):
 
@@ -534,6 +548,37 @@ class MetaModelTestCase(unittest.TestCase):
         self.assertEqual(metamodel.includes, [])
         
         
+    def test_incremental_training(self):
+        asm = self._trained_asm([1., 2., 3.], [2., 2., 2.])
+        meta = asm.metamodel
+        meta.sur_c = CountingKriging()
+        meta.sur_d = CountingKriging()
+        meta.a = 1.5
+        meta.run()
+        self.assertEqual(meta._const_inputs, {1: 2.})
+        self.assertEqual(meta.sur_c.calls, [('train', 3)])
+
+        # a new point with b unchanged is added to the existing surrogates
+        meta.a = 4.
+        meta.train_next = True
+        meta.run()
+        meta.a = 1.5
+        meta.run()
+        self.assertEqual(meta.sur_c.calls, [('train', 3), ('add', 1)])
+        self.assertEqual(meta.sur_d.calls, [('train', 3), ('add', 1)])
+        assert_rel_error(self, meta.c.mu, 3.5, 0.02)
+
+        # b is no longer constant, so the surrogates have to be retrained
+        meta.b = 3.
+        meta.train_next = True
+        meta.run()
+        meta.run()
+        self.assertEqual(meta._const_inputs, {})
+        self.assertEqual(meta.sur_c.calls, [('train', 3), ('add', 1), ('train', 5)])
+
+        meta.reset_training_data = True
+        self.assertEqual(meta._trained_counts, {})
+
     def test_reset_nochange_inputs(self):
         s = set_as_top(Sim())
         
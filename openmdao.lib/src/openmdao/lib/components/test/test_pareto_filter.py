@@ -2,7 +2,10 @@
 
 import unittest
 
-from openmdao.lib.components.pareto_filter import ParetoFilter
+from numpy import random
+
+from openmdao.lib.components.pareto_filter import ParetoFilter, \
+                                                  is_nondominated, pareto_ranks
 from openmdao.lib.casehandlers.api import ListCaseIterator
 from openmdao.main.case import Case
 
@@ -63,6 +66,37 @@ class ParetoFilterTests(unittest.TestCase):
         self.assertEqual((1, 2, 2, 3, 3, 3),x_dom)
         self.assertEqual((3, 2, 3, 1, 2, 3),y_dom)
         
+    def test_3d_fronts(self):
+        pf = ParetoFilter()
+        pts = [(1,1,1), (0,2,2), (2,2,2), (1,1,1), (3,3,0), (3,3,1), (4,4,4)]
+        cases = [Case(outputs=[("x",x),("y",y),("z",z),("n",i)])
+                 for i,(x,y,z) in enumerate(pts)]
+
+        pf.case_sets = [ListCaseIterator(cases),]
+        pf.criteria = ['x','y','z']
+        pf.find_fronts = True
+        pf.execute()
+
+        self.assertEqual([0,1,3,4], [case['n'] for case in pf.pareto_set])
+        self.assertEqual([2,5,6], [case['n'] for case in pf.dominated_set])
+        self.assertEqual([[0,1,3,4],[2,5],[6]],
+                         [[case['n'] for case in front] for front in pf.fronts])
+
+    def test_nondominated(self):
+        random.seed(10)
+        for m in range(1, 5):
+            y = random.randint(0, 4, size=(50, m))
+            expected = []
+            for a in y:
+                expected.append(not any([(b <= a).all() and (b != a).any()
+                                         for b in y]))
+            self.assertEqual(expected, is_nondominated(y).tolist())
+
+            ranks = pareto_ranks(y)
+            self.assertEqual(expected, (ranks == 0).tolist())
+            for rank in range(1, ranks.max()+1):
+                self.assertTrue(is_nondominated(y[ranks >= rank])[ranks[ranks >= rank] == rank].all())
+
     def test_bad_case_set(self): 
         pf = ParetoFilter()
         x = [1,1,2,2,2,3,3,3,]
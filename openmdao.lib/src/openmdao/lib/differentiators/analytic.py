@@ -112,8 +112,28 @@ class Analytic(ChainRule):
         i_func = self.function_names.index(output_name)
         
         return self.gradient[i_func][:]
-        
-        
+
+    def get_jacobian(self, output_names, out=None):
+        """Returns a 2D array containing the gradient of each of the given
+        outputs with respect to all parameters, one output per row.
+
+        output_names: list of strings
+            Names of the outputs in the local OpenMDAO hierarchy.
+
+        out: array (optional)
+            Array of shape (len(output_names), number of parameters). If
+            given, the gradients are written into it and it is returned.
+        """
+
+        index = dict([(name, i) for i, name in enumerate(self.function_names)])
+        rows = [index[name] for name in output_names]
+
+        if out is None:
+            return self.gradient[rows]
+        out[:] = self.gradient[rows]
+        return out
+
+
     def setup(self):
         """ Determine problem dimension and allocate arrays (unless sparse).
         """
@@ -2,20 +2,88 @@
 Derivatives (CRND) method.
 """
 
+from heapq import heappush, heappop
+from itertools import count
+
 from ordereddict import OrderedDict
 
 # pylint: disable-msg=E0611,F0401
 
-from openmdao.lib.datatypes.api import Float
+from openmdao.lib.datatypes.api import Float, Enum
 from openmdao.lib.differentiators.fd_helper import FDhelper
 from openmdao.main.api import Driver, Assembly, Container
 from openmdao.main.container import find_name
 from openmdao.main.driver import Run_Once
 from openmdao.main.interfaces import implements, IDifferentiator, ISolver
 from openmdao.main.mp_support import has_interface
-from openmdao.main.numpy_fallback import array
+from openmdao.main.numpy_fallback import array, zeros
 from openmdao.units import convert_units
 
+
+class _Sensitivity(object):
+    """ A node in the graph of linear operations performed while chaining
+    derivatives through a workflow. In adjoint mode, the derivative
+    dictionary holds these instead of floats, so that a single pass through
+    the workflow records how every variable depends on the parameters."""
+    
+    __slots__ = ('index', 'terms', 'param')
+    
+    # Make numpy scalars defer to our reflected operators.
+    __array_priority__ = 100.0
+    
+    _counter = count()
+    
+    def __init__(self, terms=(), param=None):
+        self.index = next(self._counter)
+        self.terms = terms
+        self.param = param
+        
+    def __mul__(self, other):
+        if isinstance(other, _Sensitivity):
+            return NotImplemented
+        return _Sensitivity(((self, other),))
+    
+    __rmul__ = __mul__
+    
+    def __add__(self, other):
+        if isinstance(other, _Sensitivity):
+            return _Sensitivity(((self, 1.0), (other, 1.0)))
+        # Derivatives start out as 0.0 before terms are added to them.
+        if other == 0.0:
+            return self
+        return NotImplemented
+    
+    __radd__ = __add__
+    
+    def propagate(self):
+        """Returns a dictionary containing the derivative of this node with
+        respect to each parameter it depends on. The graph is traversed in
+        reverse order of creation, so each node is visited once, after all
+        of the nodes that depend on it."""
+        
+        adjoints = { self.index: 1.0 }
+        nodes = { self.index: self }
+        heap = [-self.index]
+        grad = {}
+        while heap:
+            index = -heappop(heap)
+            node = nodes.pop(index)
+            adjoint = adjoints.pop(index)
+            
+            if node.param is not None:
+                grad[node.param] = grad.get(node.param, 0.0) + adjoint
+                
+            for term, factor in node.terms:
+                if term.index in adjoints:
+                    adjoints[term.index] += adjoint*factor
+                else:
+                    adjoints[term.index] = adjoint*factor
+                    nodes[term.index] = term
+                    heappush(heap, -term.index)
+                    
+        return grad
+
+
 class ChainRule(Container):
     """ Differentiates a driver's workflow using the Chain Rule with Numerical
     Derivatives (CRND) method."""
@@ -27,6 +95,11 @@ class ChainRule(Container):
     default_stepsize = Float(1.0e-6, iotype='in', desc='Default finite ' + \
                              'difference step size.')
     
+    mode = Enum('forward', ['forward', 'adjoint', 'auto'], iotype='in',
+                desc='Choose forward or adjoint mode. In auto mode, adjoint ' + \
+                     'is used when there are fewer objectives and ' + \
+                     'constraints than parameters.')
+    
     def __init__(self):
 
         super(ChainRule, self).__init__()
@@ -117,6 +190,25 @@ class ChainRule(Container):
         return array([self.gradient[wrt][output_name] \
                       for wrt in self.param_names])
         
+    def get_jacobian(self, output_names, out=None):
+        """Returns a 2D array containing the gradient of each of the given
+        outputs with respect to all parameters, one output per row.
+        
+        output_names: list of strings
+            Names of the outputs in the local OpenMDAO hierarchy.
+            
+        out: array (optional)
+            Array of shape (len(output_names), number of parameters). If
+            given, the gradients are written into it and it is returned.
+        """
+        
+        if out is None:
+            out = zeros((len(output_names), len(self.param_names)), 'd')
+        for j, wrt in enumerate(self.param_names):
+            gradient = self.gradient[wrt]
+            out[:, j] = [gradient[name] for name in output_names]
+        return out
+        
         
     def get_Hessian(self, output_name=None):
         """Returns the Hessian matrix of the given output with respect to
@@ -418,6 +510,17 @@ class ChainRule(Container):
             for name in self.param_names:
                 self.gradient[name] = {}
         
+        mode = self.mode
+        if mode == 'auto':
+            if len(self.function_names) < len(self.param_names):
+                mode = 'adjoint'
+            else:
+                mode = 'forward'
+                
+        if mode == 'adjoint':
+            self._calc_gradient_adjoint()
+            return
+        
         # Determine gradient of model outputs wrt each parameter
         for wrt in self.param_names:
                     
@@ -430,57 +533,91 @@ class ChainRule(Container):
             
             # Find derivatives for all component outputs in the workflow
             self._chain_workflow(derivs, self._parent, wrt)
-
-            # Calculate derivative of the objectives.
-            for obj_name, expr in self._parent.get_objectives().iteritems():
-            
-                obj_grad = expr.evaluate_gradient(scope=self._parent.parent,
-                                                  wrt=derivs.keys())
-                obj_deriv = 0.0
-                for input_name, val in obj_grad.iteritems():
-                    obj_deriv += val*derivs[input_name]
-                    
-                self.gradient[wrt][obj_name] = obj_deriv
+            
+            for func_name, func_deriv in self._chain_functions(derivs):
+                self.gradient[wrt][func_name] = func_deriv
                 
-            # Calculate derivatives of the constraints.
-            for con_name, constraint in \
-                self._parent.get_constraints().iteritems():
+    def _calc_gradient_adjoint(self):
+        """Calculates the gradient vectors in adjoint mode. The workflow is
+        processed once with a _Sensitivity for each parameter, and then the
+        sensitivity of each objective and constraint is propagated back to
+        the parameters, so the cost scales with the number of objectives and
+        constraints rather than the number of parameters."""
+        
+        derivs = {}
+        for name in self.param_names:
+            derivs[name] = _Sensitivity(param=name)
+        for grouped, base in self.grouped_param_names.iteritems():
+            derivs[grouped] = derivs[base]
+            
+        self._chain_workflow(derivs, self._parent, None)
+        
+        for func_name, func_deriv in self._chain_functions(derivs):
+            
+            if isinstance(func_deriv, _Sensitivity):
+                grad = func_deriv.propagate()
+            else:
+                grad = {}
                 
-                lhs, rhs, comparator, _ = \
-                    constraint.evaluate_gradient(scope=self._parent.parent,
-                                                 wrt=derivs.keys())
+            for wrt in self.param_names:
+                self.gradient[wrt][func_name] = grad.get(wrt, 0.0)
                 
-                con_deriv = 0.0
-                con_vals = {}
-                if '>' in comparator:
-                    for input_name, val in lhs.iteritems():
-                        con_vals[input_name] = -val
-                        
-                    for input_name, val in rhs.iteritems():
-                        if input_name in con_vals:
-                            con_vals[input_name] += val
-                        else:
-                            con_vals[input_name] = val
-                            
-                else:
-                    for input_name, val in lhs.iteritems():
+    def _chain_functions(self, derivs):
+        """Generator that returns the name and derivative of each objective
+        and constraint, given the derivatives of the variables they
+        reference."""
+        
+        # Calculate derivative of the objectives.
+        for obj_name, expr in self._parent.get_objectives().iteritems():
+        
+            obj_grad = expr.evaluate_gradient(scope=self._parent.parent,
+                                              wrt=derivs.keys())
+            obj_deriv = 0.0
+            for input_name, val in obj_grad.iteritems():
+                obj_deriv += val*derivs[input_name]
+                
+            yield obj_name, obj_deriv
+            
+        # Calculate derivatives of the constraints.
+        for con_name, constraint in \
+            self._parent.get_constraints().iteritems():
+            
+            lhs, rhs, comparator, _ = \
+                constraint.evaluate_gradient(scope=self._parent.parent,
+                                             wrt=derivs.keys())
+            
+            con_deriv = 0.0
+            con_vals = {}
+            if '>' in comparator:
+                for input_name, val in lhs.iteritems():
+                    con_vals[input_name] = -val
+                    
+                for input_name, val in rhs.iteritems():
+                    if input_name in con_vals:
+                        con_vals[input_name] += val
+                    else:
                         con_vals[input_name] = val
                         
-                    for input_name, val in rhs.iteritems():
-                        if input_name in con_vals:
-                            con_vals[input_name] -= val
-                        else:
-                            con_vals[input_name] = val
-
-                for input_name, val in con_vals.iteritems():
-                    con_deriv += val*derivs[input_name]
+            else:
+                for input_name, val in lhs.iteritems():
+                    con_vals[input_name] = val
                     
-                self.gradient[wrt][con_name] = con_deriv
+                for input_name, val in rhs.iteritems():
+                    if input_name in con_vals:
+                        con_vals[input_name] -= val
+                    else:
+                        con_vals[input_name] = val
+
+            for input_name, val in con_vals.iteritems():
+                con_deriv += val*derivs[input_name]
+                
+            yield con_name, con_deriv
 
     def _chain_workflow(self, derivs, scope, param):
         """Process a workflow calculating all intermediate derivatives
         using the chain rule. This can be called recursively to handle
-        nested assemblies."""
+        nested assemblies. In adjoint mode, param is None and derivs contains
+        a _Sensitivity for every parameter."""
         
         # Figure out what outputs we need
         scope_name = scope.get_pathname()
@@ -554,7 +691,10 @@ class ChainRule(Container):
                     # Inputs who are hooked directly to the current param
                     if full_name == param or \
                        (full_name in self.grouped_param_names and \
-                        self.grouped_param_names[full_name] == param):
+                        self.grouped_param_names[full_name] == param) or \
+                       (param is None and full_name in derivs and \
+                        (full_name in self.param_names or \
+                         full_name in self.grouped_param_names)):
                             
                         incoming_deriv_names[input_name] = full_name
                         incoming_derivs[full_name] = derivs[full_name]
@@ -674,11 +814,15 @@ class ChainRule(Container):
                 local_derivs[dest] = \
                     upscope_derivs[upscope_src]*expr_deriv[src]
         
-        param = upscope_param.split('.')
-        if param[0] == name:
-            param = param[1:].join('.')
+        # Adjoint mode chains all of the params at once.
+        if upscope_param is None:
+            param = None
         else:
-            param = ''
+            param = upscope_param.split('.')
+            if param[0] == name:
+                param = param[1:].join('.')
+            else:
+                param = ''
         
         # Find derivatives for this assembly's workflow
         self._chain_workflow(local_derivs, scope.driver, param)
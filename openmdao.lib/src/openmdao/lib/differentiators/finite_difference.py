@@ -7,12 +7,13 @@ import logging
 from ordereddict import OrderedDict
 from itertools import product
 
-from openmdao.main.numpy_fallback import array
+from openmdao.main.numpy_fallback import array, zeros
 
-from openmdao.lib.datatypes.api import Enum, Float
+from openmdao.lib.datatypes.api import Bool, Enum, Float
 from openmdao.main.api import Container
 from openmdao.main.interfaces import implements, IDifferentiator
 from openmdao.main.container import find_name
+from openmdao.lib.drivers.caseiterdriver import ReplicaEvaluator
 
 
 def diff_1st_central(fp, fm, eps):
@@ -50,6 +51,11 @@ class FiniteDifference(Container):
     default_stepsize = Float(1.0e-6, iotype='in', desc='Default finite ' + \
                              'difference step size.')
     
+    sequential = Bool(True, iotype='in', desc='If True, evaluate the ' + \
+                      'perturbed points sequentially. Otherwise they are ' + \
+                      'evaluated concurrently on model replicas running ' + \
+                      'on servers from the ResourceAllocationManager.')
+    
     def __init__(self):
         
         super(FiniteDifference, self).__init__()
@@ -69,6 +75,11 @@ class FiniteDifference(Container):
         self.hessian_offdiag_case = OrderedDict()
         self.hessian = {}
         
+        # Model replicas for concurrent evaluation, made once per run of
+        # the driver.
+        self._replicas = None
+        self._replicas_run = None
+        
     def setup(self):
         """Sets some dimensions."""
 
@@ -124,6 +135,25 @@ class FiniteDifference(Container):
         
         return array([self.gradient[wrt][output_name] for wrt in self.param_names])
         
+    def get_jacobian(self, output_names, out=None):
+        """Returns a 2D array containing the gradient of each of the given
+        outputs with respect to all parameters, one output per row.
+        
+        output_names: list of strings
+            Names of the outputs in the local OpenMDAO hierarchy.
+            
+        out: array (optional)
+            Array of shape (len(output_names), number of parameters). If
+            given, the gradients are written into it and it is returned.
+        """
+        
+        if out is None:
+            out = zeros((len(output_names), len(self.param_names)), 'd')
+        for j, wrt in enumerate(self.param_names):
+            gradient = self.gradient[wrt]
+            out[:, j] = [gradient[name] for name in output_names]
+        return out
+        
         
     def get_Hessian(self, output_name=None):
         """Returns the Hessian matrix of the given output with respect to
@@ -197,14 +227,14 @@ class FiniteDifference(Container):
             self.gradient_case[param] = pcase
             
         # Run all "cases".
-        # TODO - Integrate OpenMDAO's concurrent processing capability once it
-        # is formalized. This operation is inherently paralellizable.
+        pcases = []
         for key, case in self.gradient_case.iteritems():
             for ipcase, pcase in enumerate(case):
                 if deltas[ipcase]:
-                    pcase['data'] = self._run_point(pcase['param'])
+                    pcases.append(pcase)
                 else:
                     pcase['data'] = base_data
+        self._run_cases(pcases)
                 
         
         # Calculate gradients
@@ -313,8 +343,7 @@ class FiniteDifference(Container):
             self.hessian_offdiag_case[param1] = offdiag
             
         # Run all "cases".
-        # TODO - Integrate OpenMDAO's concurrent processing capability once it
-        # is formalized. This operation is inherently paralellizable.
+        pcases = []
         
         # We don't need to re-run on-diag cases if the gradients were
         # calculated with Central Difference.
@@ -328,15 +357,14 @@ class FiniteDifference(Container):
                     pcase['data'] = gradient_ipcase['data'] 
         else:
             for case in self.hessian_ondiag_case.values():
-                for pcase in case:
-                    data = self._run_point(pcase['param'])
-                    pcase['data'] = data
+                pcases.extend(case)
 
         # Off-diag cases must always be run.
         for cases in self.hessian_offdiag_case.values():
             for case in cases.values():
-                for pcase in case:
-                    pcase['data'] = self._run_point(pcase['param'])
+                pcases.extend(case)
+                
+        self._run_cases(pcases)
 
                     
         # Calculate Hessians - On Diagonal
@@ -376,6 +404,35 @@ class FiniteDifference(Container):
                         self.hessian[key1][key2][name]
                     
     
+    def _run_cases(self, pcases):
+        """Runs the model at the 'param' point of each case in pcases and
+        stores the results in the case's 'data' entry."""
+        
+        if self.sequential or len(pcases) < 2:
+            for pcase in pcases:
+                pcase['data'] = self._run_point(pcase['param'])
+            return
+        
+        # The model is replicated at the first concurrent evaluation in
+        # each run of the driver, and the replicas are reused after that.
+        driver = self._parent
+        if self._replicas is None or self._replicas_run != driver.exec_count:
+            if self._replicas is not None:
+                self._replicas.cleanup()
+            self._replicas = ReplicaEvaluator(driver, 'fd', owner=self)
+            self._replicas_run = driver.exec_count
+        
+        exprs = self._point_exprs()
+        outputs = [expr.text for expr in exprs]
+        cases = []
+        for pcase in pcases:
+            values = [float(val) for val in pcase['param'].values()]
+            cases.append(self._replicas.make_case(values, outputs))
+        self._replicas.evaluate(cases, 'finite difference point')
+        
+        for pcase, case in zip(pcases, cases):
+            pcase['data'] = self._point_data(lambda expr: case[expr.text])
+        
     def _run_point(self, data_param):
         """Runs the model at a single point and captures the results. Note that 
         some differences require the baseline point."""
@@ -387,29 +444,45 @@ class FiniteDifference(Container):
         # Run the model
         super(type(self._parent), self._parent).run_iteration()
         
+        scope = self._parent.parent
+        return self._point_data(lambda expr: expr.evaluate(scope))
+    
+    def _point_exprs(self):
+        """Returns the expressions needed by :meth:`_point_data`."""
+        
+        exprs = self._parent.get_objectives().values()
+        for item in self._constraints().values():
+            exprs.extend([item.lhs, item.rhs])
+        return exprs
+    
+    def _constraints(self):
+        """Returns the driver's constraints, inequalities first."""
+        
+        constraints = OrderedDict()
+        if self.ineqconst_names:
+            constraints.update(self._parent.get_ineq_constraints())
+        if self.eqconst_names:
+            constraints.update(self._parent.get_eq_constraints())
+        return constraints
+        
+    def _point_data(self, value_of):
+        """Returns the objectives and constraints at a point. `value_of`
+        returns the value of an expression at that point."""
+        
         data = {}
 
         # Get Objectives
         for key, item in self._parent.get_objectives().iteritems():
-            data[key] = item.evaluate(self._parent.parent)
-
-        # Get Inequality Constraints
-        if self.ineqconst_names:
-            for key, item in self._parent.get_ineq_constraints().iteritems():
-                val = item.evaluate(self._parent.parent)
-                if '>' in val[2]:
-                    data[key] = val[1]-val[0]
-                else:
-                    data[key] = val[0]-val[1]
-        
-        # Get Equality Constraints
-        if self.eqconst_names:
-            for key, item in self._parent.get_eq_constraints().iteritems():
-                val = item.evaluate(self._parent.parent)
-                if '>' in val[2]:
-                    data[key] = val[1]-val[0]
-                else:
-                    data[key] = val[0]-val[1]
+            data[key] = value_of(item)
+
+        # Get Constraints
+        for key, item in self._constraints().iteritems():
+            lhs = (value_of(item.lhs) + item.adder)*item.scaler
+            rhs = (value_of(item.rhs) + item.adder)*item.scaler
+            if '>' in item.comparator:
+                data[key] = rhs-lhs
+            else:
+                data[key] = lhs-rhs
         
         return data
                     
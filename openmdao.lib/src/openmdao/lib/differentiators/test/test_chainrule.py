@@ -154,6 +154,8 @@ class ChainRuleTestCase(unittest.TestCase):
         
     def test_simple(self):
         
+        # Adjoint mode has to be asked for.
+        self.assertEqual(self.model.driver.differentiator.mode, 'forward')
         self.model.comp.x = 1.0
         self.model.comp.u = 1.0
         self.model.run()
@@ -189,6 +191,30 @@ class ChainRuleTestCase(unittest.TestCase):
         assert_rel_error(self, grad[0], 7.0, .001)
         assert_rel_error(self, grad[1], 16.0, .001)
         
+    def test_adjoint(self):
+        
+        self.model.comp.x = 1.0
+        self.model.comp.u = 1.0
+        self.model.run()
+        self.model.driver.differentiator.mode = 'adjoint'
+        self.model.driver.differentiator.calc_gradient()
+        
+        grad = self.model.driver.differentiator.get_gradient('comp.y')
+        assert_rel_error(self, grad[0], 6.0, .001)
+        assert_rel_error(self, grad[1], 13.0, .001)
+        
+        grad = self.model.driver.differentiator.get_gradient('comp.v')
+        assert_rel_error(self, grad[0], 3.0, .001)
+        assert_rel_error(self, grad[1], 2.0, .001)
+        
+        grad = self.model.driver.differentiator.get_gradient('Con1')
+        assert_rel_error(self, grad[0], 7.0, .001)
+        assert_rel_error(self, grad[1], 15.0, .001)
+        
+        grad = self.model.driver.differentiator.get_gradient('ConE')
+        assert_rel_error(self, grad[0], 7.0, .001)
+        assert_rel_error(self, grad[1], 16.0, .001)
+        
     def test_large_dataflow(self):
         
         self.top = set_as_top(Assembly())
@@ -334,6 +360,15 @@ class ChainRuleTestCase(unittest.TestCase):
         
         grad = self.top.driver.differentiator.get_gradient('comp5.y1-nest1.comp3.y1>0')
         assert_rel_error(self, grad[0], -313.0+10.5, .001)
+        
+        self.top.driver.differentiator.mode = 'adjoint'
+        self.top.driver.differentiator.calc_gradient()
+        
+        grad = self.top.driver.differentiator.get_gradient(obj)
+        assert_rel_error(self, grad[0], 313.0, .001)
+        
+        grad = self.top.driver.differentiator.get_gradient('comp5.y1-nest1.comp3.y1>0')
+        assert_rel_error(self, grad[0], -313.0+10.5, .001)
     
     def test_find_edges(self):
         # Verifies that we don't chain derivatives for inputs that are
@@ -517,6 +552,12 @@ class ChainRuleTestCase(unittest.TestCase):
         grad = self.top.driver.differentiator.get_gradient(obj)
         assert_rel_error(self, grad[0], 4.0, .001)
         
+        self.top.driver.differentiator.mode = 'adjoint'
+        self.top.driver.differentiator.calc_gradient()
+        
+        grad = self.top.driver.differentiator.get_gradient(obj)
+        assert_rel_error(self, grad[0], 4.0, .001)
+        
     #def test_reset_state(self):
         
         #raise SkipTest("Test not needed yet.")
@@ -2,6 +2,7 @@
 Test of the Finite Difference differentiator.
 """
 
+import os
 import unittest
 
 # pylint: disable-msg=E0611,F0401
@@ -129,6 +130,38 @@ class FiniteDifferenceTestCase(unittest.TestCase):
         assert_rel_error(self, self.model.driver.differentiator.get_derivative('comp.y',wrt='comp.x'),
                                5.99, .01)
 
+    def test_concurrent(self):
+        
+        self.model.driver.differentiator.sequential = False
+        self.model.comp.x = 1.0
+        self.model.comp.u = 1.0
+        self.model.run()
+        self.model.driver.differentiator.calc_gradient()
+        assert_rel_error(self, self.model.driver.differentiator.get_derivative('comp.y',wrt='comp.x'),
+                               6.0, .001)
+        assert_rel_error(self, self.model.driver.differentiator.get_derivative('comp.y',wrt='comp.u'),
+                               13.0, .001)
+        assert_rel_error(self, self.model.driver.differentiator.get_derivative('Con1',wrt='comp.u'),
+                               15.0, .001) 
+        assert_rel_error(self, self.model.driver.differentiator.get_derivative('ConE',wrt='comp.u'),
+                               16.0, .001)
+        replicas = self.model.driver.differentiator._replicas
+        
+        self.model.driver.differentiator.default_stepsize = .001
+        self.model.driver.differentiator.calc_hessian(reuse_first=True)
+        assert_rel_error(self, self.model.driver.differentiator.get_2nd_derivative('comp.y',wrt=('comp.x', 'comp.u')),
+                               4.0, .001)
+        assert_rel_error(self, self.model.driver.differentiator.get_2nd_derivative('ConE',wrt=('comp.u', 'comp.x')),
+                               4.0, .001)        
+        
+        # The model was replicated once for both.
+        self.assertTrue(self.model.driver.differentiator._replicas is replicas)
+        self.assertEqual(replicas._cid._replicants, 1)
+        egg_file = replicas._cid._egg_file
+        self.assertTrue(os.path.exists(egg_file))
+        replicas.cleanup()
+        self.assertFalse(os.path.exists(egg_file))
+        
     def test_parameter_groups(self):
         
         self.top = set_as_top(Assembly())
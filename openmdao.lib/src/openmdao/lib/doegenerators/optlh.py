@@ -22,8 +22,8 @@ from random import randint, shuffle
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import array, size, sum, floor, zeros
-    from numpy.linalg import norm
+    from numpy import array, size, sum, floor, zeros, ones, newaxis, \
+                      triu_indices, isfinite
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -84,34 +84,61 @@ class LHC_indivudal(object):
         self.p = p
         self.doe = doe
         self.phi = None # Morris-Mitchell sampling criterion
+        self._dist = None # p-norm distances between each pair of points
+        self._phisum = None # sum of the distances raised to the power -q
     
     @property
     def shape(self):
         """Size of the LatinHypercube DOE (rows,cols)."""
         return self.doe.shape
     
+    def _distances(self):
+        """Returns the (n,n) array of the p-norms between each pair of points
+        in the DOE."""
+        if self._dist is None:
+            n,k = self.doe.shape
+            arr = self.doe
+            dist = zeros((n, n))
+            # one column at a time to keep memory at O(n**2)
+            for j in range(k):
+                col = arr[:,j]
+                dist += abs(col[:,newaxis]-col[newaxis,:])**self.p
+            if self.p != 1:
+                dist **= 1.0/self.p
+            self._dist = dist
+        return self._dist
+    
+    def _update_distances(self, dist, rows):
+        """Recalculates the entries of `dist` for the points in `rows`."""
+        arr = self.doe
+        for i in rows:
+            d = sum(abs(arr-arr[i])**self.p, axis=1)
+            if self.p != 1:
+                d **= 1.0/self.p
+            dist[i,:] = d
+            dist[:,i] = d
+    
+    def _pair_terms(self, rows=None):
+        """Returns the sum of distance**(-q) over all pairs of points or, if
+        `rows` is given, over the pairs involving at least one of `rows`."""
+        dist = self._distances()
+        if rows is None:
+            upper = triu_indices(dist.shape[0], 1)
+            return sum(dist[upper]**(-float(self.q)))
+        others = ones(dist.shape[0], dtype=bool)
+        others[rows] = False
+        block = dist[rows]
+        inner = block[:,rows][triu_indices(len(rows), 1)]
+        return sum(block[:,others]**(-float(self.q))) + \
+               sum(inner**(-float(self.q)))
+    
     def mmphi(self):
         """Returns the Morris-Mitchell sampling criterion for this Latin hypercube."""
 
         if self.phi is None:
-            n,m = self.doe.shape
-            distdict = {}
-            
-            #calculate the norm between each pair of points in the DOE
-            # TODO: This norm takes up the majority of the computation time. It
-            # should be converted to C or ShedSkin.
-            arr = self.doe
-            for i in range(n):
-                for j in range(i+1, n):
-                    nrm = norm(arr[i]-arr[j], ord=self.p)
-                    distdict[nrm] = distdict.get(nrm, 0) + 1
-    
-            distinct_d = array(distdict.keys())
-            
-            #mutltiplicity array with a count of how many pairs of points have a given distance
-            J = array(distdict.values())
-            
-            self.phi = sum(J*(distinct_d**(-self.q)))**(1.0/self.q)
+            if self._phisum is None:
+                self._phisum = self._pair_terms()
+            self.phi = self._phisum**(1.0/self.q)
         
         return self.phi
     
@@ -122,6 +149,7 @@ class LHC_indivudal(object):
         """
         new_doe = self.doe.copy()
         n,k = self.doe.shape
+        rows = set()
         for count in range(mutation_count): 
             col = randint(0, k-1)
             
@@ -131,10 +159,26 @@ class LHC_indivudal(object):
             while el1==el2: 
                 el2 = randint(0, n-1)
            
-            new_doe[el1, col] = self.doe[el2, col]
-            new_doe[el2, col] = self.doe[el1, col] 
+            new_doe[el1, col], new_doe[el2, col] = \
+                new_doe[el2, col], new_doe[el1, col]
+            rows.update((el1, el2))
                
-        return LHC_indivudal(new_doe, self.q, self.p)
+        new_lhc = LHC_indivudal(new_doe, self.q, self.p)
+        
+        # Only the distances from the swapped points change, so update
+        # ours rather than recalculating all of them.
+        if self._dist is not None:
+            rows = sorted(rows)
+            new_lhc._dist = self._dist.copy()
+            new_lhc._update_distances(new_lhc._dist, rows)
+            # For large q a few close pairs dominate the sum, and
+            # subtracting them would lose the rest to roundoff.
+            if self._phisum is not None and isfinite(self._phisum):
+                removed = self._pair_terms(rows)
+                if removed <= 0.5*self._phisum:
+                    new_lhc._phisum = self._phisum - removed + \
+                                      new_lhc._pair_terms(rows)
+        return new_lhc
     
     def __iter__(self):
         return self._get_rows()
@@ -7,6 +7,7 @@ import unittest
 import random
 
 from numpy import array, zeros
+from numpy.linalg import norm
 
 from openmdao.main.api import Assembly, Component, Case, set_as_top
 from openmdao.lib.doegenerators.optlh import LHC_indivudal, OptLatinHypercube, _mmlhs, \
@@ -24,6 +25,25 @@ class TestCase(unittest.TestCase):
         self.assertTrue(is_latin_hypercube(lh_opt))
         self.assertTrue(opt_phi < phi1)
         
+    def test_mmphi(self):
+        def brute_phi(doe, q, p):
+            n = doe.shape[0]
+            total = 0.
+            for i in range(n):
+                for j in range(i+1, n):
+                    total += norm(doe[i]-doe[j], ord=p)**(-float(q))
+            return total**(1.0/q)
+
+        for q, p in [(1, 1), (2, 2), (50, 1)]:
+            lh = LHC_indivudal(rand_latin_hypercube(12,3), q, p)
+            self.assertAlmostEqual(lh.mmphi(), brute_phi(lh.doe, q, p))
+            # perturbed copies update the parent's distances
+            for i in range(10):
+                lh = lh.perturb(2)
+                phi = lh.mmphi()
+                self.assertTrue(is_latin_hypercube(lh))
+                self.assertAlmostEqual(phi/brute_phi(lh.doe, q, p), 1.)
+
     def test_OptLatinHypercube(self):
         olh = OptLatinHypercube()
         olh.num_samples = 10
@@ -3,6 +3,7 @@
 
 """
 
+import hashlib
 import logging
 import os.path
 import Queue
@@ -10,10 +11,11 @@ import sys
 import thread
 import threading
 import traceback
+import zipfile
 
 from openmdao.main.datatypes.api import Bool, Dict, Enum, Int, Slot
 
-from openmdao.main.api import Driver
+from openmdao.main.api import Case, Driver
 from openmdao.main.exceptions import RunStopped, TracedError, traceback_str
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.interfaces import ICaseIterator, ICaseRecorder, ICaseFilter
@@ -25,7 +27,7 @@ from openmdao.util.filexfer import filexfer
 from openmdao.util.decorators import add_delegate
 from openmdao.main.hasparameters import HasParameters
 
-from openmdao.lib.casehandlers.api import ListCaseRecorder
+from openmdao.lib.casehandlers.api import ListCaseIterator, ListCaseRecorder
 
 _EMPTY     = 'empty'
 _LOADING   = 'loading'
@@ -36,6 +38,24 @@ class _ServerError(Exception):
     pass
 
 
+def _egg_digest(egg_file):
+    """
+    Returns a digest of the contents of `egg_file`. The egg metadata is
+    skipped since it contains the egg's version, which changes every time
+    the model is replicated even if the model itself hasn't changed.
+    """
+    digest = hashlib.sha1()
+    egg = zipfile.ZipFile(egg_file, 'r')
+    try:
+        for name in sorted(egg.namelist()):
+            if not name.startswith('EGG-INFO/'):
+                digest.update(name)
+                digest.update(egg.read(name))
+    finally:
+        egg.close()
+    return digest.hexdigest()
+
+
 class CaseIterDriverBase(Driver):
     """
     A base class for Drivers that run sets of cases in a manner similar
@@ -73,6 +93,7 @@ class CaseIterDriverBase(Driver):
         self._abort_exc = None  # Set if error_policy == ABORT.
 
         self._egg_file = None
+        self._egg_hash = None
         self._egg_required_distributions = None
         self._egg_orphan_modules = None
 
@@ -205,6 +226,7 @@ class CaseIterDriverBase(Driver):
                     self.parent.driver = driver
 
                 self._egg_file = egg_info[0]
+                self._egg_hash = _egg_digest(self._egg_file)
                 self._egg_required_distributions = egg_info[1]
                 self._egg_orphan_modules = [name for name, path in egg_info[2]]
 
@@ -384,8 +406,9 @@ class CaseIterDriverBase(Driver):
         self._todo = []
         self._rerun = []
 
-        if self._egg_file and os.path.exists(self._egg_file):
-            os.remove(self._egg_file)
+        if remove_egg and self._egg_file:
+            if os.path.exists(self._egg_file):
+                os.remove(self._egg_file)
             self._egg_file = None
 
     def _server_ready(self, server, stepping=False):
@@ -562,16 +585,11 @@ class CaseIterDriverBase(Driver):
                 case.add_output(var, val)
 
         try:
-            for event in self.get_events(): 
-                try: 
-                    self._model_set(server, event, None, True)
-                except Exception as exc:
-                    msg = 'Exception setting %r: %s' % (event, exc)
-                    self._logger.debug('    %s', msg)
-                    self.raise_exception(msg, _ServerError)
+            # Events are set along with the case inputs in a single call.
+            events = [(event, True, None) for event in self.get_events()]
             try:
                 scope = self.parent if server is None else self._top_levels[server]
-                case.apply_inputs(scope)
+                case.apply_inputs(scope, extra=events)
             except Exception as exc:
                 msg = 'Exception setting case inputs: %s' % exc
                 self._logger.debug('    %s', msg)
@@ -608,8 +626,10 @@ class CaseIterDriverBase(Driver):
             reply_q.put((name, False, None))
             return
         else:
-            # Clear egg re-use indicator.
-            server_info['egg_file'] = None
+            # Servers reused from the RAM pool may already have our egg.
+            server_info.setdefault('egg_file', None)
+            server_info.setdefault('egg_hash', None)
+            server_info.setdefault('model', None)
             self._logger.debug('%r using %r', name, server_info['name'])
             if self._logger.level == logging.NOTSET:
                 # By default avoid lots of protocol messages.
@@ -657,9 +677,23 @@ class CaseIterDriverBase(Driver):
             self._queues[server].put((self._remote_load_model, server))
 
     def _remote_load_model(self, server):
-        """ Load model into remote server. """
-        egg_file = self._server_info[server].get('egg_file', None)
-        if egg_file is None or egg_file is not self._egg_file:
+        """
+        Load model into remote server. Servers reused from the RAM pool keep
+        the egg (and model) from their last use, so if the egg's contents
+        haven't changed it isn't transferred again, and if the model isn't
+        reloaded between executions it isn't loaded again either.
+        """
+        info = self._server_info[server]
+        if info.get('egg_hash') != self._egg_hash:
+            # Remove the superseded egg so eggs don't pile up on the server.
+            old_egg = info.get('egg_file')
+            info['egg_file'] = info['egg_hash'] = info['model'] = None
+            if old_egg is not None and old_egg != self._egg_file:
+                try:
+                    self._servers[server].remove(old_egg)
+                except Exception as exc:
+                    self._logger.warning('server %r remove of %r failed: %r',
+                                         server, old_egg, exc)
             # Only transfer if changed.
             try:
                 filexfer(None, self._egg_file,
@@ -672,25 +706,28 @@ class CaseIterDriverBase(Driver):
                 self._exceptions[server] = TracedError(exc, traceback.format_exc())
                 return
             else:
-                self._server_info[server]['egg_file'] = self._egg_file
+                info['egg_file'] = self._egg_file
+                info['egg_hash'] = self._egg_hash
+
+        elif server not in self._top_levels and not self.reload_model and \
+             info.get('model') is not None:
+            # The model from the last run of this egg is still loaded.
+            self._top_levels[server] = info['model']
+            return
+
         try:
-            tlo = self._servers[server].load_model(self._egg_file)
+            tlo = self._servers[server].load_model(info['egg_file'])
         # Difficult to force load error.
         except Exception as exc:  #pragma nocover
             self._logger.error('server.load_model of %r failed: %r',
-                               self._egg_file, exc)
+                               info['egg_file'], exc)
+            info['model'] = None
             self._top_levels[server] = None
             self._exceptions[server] = TracedError(exc, traceback.format_exc())
         else:
+            info['model'] = tlo
             self._top_levels[server] = tlo
 
-    def _model_set(self, server, name, index, value):
-        """ Set value in server's model. """
-        if server is None:
-            self.parent.set(name, value, index)
-        else:
-            self._top_levels[server].set(name, value, index)
-
     def _model_execute(self, server):
         """ Execute model in server. """
         self._exceptions[server] = None
@@ -762,3 +799,91 @@ class CaseIteratorDriver(CaseIterDriverBase):
         finally:
             self.evaluated = self.recorders.pop().get_iterator()
 
+
+class ReplicaEvaluator(object):
+    """
+    Evaluates cases for a driver concurrently, on replicas of the driver's
+    workflow running on servers obtained from the
+    :class:`ResourceAllocationManager`. The model is replicated the first time
+    cases are evaluated, and the replicas are reused until :meth:`cleanup`
+    is called.
+
+    driver: Driver
+        Driver whose parameters are set by the cases.
+
+    suffix: string
+        Appended to the driver's name to name the
+        :class:`CaseIteratorDriver` running the replicas.
+
+    owner: object
+        Object whose ``raise_exception`` reports errors. Defaults to `driver`.
+    """
+
+    def __init__(self, driver, suffix, owner=None):
+        self.driver = driver
+        self.suffix = suffix
+        self.owner = driver if owner is None else owner
+        self._cid = None
+
+    def __getstate__(self):
+        # The replicas don't go along with a copy of the model.
+        state = self.__dict__.copy()
+        state['_cid'] = None
+        return state
+
+    def make_case(self, values, outputs, label=None):
+        """
+        Returns a :class:`Case` which sets the driver's parameters to
+        `values` and records `outputs`.
+        """
+        driver = self.driver
+        case = Case(outputs=outputs, label=label, parent_uuid=driver._case_id)
+        for param, val in zip(driver.get_parameters().values(), values):
+            if param.scaler is not None:
+                val = (val + param.adder)*param.scaler
+            for target in param.targets:
+                case.add_input(target, val)
+        return case
+
+    def evaluate(self, cases, what='case'):
+        """
+        Evaluates `cases`, filling in their outputs. Raises RuntimeError if
+        any of them couldn't be evaluated. `what` names a case in the error
+        message.
+        """
+        replicate = self._cid is None
+        if replicate:
+            driver = self.driver
+            cid = CaseIteratorDriver()
+            cid.name = '%s_%s' % (driver.name, self.suffix)
+            cid.parent = driver.parent
+            cid.workflow = driver.workflow.__class__(cid,
+                                    members=driver.workflow.get_names())
+            cid.sequential = False
+            cid.reload_model = False
+            cid.max_retries = 0
+        else:
+            cid = self._cid
+
+        cid.iterator = ListCaseIterator(cases)
+        recorder = ListCaseRecorder()
+        cid.recorders = [recorder]
+        cid.setup(replicate=replicate)
+        self._cid = cid
+        cid.resume(remove_egg=False)
+
+        for case in recorder.cases:
+            if case.msg:
+                self.owner.raise_exception('error evaluating %s: %s'
+                                           % (what, case.msg), RuntimeError)
+
+        if len(recorder.cases) != len(cases):
+            self.owner.raise_exception('only %d of %d %ss were evaluated'
+                                       % (len(recorder.cases), len(cases),
+                                          what), RuntimeError)
+
+    def cleanup(self):
+        """ Removes the replicated model. """
+        if self._cid is not None:
+            self._cid._cleanup(remove_egg=True)
+            self._cid = None
@@ -12,7 +12,7 @@ import logging
 from math import isnan
 
 try:
-    from numpy import zeros, array
+    from numpy import zeros
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
     # to keep class decl from barfing before being stubbed out
@@ -146,22 +146,17 @@ class COBYLAdriver(Driver):
             self.raise_exception(msg, RuntimeError)
             
         # Constraints (COBYLA defines positive as satisfied)
-        con_list = []
-        for v in self.get_ineq_constraints().values():
-            val = v.evaluate(self.parent)
-            if '>' in val[2]:
-                con_list.append(val[0]-val[1])
-            else:
-                con_list.append(val[1]-val[0])
+        g = self.g
+        ncon = self.ncon - 2*self.nparam
+        self.eval_ineq_constraint_vector(out=g[:ncon])
+        g[:ncon] *= -1.0
                 
         # Side Constraints
-        for param in self.get_parameters().values():
+        for i, param in enumerate(self.get_parameters().values()):
             val = param.evaluate(self.parent)
         
-            con_list.append(val - param.low)
-            con_list.append(param.high - val)
-                
-        g = array(con_list)
+            g[ncon+2*i] = val - param.low
+            g[ncon+2*i+1] = param.high - val
         
         # Write out some relevant information to the recorder
         self.record_case()
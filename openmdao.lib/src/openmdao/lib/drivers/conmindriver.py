@@ -28,7 +28,7 @@ import logging
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import zeros, ones
+    from numpy import zeros, ones, nonzero
     from numpy import int as numpy_int
     import conmin.conmin as conmin
 except ImportError as err:
@@ -392,12 +392,8 @@ class CONMINdriver(DriverUsesDerivatives):
             self.cnmn1.obj = self.eval_objective()
 
             # update constraint value array
-            for i, v in enumerate(self.get_ineq_constraints().values()):
-                val = v.evaluate(self.parent)
-                if '>' in val[2]:
-                    self.constraint_vals[i] = val[1]-val[0]
-                else:
-                    self.constraint_vals[i] = val[0]-val[1]
+            self.eval_ineq_constraint_vector(
+                out=self.constraint_vals[:self.cnmn1.ncon])
                 
             #self._logger.debug('constraints = %s'%self.constraint_vals)
                 
@@ -412,16 +408,17 @@ class CONMINdriver(DriverUsesDerivatives):
                 
             self.d_obj[:-2] = self.differentiator.get_gradient(self.get_objectives().keys()[0])
             
-            for i in range(len(self.cons_active_or_violated)):
-                self.cons_active_or_violated[i] = 0
-                
-            self.cnmn1.nac = 0
-            for i, name in enumerate(self.get_ineq_constraints().keys()):
-                if self.constraint_vals[i] >= self.cnmn1.ct:
-                    self.cons_active_or_violated[self.cnmn1.nac] = i+1
-                    self.d_const[:-2, self.cnmn1.nac] = \
-                        self.differentiator.get_gradient(name)
-                    self.cnmn1.nac += 1
+            self.cons_active_or_violated[:] = 0
+            
+            active = nonzero(self.constraint_vals[:self.cnmn1.ncon] >=
+                             self.cnmn1.ct)[0]
+            nac = len(active)
+            if nac:
+                names = self.get_ineq_constraints().keys()
+                self.cons_active_or_violated[:nac] = active+1
+                self.d_const[:-2, :nac] = self.differentiator.get_jacobian(
+                    [names[i] for i in active]).T
+            self.cnmn1.nac = nac
                     
         else:
             self.raise_exception('Unexpected value for flag INFO returned \
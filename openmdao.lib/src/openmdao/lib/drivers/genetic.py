@@ -18,7 +18,7 @@ from pyevolve import GSimpleGA, Selectors, Initializators, Mutators, Consts
 # pylint: disable-msg=E0611,F0401
 from openmdao.main.datatypes.api import Python, Enum, Float, Int, Bool, Slot
 
-from openmdao.main.api import Driver 
+from openmdao.main.api import Driver
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.hasobjective import HasObjective
 from openmdao.main.hasevents import HasEvents
@@ -26,9 +26,11 @@ from openmdao.main.interfaces import IHasParameters, IHasObjective, \
                                      implements, IOptimizer
 from openmdao.util.decorators import add_delegate
 from openmdao.util.typegroups import real_types, int_types, iterable_types
+from openmdao.lib.drivers.caseiterdriver import ReplicaEvaluator
 
 array_test = re.compile("(\[[0-9]+\])+$")
 
+
 @add_delegate(HasParameters, HasObjective, HasEvents)
 class Genetic(Driver):
     """Genetic algorithm for the OpenMDAO framework, based on the Pyevolve
@@ -82,6 +84,11 @@ class Genetic(Driver):
                     "for repeatable results; otherwise leave as None for truly "
                     "random seeding.")
     
+    sequential = Bool(True, iotype="in",
+                      desc="If True, evaluate the members of each generation "
+                           "one after the other. Otherwise the new members "
+                           "of a generation are evaluated concurrently.")
+    
     def _make_alleles(self): 
         """ Returns a GAllelle.Galleles instance with alleles corresponding to 
         the parameters specified by the user"""
@@ -120,6 +127,8 @@ class Genetic(Driver):
     def execute(self):
         """Perform the optimization"""
         self.set_events()
+        self._fitness = {}
+        self._pending = []
 
         alleles = self._make_alleles()
         
@@ -127,8 +136,17 @@ class Genetic(Driver):
         genome.setParams(allele=alleles)
         genome.evaluator.set(self._run_model)
         
-        genome.mutator.set(Mutators.G1DListMutatorAllele)
-        genome.initializator.set(Initializators.G1DListInitializatorAllele)
+        if self.sequential:
+            genome.mutator.set(Mutators.G1DListMutatorAllele)
+            genome.initializator.set(Initializators.G1DListInitializatorAllele)
+            self._replicas = None
+        else:
+            # Pyevolve evaluates a generation after all of its members have
+            # been created, so note each new member and evaluate them all
+            # when the first one is needed.
+            genome.mutator.set(self._mutate)
+            genome.initializator.set(self._initialize)
+            self._replicas = ReplicaEvaluator(self, 'ga')
         #TODO: fix tournament size settings        
         #genome.setParams(tournamentPool=self.tournament_size)
         
@@ -154,11 +172,18 @@ class Genetic(Driver):
         ga.selector.set(self._selection_mapping[self.selection_method])
         
         #GO
-        ga.evolve(freq_stats=0)
+        try:
+            ga.evolve(freq_stats=0)
+        finally:
+            if self._replicas is not None:
+                self._replicas.cleanup()
+                self._replicas = None
 
         self.best_individual = ga.bestIndividual()
         
         #run it once to get the model into the optimal state
+        self._fitness = {}
+        self._pending = []
         self._run_model(self.best_individual) 
         
         # TODO - We really need to be able to record the best candidate from each
@@ -167,8 +192,45 @@ class Genetic(Driver):
         self.record_case()
         
     def _run_model(self, chromosome):
+        # Elitism and crossover of identical parents produce chromosomes
+        # that have already been evaluated.
+        key = tuple(chromosome)
+        if key not in self._fitness and self._pending:
+            self._run_generation([chromosome] + self._pending)
+        try:
+            return self._fitness[key]
+        except KeyError:
+            pass
         self.set_parameters([val for val in chromosome])
         self.run_iteration()
-        return self.eval_objective()
+        fitness = self._fitness[key] = self.eval_objective()
+        return fitness
     
+    def _initialize(self, genome, **args):
+        """Initializes a new member of the first generation."""
+        self._pending.append(genome)
+        return Initializators.G1DListInitializatorAllele(genome, **args)
     
+    def _mutate(self, genome, **args):
+        """Mutates a new member of a generation."""
+        self._pending.append(genome)
+        return Mutators.G1DListMutatorAllele(genome, **args)
+    
+    def _run_generation(self, individuals):
+        """Evaluates the chromosomes of `individuals` that haven't been
+        evaluated yet concurrently and caches their fitness so that the
+        following calls to :meth:`_run_model` don't run the model."""
+        self._pending = []
+        keys = []
+        for individual in individuals:
+            key = tuple(individual)
+            if key not in self._fitness and key not in keys:
+                keys.append(key)
+        if len(keys) < 2:
+            return
+        
+        objective = self.get_objectives().values()[0].text
+        cases = [self._replicas.make_case(key, [objective]) for key in keys]
+        self._replicas.evaluate(cases, 'population member')
+        for key, case in zip(keys, cases):
+            self._fitness[key] = case[objective]
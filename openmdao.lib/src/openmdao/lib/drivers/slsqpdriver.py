@@ -12,7 +12,7 @@ import logging
 from math import isnan
 
 try:
-    from numpy import zeros, array
+    from numpy import zeros
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
     # to keep class decl from barfing before being stubbed out
@@ -86,6 +86,7 @@ class SLSQPdriver(DriverUsesDerivatives):
         self.x = zeros(0,'d')
         self.x_lower_bounds = zeros(0,'d')
         self.x_upper_bounds = zeros(0,'d')
+        self._con_names = []
         
         # We auto-fill the slot because the gradient is required
         # in this implementation
@@ -102,6 +103,10 @@ class SLSQPdriver(DriverUsesDerivatives):
         self.ncon = len(self.get_constraints())
         self.neqcon = len(self.get_eq_constraints())
         
+        # SLSQP expects the equality constraints first
+        self._con_names = self.get_eq_constraints().keys() + \
+                          self.get_ineq_constraints().keys()
+        
         # get the initial values of the parameters
         self.x = zeros(self.nparam,'d')
         params = self.get_parameters().values()
@@ -183,17 +188,9 @@ class SLSQPdriver(DriverUsesDerivatives):
             msg = "Numerical overflow in the objective."
             self.raise_exception(msg, RuntimeError)
             
-        # Constraints
+        # Constraints (SLSQP defines positive as satisfied)
         if self.ncon > 0 :
-            con_list = []
-            for v in self.get_constraints().values():
-                val = v.evaluate(self.parent)
-                if '>' in val[2]:
-                    con_list.append(val[0]-val[1])
-                else:
-                    con_list.append(val[1]-val[0])
-                
-            g = array(con_list)
+            g = -self.eval_constraint_vector()
             
             
         if self.iprint > 0:
@@ -218,9 +215,8 @@ class SLSQPdriver(DriverUsesDerivatives):
             self.differentiator.get_gradient(self.get_objectives().keys()[0])
 
         if self.ncon > 0 :
-            for i, con in enumerate(self.get_constraints().keys()):
-                dg[i][0:self.nparam] = \
-                    -self.differentiator.get_gradient(con)
+            dg[0:self.ncon, 0:self.nparam] = \
+                -self.differentiator.get_jacobian(self._con_names)
         
         return df, dg
     
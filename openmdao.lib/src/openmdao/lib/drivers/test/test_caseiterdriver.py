@@ -6,9 +6,12 @@ import logging
 import os
 import pkg_resources
 import re
+import shutil
 import sys
+import tempfile
 import time
 import unittest
+import zipfile
 import nose
 
 import random
@@ -21,7 +24,7 @@ from openmdao.main.exceptions import RunStopped
 from openmdao.main.resource import ResourceAllocationManager, ClusterAllocator
 
 from openmdao.lib.datatypes.api import Float, Bool, Array, Int, Slot, Str
-from openmdao.lib.drivers.caseiterdriver import CaseIteratorDriver
+from openmdao.lib.drivers.caseiterdriver import CaseIteratorDriver, _egg_digest
 from openmdao.lib.drivers.simplecid import SimpleCaseIterDriver
 from openmdao.lib.casehandlers.api import ListCaseRecorder, ListCaseIterator, \
                                           SequenceCaseFilter
@@ -526,6 +529,24 @@ class TestCase(unittest.TestCase):
         top.run()
         self.verify_itername(sub.driver.evaluated, subassembly=True)
 
+    def test_egg_digest(self):
+        # The digest depends on the model files, not on the egg metadata.
+        tmpdir = tempfile.mkdtemp()
+        try:
+            paths = []
+            for i, (version, state) in enumerate((('1', 'abc'), ('2', 'abc'),
+                                                  ('3', 'xyz'))):
+                path = os.path.join(tmpdir, 'model%d.egg' % i)
+                egg = zipfile.ZipFile(path, 'w')
+                egg.writestr('EGG-INFO/PKG-INFO', 'Version: %s\n' % version)
+                egg.writestr('model/model.pickle', state)
+                egg.close()
+                paths.append(path)
+            self.assertEqual(_egg_digest(paths[0]), _egg_digest(paths[1]))
+            self.assertNotEqual(_egg_digest(paths[0]), _egg_digest(paths[2]))
+        finally:
+            shutil.rmtree(tmpdir)
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=openmdao.lib.drivers')
@@ -14,6 +14,7 @@ from pyevolve import Selectors
 
 from openmdao.main.api import Assembly, Component, set_as_top
 from openmdao.lib.drivers.genetic import Genetic
+from openmdao.lib.drivers.caseiterdriver import CaseIterDriverBase
 from openmdao.main.eggchecker import check_save_load
 
 # pylint: disable-msg=E1101
@@ -120,6 +121,47 @@ class TestCase(unittest.TestCase):
         self.assertEqual(y, 0)
         self.assertEqual(z, 0)
 
+    def test_concurrent(self):
+        self.top.add('comp', SphereFunction())
+        self.top.driver.workflow.add('comp')
+        self.top.driver.add_objective("comp.total")
+
+        self.top.driver.add_parameter('comp.x')
+        self.top.driver.add_parameter('comp.y')
+        self.top.driver.add_parameter('comp.z')
+
+        self.top.driver.mutation_rate = .02
+        self.top.driver.generations = 1
+        self.top.driver.opt_type = "minimize"
+        self.top.driver.sequential = False
+
+        # Note how many times the model has been replicated at each
+        # evaluation of cases.
+        replicants = []
+        setup = CaseIterDriverBase.__dict__['setup']
+        def counting_setup(cid, replicate=True):
+            setup(cid, replicate)
+            replicants.append(cid._replicants)
+        CaseIterDriverBase.setup = counting_setup
+        try:
+            self.top.run()
+        finally:
+            CaseIterDriverBase.setup = setup
+
+        # One replication was used for every generation.
+        self.assertTrue(len(replicants) > 1)
+        self.assertEqual(set(replicants), set([1]))
+
+        # Same answer as the sequential evaluation in test_optimizeSphere.
+        self.assertAlmostEqual(self.top.driver.best_individual.score,
+                               .02,places = 1)
+        x,y,z = [x for x in self.top.driver.best_individual]
+        self.assertAlmostEqual(x, 0.135, places = 2)
+        self.assertEqual(y, 0)
+        self.assertEqual(z, 0)
+        self.assertAlmostEqual(self.top.comp.total,
+                               self.top.driver.best_individual.score)
+
     def test_optimizeSpherearray_nolowhigh(self):
         self.top.add('comp', SphereFunctionArray())
         self.top.driver.workflow.add('comp')
@@ -1,18 +1,18 @@
 """ Surrogate model based on Kriging. """
 
-from math import log, e, sqrt
 import logging
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import array, zeros, dot, ones, arange, eye, abs, vstack, exp, diag
+    from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, diag, \
+                      log, log10, sqrt, maximum, concatenate, tril, triu
     from numpy.linalg import det, linalg, lstsq
-    from scipy.linalg import cho_factor, cho_solve
-    from scipy.optimize import fmin
+    from scipy.linalg import cho_factor, cho_solve, cholesky, solve_triangular
+    from scipy.optimize import fmin, fmin_l_bfgs_b
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
-from openmdao.main.interfaces import implements, ISurrogate
+from openmdao.main.interfaces import implements, IIncrementalSurrogate
 from openmdao.main.uncertain_distributions import NormalDistribution
 from openmdao.util.decorators import stub_if_missing_deps
 from openmdao.main.api import Container
@@ -23,7 +23,7 @@ class KrigingSurrogate(Container):
     """Surrogate Modeling method based on the simple Kriging interpolation. Predictions are returned
     as a NormalDistribution instance."""
     
-    implements(ISurrogate)
+    implements(IIncrementalSurrogate)
     
     def __init__(self):
         super(KrigingSurrogate, self).__init__()
@@ -32,6 +32,17 @@ class KrigingSurrogate(Container):
         self.n = None #number of training points
         self.thetas = None
         self.nugget = 0 #nugget smoothing parameter from [Sasena, 2002]
+
+        # 'nelder-mead' or 'l-bfgs-b'. L-BFGS-B uses the gradient of the
+        # log likelihood and keeps log10(thetas) within theta_bounds, where
+        # the bounds apply to inputs that have been scaled to [0,1].
+        self.optimizer = 'nelder-mead'
+        self.theta_bounds = (-3., 2.)
+
+        # add_points() keeps thetas fixed until this many points have been
+        # added, then retrains. 0 means never retrain.
+        self.refit_interval = 10
+        self._n_added = 0
         
         self.R = None
         self.R_fact = None
@@ -48,56 +59,42 @@ class KrigingSurrogate(Container):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
+        f, RMSE = self.predict_many([new_x])
+        return NormalDistribution(f[0], RMSE[0])
+
+    def predict_many(self, new_X):
+        """Calculates predicted values of the response for each of the
+        points in new_X, which is a 2-D array or a list of lists of inputs.
+        Returns a tuple of arrays of the form (mean, RMSE).
+        """
         if self.m == None: #untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
-        X, Y = self.X, self.Y
+        new_X = array(new_X, dtype=float).reshape(-1, self.m)
         thetas = 10.**self.thetas
-        XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i]-new_x)**2.)
-        r = exp(-r)
-            
-        one = ones(self.n)
+
+        # weighted distances to each training point:
+        # sum(thetas*(x-X)**2) = sum(thetas*x**2) + sum(thetas*X**2) - 2*x.(thetas*X)
+        XX = self._X
+        dist = (thetas*new_X**2).sum(axis=1)[:, None] + \
+               (thetas*XX**2).sum(axis=1)[None, :] - \
+               2.*dot(new_X*thetas, XX.T)
+        r = exp(-maximum(dist, 0.))
+
         if self.R_fact is not None: 
             #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
-            
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            R_fact = (self.R_fact[0].T,not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-            
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
-            
+            Rinv_r = cho_solve(self.R_fact, r.T)
         else: 
             #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
-            
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-      
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
+            Rinv_r = lstsq(self.R, r.T)[0]
+
+        f = self.mu + dot(r, self._alpha)
+        term1 = (r.T*Rinv_r).sum(axis=0)
+        term2 = (1.0 - Rinv_r.sum(axis=0))**2./self._one_Rinv_one
+
         MSE = self.sig2*(1.0-term1+term2)
         RMSE = sqrt(abs(MSE))
-        
-        dist = NormalDistribution(f, RMSE)
-        return dist
-        
+        return f, RMSE
 
     def train(self,X,Y):
         """Train the surrogate model with the given set of inputs and outputs."""
@@ -113,48 +110,146 @@ class KrigingSurrogate(Container):
         self.Y = Y
         self.m = len(X[0])
         self.n = len(X)
+
+        self._X = array(X, dtype=float).reshape(self.n, self.m)
+        self._Y = array(Y, dtype=float)
+        # squared distance between each pair of points in each dimension
+        self._D2 = (self._X[:, None, :]-self._X[None, :, :])**2
+        self._n_added = 0
                 
         thetas = zeros(self.m)
-        def _calcll(thetas):
-            self.thetas = thetas
-            self._calculate_log_likelihood()
-            return -self.log_likelihood
-        #if self.thetas == None:
-        self.thetas = fmin(_calcll, thetas, disp=False, ftol = 0.0001)
+        if self.optimizer == 'l-bfgs-b':
+            def _calcll_grad(thetas):
+                self.thetas = thetas
+                self._calculate_log_likelihood()
+                return -self.log_likelihood, \
+                       -self._calculate_log_likelihood_gradient()
+            span = self._X.max(axis=0)-self._X.min(axis=0)
+            span[span == 0.] = 1.
+            shift = -2.*log10(span)
+            low, high = self.theta_bounds
+            # start from the upper bound, where R is well conditioned
+            self.thetas = fmin_l_bfgs_b(_calcll_grad, shift+high,
+                                        bounds=[(low+s, high+s) for s in shift])[0]
+        elif self.optimizer == 'nelder-mead':
+            def _calcll(thetas):
+                self.thetas = thetas
+                self._calculate_log_likelihood()
+                return -self.log_likelihood
+            #if self.thetas == None:
+            self.thetas = fmin(_calcll, thetas, disp=False, ftol = 0.0001)
+        else:
+            raise ValueError("unknown optimizer '%s', must be 'nelder-mead' "
+                             "or 'l-bfgs-b'" % self.optimizer)
         self._calculate_log_likelihood()
         
+    def add_points(self, X, Y):
+        """Add the given training points to the model. The current thetas
+        are kept and the Cholesky factor of the correlation matrix is
+        extended with the new rows, unless `refit_interval` points have
+        been added since the last training, in which case the model is
+        retrained with all of the points.
+        """
+        if self.m == None: #untrained surrogate
+            self.train(X, Y)
+            return
+        new_X = array(X, dtype=float).reshape(-1, self.m)
+        all_X = vstack([self._X, new_X])
+        all_Y = concatenate([self._Y, array(Y, dtype=float)])
+        self._n_added += len(new_X)
+        if self.refit_interval and self._n_added >= self.refit_interval:
+            self.train(all_X, all_Y)
+            return
+
+        n = self.n
+        k = len(new_X)
+        D2 = zeros((n+k, n+k, self.m))
+        D2[:n, :n] = self._D2
+        D2[n:] = (new_X[:, None, :]-all_X[None, :, :])**2
+        D2[:n, n:] = D2[n:, :n].transpose(1, 0, 2)
+        self.X, self.Y = all_X, all_Y
+        self._X, self._Y, self._D2 = all_X, all_Y, D2
+        self.n = n+k
+        R = self._correlation()
+
+        if self.R_fact is not None:
+            c, lower = self.R_fact
+            L = tril(c) if lower else triu(c).T
+            try:
+                L21 = solve_triangular(L, R[:n, n:], lower=True).T
+                L22 = cholesky(R[n:, n:]-dot(L21, L21.T), lower=True)
+            except (linalg.LinAlgError,ValueError):
+                pass
+            else:
+                L_new = zeros((n+k, n+k))
+                L_new[:n, :n] = L
+                L_new[n:, :n] = L21
+                L_new[n:, n:] = L22
+                self.R = R
+                try:
+                    self._use_factor((L_new, True))
+                    return
+                except (linalg.LinAlgError,ValueError):
+                    pass
+        self._calculate_log_likelihood()
+
+    def _correlation(self):
+        """Returns the correlation matrix for the current thetas."""
+        thetas = 10.**self.thetas
+        R = (1-self.nugget)*exp(-dot(self._D2, thetas)) #weighted distance formula
+        R.flat[::self.n+1] = 1.
+        return R
+
+    def _use_factor(self, R_fact):
+        """Calculates mu, sig2 and the log likelihood using the given
+        Cholesky factorization of R.
+        """
+        self.R_fact = R_fact
+        Y = self._Y
+        one = ones(self.n)
+        cho = cho_solve(R_fact, vstack([Y, one]).T).T
+
+        self.mu = dot(one,cho[0])/dot(one,cho[1])
+        self._one_Rinv_one = dot(one,cho[1])
+        self._alpha = cho[0]-self.mu*cho[1]
+        # log(det(R)) from the diagonal of the Cholesky factor
+        log_det = 2.*log(diag(R_fact[0])).sum()
+        self.sig2 = dot(Y-self.mu,self._alpha)/self.n
+        self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log_det
+
     def _calculate_log_likelihood(self):
         #if self.m == None:
         #    Give error message
-        R = zeros((self.n, self.n))
-        X,Y = array(self.X), array(self.Y)
-        thetas = 10.**self.thetas
-        for i in range(self.n):
-            for j in arange(i+1,self.n):
-                R[i,j] = (1-self.nugget)*e**(-sum(thetas*(X[i]-X[j])**2.)) #weighted distance formula
-        R = R + R.T + eye(self.n)
-        self.R = R
-        one = ones(self.n)
+        self.R = R = self._correlation()
         try:
-            self.R_fact = cho_factor(R)
-            rhs = vstack([Y, one]).T
-            R_fact = (self.R_fact[0].T,not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-            
-            self.mu = dot(one,cho[0])/dot(one,cho[1])
-            self.sig2 = dot(Y-dot(one,self.mu),cho_solve(self.R_fact,(Y-dot(one,self.mu))))/self.n
-            #self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))-sum(thetas)
-            self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))
+            self._use_factor(cho_factor(R))
         except (linalg.LinAlgError,ValueError):
             #------LSTSQ---------
             self.R_fact = None #reset this to none, so we know not to use cholesky
             #self.R = self.R+diag([10e-6]*self.n) #improve conditioning[Booker et al., 1999]
-            rhs = vstack([Y, one]).T
-            lsq = lstsq(self.R.T,rhs)[0].T
+            Y = self._Y
+            one = ones(self.n)
+            lsq = lstsq(self.R,vstack([Y, one]).T)[0].T
             self.mu = dot(one,lsq[0])/dot(one,lsq[1])
-            self.sig2 = dot(Y-dot(one,self.mu),lstsq(self.R,Y-dot(one,self.mu))[0])/self.n
-            self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))
-            #print self.log_likelihood
+            self._one_Rinv_one = dot(one,lsq[1])
+            self._alpha = lsq[0]-self.mu*lsq[1]
+            log_det = log(abs(det(self.R)+1.e-16))
+            self.sig2 = dot(Y-self.mu,self._alpha)/self.n
+            self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log_det
+
+    def _calculate_log_likelihood_gradient(self):
+        """Returns the gradient of the log likelihood with respect to
+        log10(thetas) for the current factorization of R.
+        """
+        if self.R_fact is not None:
+            Rinv = cho_solve(self.R_fact, eye(self.n))
+        else:
+            Rinv = lstsq(self.R, eye(self.n))[0]
+        alpha = self._alpha
+        W = (alpha[:, None]*alpha[None, :]/self.sig2 - Rinv)*self.R
+        # dR/dlog10(theta_k) = -ln(10)*theta_k*D2[:,:,k]*R
+        dLdtheta = dot(W.ravel(), self._D2.reshape(self.n*self.n, self.m))
+        return -0.5*log(10.)*(10.**self.thetas)*dLdtheta
 
 
 class FloatKrigingSurrogate(KrigingSurrogate):
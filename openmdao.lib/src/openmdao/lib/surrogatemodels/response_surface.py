@@ -3,11 +3,11 @@
 from numpy import matrix, linalg, power, multiply, concatenate, ones
 
 from openmdao.main.api import Container
-from openmdao.main.interfaces import implements,ISurrogate
+from openmdao.main.interfaces import implements,IIncrementalSurrogate
 from openmdao.lib.datatypes.api import Float, Bool
 
 class ResponseSurface(Container): 
-    implements(ISurrogate) 
+    implements(IIncrementalSurrogate) 
     
     def __init__(self,X=None,Y=None): 
         # must call HasTraits init to set up Traits stuff 
@@ -24,38 +24,56 @@ class ResponseSurface(Container):
         """Returns the value iself. Response surface equations don't have uncertainty.""" 
         return value
 
+    def _expand(self,X):
+        """Modify X to include constant, squared terms and cross terms."""
+        X = concatenate((matrix(ones((X.shape[0],1))),X),1) 
+        for i in range(1,self.n+1):
+            X = concatenate((X,power(X[:,i],2)),1)
+        for i in range(1,self.n):
+            for j in range(i+1,self.n+1):
+                X = concatenate((X,multiply(X[:,i],X[:,j])),1)
+        return X
+
     def train(self,X,Y): 
         """ Calculate response surface equation coefficients using least squares regression. """ 
         
-        X = matrix(X)
-        Y = matrix(Y).T
+        X = matrix(X, dtype=float)
+        Y = matrix(Y, dtype=float).T
         
         self.m = X.shape[0]
         self.n = X.shape[1]
         
-        # Modify X to include constant, squared terms and cross terms
-        X = concatenate((matrix(ones((self.m,1))),X),1) 
-        for i in range(1,self.n+1):
-            X = concatenate((X,power(X[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                X = concatenate((X,multiply(X[:,i],X[:,j])),1)
+        X = self._expand(X)
         
         # Determine response surface equation coefficients (betas) using least squares
         self.betas, rs, r, s = linalg.lstsq(X,Y)
+
+        # keep the normal equations so that points can be added later
+        self._XtX = X.T*X
+        self._XtY = X.T*Y
+
+    def add_points(self,X,Y):
+        """ Update the response surface equation coefficients with the given
+        additional training points using recursive least squares. The cost
+        doesn't depend on the number of points that have already been
+        added.
+        """
+        if self.m is None:
+            self.train(X,Y)
+            return
+
+        X = self._expand(matrix(X, dtype=float))
+        Y = matrix(Y, dtype=float).T
+
+        self.m += X.shape[0]
+        self._XtX += X.T*X
+        self._XtY += X.T*Y
+        self.betas = linalg.lstsq(self._XtX,self._XtY)[0]
         
     def predict(self,new_x): 
         """Calculates a predicted value of the response based on the current response surface model for the supplied list of inputs. """ 
         
-        new_x = matrix(new_x)
-        
-        # Modify new_x to include constant, squared terms and cross terms
-        new_x = concatenate((matrix(ones((1,1))),new_x),1) 
-        for i in range(1,self.n+1):
-            new_x = concatenate((new_x,power(new_x[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                new_x = concatenate((new_x,multiply(new_x[:,i],new_x[:,j])),1)
+        new_x = self._expand(matrix(new_x))
         
         # Predict new_y using new_x and betas
         new_y = new_x*self.betas
@@ -76,6 +76,46 @@ class KrigingSurrogateTests(unittest.TestCase):
         self.assertAlmostEqual(14.513550,pred.sigma,places=2)
         self.assertAlmostEqual(18.759264,pred.mu,places=2)
         
+    def test_predict_many(self):
+        x = array([[-2.,0.],[-0.5,1.5],[1.,3.],[8.5,4.5],[-3.5,6.],[4.,7.5],[-5.,9.],[5.5,10.5],
+                   [10.,12.],[7.,13.5],[2.5,15.]])
+        y = array([sin(a)+cos(b) for a,b in x])
+        krig1 = KrigingSurrogate()
+        krig1.train(x,y)
+
+        new_x = array([[5.,5.],[-1.,2.],[0.,14.]])
+        mu, rmse = krig1.predict_many(new_x)
+        for i,point in enumerate(new_x):
+            pred = krig1.predict(point)
+            self.assertAlmostEqual(pred.mu,mu[i],places=10)
+            self.assertAlmostEqual(pred.sigma,rmse[i],places=10)
+
+    def test_gradient_optimizer(self):
+        x = array([[0.05], [.25], [0.61], [0.95]])
+        y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
+        krig1 = KrigingSurrogate()
+        krig1.optimizer = 'l-bfgs-b'
+        krig1.train(x,y)
+        self.assertAlmostEqual(1.18375,krig1.thetas,places=4)
+
+        # check the gradient against finite differences
+        krig1.thetas = array([0.5])
+        krig1._calculate_log_likelihood()
+        grad = krig1._calculate_log_likelihood_gradient()
+        ll = krig1.log_likelihood
+        krig1.thetas = array([0.5+1e-7])
+        krig1._calculate_log_likelihood()
+        self.assertAlmostEqual(grad[0],(krig1.log_likelihood-ll)/1e-7,places=4)
+
+        krig1.optimizer = 'foo'
+        try:
+            krig1.train(x,y)
+        except ValueError,err:
+            self.assertEqual(str(err),"unknown optimizer 'foo', must be "
+                                      "'nelder-mead' or 'l-bfgs-b'")
+        else:
+            self.fail("ValueError Expected")
+
     def test_get_uncertain_value(self): 
         x = array([[0.05], [.25], [0.61], [0.95]])
         y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
@@ -2,14 +2,13 @@
 Pseudo package containing all of the main classes/objects in the 
 openmdao.main API.
 
+Objects that depend on the plugin machinery or are rarely used are imported
+on first access, see :func:`openmdao.util.lazyimport.lazy_attributes`.
 """
 
 from openmdao.util.log import logger, enable_console
 from openmdao.main.expreval import ExprEvaluator
 
-from openmdao.main.factory import Factory
-from openmdao.main.factorymanager import create, get_available_types
-
 from openmdao.main.container import Container, get_default_name, \
                                     create_io_traits
 from openmdao.main.vartree import VariableTree
@@ -19,7 +18,7 @@ from openmdao.main.driver_uses_derivatives import DriverUsesDerivatives
 from openmdao.main.assembly import Assembly, set_as_top, dump_iteration_tree
 from openmdao.main.driver import Driver
 from openmdao.main.workflow import Workflow
-from openmdao.main.dataflow import Dataflow
+from openmdao.main.dataflow import Dataflow, ParallelDataflow
 from openmdao.main.seqentialflow import SequentialWorkflow
 from openmdao.main.variable import Variable
 
@@ -29,9 +28,6 @@ from openmdao.main.filevar import FileMetadata, FileRef
 
 from openmdao.main.case import Case
 
-from openmdao.main.arch import Architecture
-from openmdao.main.problem_formulation import ArchitectureAssembly, OptProblem
-
 from openmdao.util.eggsaver import SAVE_PICKLE, SAVE_CPICKLE #, SAVE_YAML, SAVE_LIBYAML
 
 from openmdao.units import convert_units
@@ -41,3 +37,13 @@ from zope.interface import implements, Attribute, Interface
 # TODO: This probably shouldn't be here. Removing it will require edits to some
 # of our plugins
 from openmdao.main.datatypes.slot import Slot
+
+from openmdao.util.lazyimport import lazy_attributes
+lazy_attributes(__name__, {
+    'Factory': 'openmdao.main.factory',
+    'create': 'openmdao.main.factorymanager',
+    'get_available_types': 'openmdao.main.factorymanager',
+    'Architecture': 'openmdao.main.arch',
+    'ArchitectureAssembly': 'openmdao.main.problem_formulation',
+    'OptProblem': 'openmdao.main.problem_formulation',
+})
@@ -90,17 +90,47 @@ class ExprMapper(object):
     def __init__(self, scope):
         self._exprgraph = nx.DiGraph()  # graph of source expressions to destination expressions
         self._scope = scope
+        self._transfers = {}  # cached results of get_transfers()
+        self._output_exprs = None
+
+    def _config_changed(self):
+        """Discard cached transfer information when connections change."""
+        self._transfers = {}
+        self._output_exprs = None
 
     def get_output_exprs(self):
         """Return all destination expressions at the output boundary"""
-        exprs = []
+        if self._output_exprs is None:
+            exprs = []
+            graph = self._exprgraph
+            for node, data in graph.nodes(data=True):
+                if graph.in_degree(node) > 0:
+                    expr = data['expr']
+                    if len(expr.get_referenced_compnames()) == 0:
+                        exprs.append(expr)
+            self._output_exprs = exprs
+        return self._output_exprs
+
+    def get_transfers(self, name):
+        """Return a list of (srcexpr, destexpr) tuples for all connected
+        destination expressions that refer to the given variable or
+        component. The list is computed once and reused until
+        connections change.
+        """
+        try:
+            return self._transfers[name]
+        except KeyError:
+            pass
+
         graph = self._exprgraph
-        for node, data in graph.nodes(data=True):
-            if graph.in_degree(node) > 0:
-                expr = data['expr']
-                if len(expr.get_referenced_compnames()) == 0:
-                    exprs.append(expr)
-        return exprs
+        transfers = []
+        for expr in self.find_referring_exprs(name):
+            srctxt = self.get_source(expr)
+            if srctxt:
+                transfers.append((graph.node[srctxt]['expr'],
+                                  graph.node[expr]['expr']))
+        self._transfers[name] = transfers
+        return transfers
 
     def get_expr(self, text):
         node = self._exprgraph.node.get(text)
@@ -142,6 +172,7 @@ class ExprMapper(object):
         if refs:
             self._exprgraph.remove_nodes_from(refs)
             self._remove_disconnected_exprs()
+        self._config_changed()
 
     def connect(self, srcexpr, destexpr, scope):
         src = srcexpr.text
@@ -185,6 +216,7 @@ class ExprMapper(object):
             self._exprgraph.add_node(dest, expr=destexpr)
 
         self._exprgraph.add_edge(src, dest)
+        self._config_changed()
 
     def find_referring_exprs(self, name):
         """Returns a list of expression strings that reference the given name, which
@@ -205,6 +237,7 @@ class ExprMapper(object):
     def disconnect(self, srcpath, destpath=None):
         """Disconnect the given expressions/variables/components."""
         graph = self._exprgraph
+        self._config_changed()
 
         if destpath is None:
             if srcpath in graph:
@@ -264,6 +297,10 @@ class Assembly(Component):
 
     def __init__(self, directory=''):
 
+        # cached set of connected inputs, needed before the base class sets
+        # our directory, which invalidates our dependents
+        self._conn_ins = None
+
         super(Assembly, self).__init__(directory=directory)
 
         self._exprmapper = ExprMapper(self)
@@ -638,6 +675,7 @@ class Assembly(Component):
         or removed, etc.
         """
         super(Assembly, self).config_changed(update_parent)
+        self._conn_ins = None
         # driver must tell workflow that config has changed because
         # dependencies may have changed
         if self.driver is not None:
@@ -688,27 +726,24 @@ class Assembly(Component):
         component variables relative to the component, e.g., 'abc[3][1]' rather
         than 'comp1.abc[3][1]'.
         """
-        parent = self.parent
+        mapper = self._exprmapper
         expr_info = []
         invalids = []
 
-        if compname is not None:
-            pred = self._exprmapper._exprgraph.pred
-            if exprs:
-                ex = ['.'.join([compname, n]) for n in exprs]
-                exprs = []
-                for e in ex:
-                    exprs.extend([expr for expr in self._exprmapper.find_referring_exprs(e)
-                                  if expr in pred])
-            else:
-                exprs = [expr for expr in self._exprmapper.find_referring_exprs(compname)
-                             if expr in pred]
-        for expr in exprs:
-            srctxt = self._exprmapper.get_source(expr)
-            if srctxt:
-                srcexpr = self._exprmapper.get_expr(srctxt)
-                invalids.extend(srcexpr.invalid_refs())
-                expr_info.append((srcexpr, self._exprmapper.get_expr(expr)))
+        if compname is None:
+            for expr in exprs:
+                srctxt = mapper.get_source(expr)
+                if srctxt:
+                    expr_info.append((mapper.get_expr(srctxt),
+                                      mapper.get_expr(expr)))
+        elif exprs:
+            for name in exprs:
+                expr_info.extend(mapper.get_transfers('.'.join([compname, name])))
+        else:
+            expr_info = mapper.get_transfers(compname)
+
+        for srcexpr, destexpr in expr_info:
+            invalids.extend(srcexpr.invalid_refs())
 
         # if source exprs reference invalid vars, request an update
         if invalids:
@@ -790,7 +825,9 @@ class Assembly(Component):
             boundary even if all outputs were already invalid.
         """
         valids = self._valid_dict
-        conn_ins = set(self.list_inputs(connected=True))
+        conn_ins = self._conn_ins
+        if conn_ins is None:
+            conn_ins = self._conn_ins = set(self.list_inputs(connected=True))
 
         # If varnames is None, we're being called from a parent Assembly
         # as part of a higher level invalidation, so we only need to look
@@ -3,7 +3,7 @@ __all__ = ['AttrWrapper']
 
 import operator
 
-from openmdao.units import PhysicalQuantity
+from openmdao.units import PhysicalQuantity, convert_value
 
 class AttrWrapper(object):
     """A class that encapsulates a value and any metadata necessary
@@ -26,7 +26,17 @@ class UnitsAttrWrapper(AttrWrapper):
     """
     def __init__(self, value=None, **metadata):
         super(UnitsAttrWrapper, self).__init__(value, **metadata)
-        self.pq = PhysicalQuantity(value, metadata['units'])
+        self._pq = None
+
+    @property
+    def pq(self):
+        """The :class:`PhysicalQuantity` for this value, created on first
+        use since most wrappers are only used to pass units along with a
+        value during data transfer.
+        """
+        if self._pq is None:
+            self._pq = PhysicalQuantity(self.value, self.metadata['units'])
+        return self._pq
         
     def __add__(self, other):
         pq = self.pq + _get_PQ(other) 
@@ -74,6 +84,7 @@ class UnitsAttrWrapper(AttrWrapper):
 
     def convert_from(self, wrapper):
         if isinstance(wrapper, UnitsAttrWrapper):
-            return wrapper.pq.convert_value(self.pq.unit)
+            return convert_value(wrapper.value, wrapper.metadata['units'],
+                                 self.metadata['units'])
         raise ValueError("incompatible AttrWrapper objects")
         
\ No newline at end of file
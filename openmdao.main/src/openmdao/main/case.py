@@ -8,6 +8,7 @@ from inspect import getmro
 
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.exceptions import TracedError
+from openmdao.main.index import get_indexed_value
 from openmdao.main.variable import is_legal_name
 
 __all__ = ["Case"]
@@ -43,6 +44,34 @@ flatteners = { # dict of functions that know how to 'flatten' a given object ins
        array: _flatten_lst,
     } 
 
+class _SetCollector(object):
+    """Stands in for a scope while applying case inputs, collecting each
+    set() so they can all be sent to the real scope in one set_many() call.
+    """
+    def __init__(self, scope):
+        self.scope = scope
+        self.items = []
+
+    def get(self, path, index=None):
+        return self.scope.get(path, index)
+
+    def set(self, path, value, index=None, src=None, force=False):
+        self.items.append((path, value, index))
+
+class _GetCache(object):
+    """Stands in for a scope while updating case outputs, answering get()
+    from values previously fetched with a single get_many() call.
+    """
+    def __init__(self, scope, values):
+        self.scope = scope
+        self.values = values
+
+    def get(self, path, index=None):
+        obj = self.values.get(path, _Missing)
+        if obj is _Missing:
+            return self.scope.get(path, index)
+        return get_indexed_value(obj, '', index)
+
 def flatten_obj(name, obj):
     f = flatteners.get(type(obj))
     if f:
@@ -248,54 +277,65 @@ class Case(object):
         for key in self._outputs.keys():
             self._outputs[key] = _Missing
 
-    def apply_inputs(self, scope):
+    def apply_inputs(self, scope, extra=None):
         """Take the values of all of the inputs in this case and apply them
-        to the specified scope.
+        to the specified scope. All values are sent in a single set_many()
+        call, so a remote scope is updated in one round trip.
+
+        extra: list of (path, value, index) or None
+            Additional settings (events, for example) applied before the
+            inputs of this case, as part of the same call.
         """
         scope._case_id = self.uuid
-        if self._exprs:
-            for name,value in self._inputs.items():
-                expr = self._exprs.get(name)
-                if expr:
-                    expr.set(value, scope)
-                else:
-                    scope.set(name, value)
-        else:
-            for name,value in self._inputs.items():
-                scope.set(name, value)
+        collector = _SetCollector(scope)
+        if extra:
+            collector.items.extend(extra)
+        for name,value in self._inputs.items():
+            expr = self._exprs.get(name) if self._exprs else None
+            if expr:
+                expr.set(value, scope, proxy=collector)
+            else:
+                collector.set(name, value)
+        scope.set_many(collector.items)
 
     def update_outputs(self, scope, msg=None):
         """Update the value of all outputs in this Case, using the given scope.
+        The values needed are fetched with a single get_many() call. If
+        that fails, each output is retrieved separately so that errors are
+        reported for the offending outputs only.
         """
         self.msg = msg
         last_excpt = None
         if self._outputs is not None:
-            if self._exprs:
-                for name in self._outputs.keys():
-                    expr = self._exprs.get(name)
-                    try:
-                        if expr:
-                            self._outputs[name] = expr.evaluate(scope)
-                        else:
-                            self._outputs[name] = scope.get(name)
-                    except Exception as err:
-                        last_excpt = TracedError(err, traceback.format_exc())
-                        self._outputs[name] = _Missing
-                        if self.msg is None:
-                            self.msg = str(err)
-                        else:
-                            self.msg = self.msg + " %s" % err
-            else:
-                for name in self._outputs.keys():
-                    try:
-                        self._outputs[name] = scope.get(name)
-                    except Exception as err:
-                        last_excpt = TracedError(err, traceback.format_exc())
-                        self._outputs[name] = _Missing
-                        if self.msg is None:
-                            self.msg = str(err)
-                        else:
-                            self.msg = self.msg + " %s" % err
+            paths = set()
+            for name in self._outputs.keys():
+                expr = self._exprs.get(name) if self._exprs else None
+                if expr:
+                    paths.update(expr.get_referenced_varpaths(copy=False))
+                else:
+                    paths.add(name)
+            paths = list(paths)
+            try:
+                values = dict(zip(paths, scope.get_many(paths)))
+            except Exception:
+                values = {}
+            cache = _GetCache(scope, values)
+
+            for name in self._outputs.keys():
+                expr = self._exprs.get(name) if self._exprs else None
+                try:
+                    if expr:
+                        self._outputs[name] = expr.evaluate(scope,
+                                                            proxy=cache)
+                    else:
+                        self._outputs[name] = cache.get(name)
+                except Exception as err:
+                    last_excpt = TracedError(err, traceback.format_exc())
+                    self._outputs[name] = _Missing
+                    if self.msg is None:
+                        self.msg = str(err)
+                    else:
+                        self.msg = self.msg + " %s" % err
         if last_excpt:
             raise last_excpt
             
@@ -106,6 +106,61 @@ class DirectoryContext(object):
         self.component = weakref.ref(self.component)
 
 
+class _ValidDict(dict):
+    """A dict of variable names to validity flags that keeps a count of
+    its invalid entries, so checking whether anything is invalid doesn't
+    require scanning all of the flags.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(_ValidDict, self).__init__(*args, **kwargs)
+        self.num_invalid = len([v for v in self.itervalues() if not v])
+
+    def __reduce__(self):
+        return (_ValidDict, (dict(self),))
+
+    def __setitem__(self, name, valid):
+        old = self.get(name, True)
+        super(_ValidDict, self).__setitem__(name, valid)
+        if not old:
+            if valid:
+                self.num_invalid -= 1
+        elif not valid:
+            self.num_invalid += 1
+
+    def __delitem__(self, name):
+        valid = self[name]
+        super(_ValidDict, self).__delitem__(name)
+        if not valid:
+            self.num_invalid -= 1
+
+    def update(self, *args, **kwargs):
+        for name, valid in dict(*args, **kwargs).iteritems():
+            self[name] = valid
+
+    def setdefault(self, name, valid=None):
+        if name not in self:
+            self[name] = valid
+        return self[name]
+
+    def pop(self, name, *default):
+        if name in self:
+            valid = self[name]
+            del self[name]
+            return valid
+        return super(_ValidDict, self).pop(name, *default)
+
+    def popitem(self):
+        name, valid = super(_ValidDict, self).popitem()
+        if not valid:
+            self.num_invalid -= 1
+        return name, valid
+
+    def clear(self):
+        super(_ValidDict, self).clear()
+        self.num_invalid = 0
+
+
 _iodict = {'out': 'output', 'in': 'input'}
 
 __attributes__ = '__attributes__'
@@ -152,7 +207,7 @@ class Component(Container):
 
         # contains validity flag for each io Trait (inputs are valid since they're not connected yet,
         # and outputs are invalid)
-        self._valid_dict = dict([(name, t.iotype == 'in') \
+        self._valid_dict = _ValidDict([(name, t.iotype == 'in') \
             for name, t in self.class_traits().items() if t.iotype])
 
         # dependency graph between us and our boundaries (bookkeeps connections between our
@@ -170,6 +225,10 @@ class Component(Container):
         self._stop = False
         self._call_check_config = True
         self._call_execute = True
+        
+        # Set by a ParallelDataflow while it runs us. It's held during run()
+        # except while we execute().
+        self._execute_lock = None
 
         # cached configuration information
         self._input_names = None
@@ -261,11 +320,13 @@ class Component(Container):
         state['_expr_sources'] = None
         state['_connected_inputs'] = None
         state['_connected_outputs'] = None
+        state['_execute_lock'] = None
 
         return state
 
     def __setstate__(self, state):
         super(Component, self).__setstate__(state)
+        self._execute_lock = None
 
         # make sure all input callbacks are in place.  If callback is
         # already there, this will have no effect.
@@ -374,15 +435,16 @@ class Component(Container):
                 valids[name] = True
         else:
             valids = self._valid_dict
-            invalid_ins = [inp for inp in self.list_inputs(connected=True)
-                                    if valids.get(inp) is False]
-            if invalid_ins:
-                self._call_execute = True
-                self.parent.update_inputs(self.name, invalid_ins)
-                for name in invalid_ins:
-                    valids[name] = True
-            elif self._call_execute == False and len(self.list_outputs(valid=False)):
-                self._call_execute = True
+            if valids.num_invalid:  # skip the name lists if all are valid
+                invalid_ins = [inp for inp in self.list_inputs(connected=True)
+                                        if valids.get(inp) is False]
+                if invalid_ins:
+                    self._call_execute = True
+                    self.parent.update_inputs(self.name, invalid_ins)
+                    for name in invalid_ins:
+                        valids[name] = True
+                elif self._call_execute == False and len(self.list_outputs(valid=False)):
+                    self._call_execute = True
 
         if self._call_check_config:
             self.check_config()
@@ -444,11 +506,12 @@ class Component(Container):
         """
         # make our output Variables valid again
         valids = self._valid_dict
-        for name in self.list_outputs(valid=False):
-            valids[name] = True
-        ## make sure our inputs are valid too
-        for name in self.list_inputs(valid=False):
-            valids[name] = True
+        if valids.num_invalid:
+            for name in self.list_outputs(valid=False):
+                valids[name] = True
+            ## make sure our inputs are valid too
+            for name in self.list_inputs(valid=False):
+                valids[name] = True
         self._call_execute = False
         self._set_exec_state('VALID')
         self.publish_vars()
@@ -513,7 +576,17 @@ class Component(Container):
 
                         tracing.TRACER.debug(self.get_itername())
 
-                    self.execute()
+                    lock = self._execute_lock
+                    if lock is None:
+                        self.execute()
+                    else:
+                        # Only execute() may run concurrently with the
+                        # other Components sharing our parent.
+                        lock.release()
+                        try:
+                            self.execute()
+                        finally:
+                            lock.acquire()
 
                 self._post_execute()
             #else:
@@ -624,7 +697,7 @@ class Component(Container):
         """Return False if any of our variables is invalid."""
         if self._call_execute:
             return False
-        if False in self._valid_dict.values():
+        if self._valid_dict.num_invalid:
             self._call_execute = True
             return False
         if self.parent is not None:
@@ -671,8 +744,7 @@ class Component(Container):
             nset = set([k for k, v in self.items(iotype='in')])
             self._connected_inputs = self._depgraph.get_connected_inputs()
             nset.update(self._connected_inputs)
-            self._input_names = list(nset)
-        self._input_names = [name_ for name_ in self._input_names if "[" not in name_]
+            self._input_names = [name_ for name_ in nset if "[" not in name_]
 
         if valid is None:
             if connected is None:
@@ -683,6 +755,8 @@ class Component(Container):
                 return [n for n in self._input_names if n not in self._connected_inputs]
 
         valids = self._valid_dict
+        if valid is False and not valids.num_invalid:
+            return []
         ret = self._input_names
         ret = [n for n in ret if valids[n] == valid]
 
@@ -708,8 +782,7 @@ class Component(Container):
             nset = set([k for k, v in self.items(iotype='out')])
             self._connected_outputs = self._depgraph.get_connected_outputs()
             nset.update(self._connected_outputs)
-            self._output_names = list(nset)
-        self._output_names = [name_ for name_ in self._output_names if "[" not in name_]
+            self._output_names = [name_ for name_ in nset if "[" not in name_]
 
         if valid is None:
             if connected is None:
@@ -720,6 +793,8 @@ class Component(Container):
                 return [n for n in self._output_names if n not in self._connected_outputs]
 
         valids = self._valid_dict
+        if valid is False and not valids.num_invalid:
+            return []
         ret = self._output_names
         ret = [n for n in ret if valids[n] == valid]
 
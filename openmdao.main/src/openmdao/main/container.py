@@ -1090,6 +1090,32 @@ class Container(SafeHasTraits):
             else:
                 setattr(self, path, value)
 
+    @rbac(('owner', 'user'))
+    def set_many(self, items):
+        """Set the values of several Variables in one call. *items* is a
+        list of ``(path, value, index)`` tuples which are applied in order,
+        each as if by :meth:`set`. This allows a remote caller to update many
+        Variables with a single round trip.
+        """
+        for path, value, index in items:
+            self.set(path, value, index)
+
+    @rbac(('owner', 'user'))
+    def get_many(self, paths):
+        """Return a list of the values of the objects specified by *paths*.
+        Each entry is either a path or a ``(path, index)`` tuple, interpreted
+        as by :meth:`get`. This allows a remote caller to retrieve many
+        values with a single round trip. Note that values are always returned
+        by value, never as proxies.
+        """
+        values = []
+        for path in paths:
+            if isinstance(path, basestring):
+                values.append(self.get(path))
+            else:
+                values.append(self.get(*path))
+        return values
+
     def _index_set(self, name, value, index):
         obj = self.get_wrapped_attr(name, index[:-1])
         idx = index[-1]
@@ -1,12 +1,19 @@
 
+import multiprocessing
+import Queue
+import sys
+import threading
+
 import networkx as nx
 from networkx.algorithms.components import strongly_connected_components
 
 from openmdao.main.seqentialflow import SequentialWorkflow
 from openmdao.main.interfaces import IDriver
+from openmdao.main.exceptions import RunStopped
 from openmdao.main.mp_support import has_interface
+from openmdao.main.rbac import get_credentials, set_credentials
 
-__all__ = ['Dataflow']
+__all__ = ['Dataflow', 'ParallelDataflow']
 
 class Dataflow(SequentialWorkflow):
     """
@@ -160,3 +167,178 @@ class Dataflow(SequentialWorkflow):
                     max_index = max(index, max_index)
                 topsort.insert(max_index+1, cname)
 
+
+
+class ParallelDataflow(Dataflow):
+    """
+    A Dataflow that executes mutually independent Components concurrently.
+
+    The collapsed dependency graph is partitioned into levels such that no
+    Component in a level depends on any other Component in the same level.
+    The Components of each level are run on a pool of worker threads, and
+    all of them must complete before the next level is started.
+
+    Since the worker threads share a single process, this is most useful
+    for Components that spend their time waiting on something else, such as
+    an :class:`ExternalCode` running a local command or executing on a
+    server obtained from the :class:`ResourceAllocationManager`.
+    Only the Components' :meth:`execute` runs concurrently; fetching their
+    inputs and updating the validity of the Assembly's variables is done
+    one Component at a time. Components having a `directory` are run
+    alone, since changing directory affects the whole process. Each
+    Component is placed in the level after the last of those it depends on,
+    and a Component that appears in the workflow more than once is placed
+    after its previous appearance.
+    """
+
+    def __init__(self, parent=None, scope=None, members=None,
+                 max_workers=None):
+        """ Create an empty flow.
+
+        max_workers: int (optional)
+            Maximum number of Components to run concurrently. The default
+            is the number of CPUs on this host.
+        """
+        self._levels = None
+        if max_workers is None:
+            max_workers = multiprocessing.cpu_count()
+        self.max_workers = max_workers
+        super(ParallelDataflow, self).__init__(parent, scope, members)
+
+    def __iter__(self):
+        """Iterate through the nodes level by level, which is also a valid
+        dataflow order."""
+        scope = self.scope
+        return [getattr(scope, n) for level in self._get_levels()
+                                  for n in level].__iter__()
+
+    def config_changed(self):
+        """Notifies the Workflow that its configuration (dependencies, etc.)
+        has changed.
+        """
+        super(ParallelDataflow, self).config_changed()
+        self._levels = None
+
+    def run(self, ffd_order=0, case_id=''):
+        """ Run the Components in this Workflow, a level at a time. """
+        self._stop = False
+        self._iterator = None
+        self._exec_count += 1
+        self._comp_count = 0
+        iterbase = self._iterbase(case_id)
+        scope = self.scope
+        for level in self._get_levels():
+            # resolve all of the components in the level up front so
+            # if there's a problem it'll fail before any of them are run
+            comps = [getattr(scope, n) for n in level]
+            for comp in comps:
+                self._comp_count += 1
+                comp.set_itername('%s-%d' % (iterbase, self._comp_count))
+            if len(comps) == 1 or self.max_workers <= 1:
+                for comp in comps:
+                    comp.run(ffd_order=ffd_order, case_id=case_id)
+                    if self._stop:
+                        raise RunStopped('Stop requested')
+            else:
+                self._run_level(comps, ffd_order, case_id)
+            if self._stop:
+                raise RunStopped('Stop requested')
+
+    def _run_level(self, comps, ffd_order, case_id):
+        """ Run the Components of a single level concurrently, except for
+        those with a directory, which run alone in their turn. """
+        batch = []
+        for comp in comps + [None]:
+            if comp is not None and not comp.directory:
+                batch.append(comp)
+                continue
+            
+            if len(batch) > 1:
+                self._run_batch(batch, ffd_order, case_id)
+            elif batch and not self._stop:
+                batch[0].run(ffd_order=ffd_order, case_id=case_id)
+            batch = []
+            
+            if comp is not None and not self._stop:
+                comp.run(ffd_order=ffd_order, case_id=case_id)
+
+    def _run_batch(self, comps, ffd_order, case_id):
+        """ Run Components on a pool of worker threads. """
+        # Need credentials in case we're using a PublicKey server.
+        credentials = get_credentials()
+        request_q = Queue.Queue()
+        for comp in comps:
+            request_q.put(comp)
+        errors = {}
+        
+        # Everything but execute() updates our scope's state (inputs,
+        # validity, caches), so only execute() is run concurrently.
+        lock = threading.Lock()
+
+        n_workers = min(self.max_workers, len(comps))
+        workers = []
+        for i in range(n_workers):
+            worker = threading.Thread(target=self._service_loop,
+                                      args=(request_q, lock, credentials,
+                                            errors, ffd_order, case_id))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+        for worker in workers:
+            worker.join()
+
+        # Report the first failure in workflow order.
+        for comp in comps:
+            if comp.name in errors:
+                exc_info = errors[comp.name]
+                raise exc_info[0], exc_info[1], exc_info[2]
+
+    def _service_loop(self, request_q, lock, credentials, errors,
+                      ffd_order, case_id):
+        """ Each worker thread executes this until the level is done. """
+        set_credentials(credentials)
+        while not self._stop:
+            try:
+                comp = request_q.get_nowait()
+            except Queue.Empty:
+                break
+            with lock:
+                comp._execute_lock = lock
+                try:
+                    comp.run(ffd_order=ffd_order, case_id=case_id)
+                except Exception:
+                    errors[comp.name] = sys.exc_info()
+                    self._stop = True
+                finally:
+                    comp._execute_lock = None
+
+    def _get_levels(self):
+        """Return a list of levels, each a list of Component names that
+        don't depend on one another. Levels are in dataflow order.
+        """
+        if self._levels is None:
+            topsort = self._get_topsort()
+            graph = self._get_collapsed_graph()
+            levels = []
+            level_of = {}
+            for cname in topsort:
+                lev = 0
+                for pred in graph.predecessors(cname):
+                    if pred in level_of:
+                        lev = max(lev, level_of[pred]+1)
+                # A component appearing more than once can't run concurrently
+                # with itself.
+                if cname in level_of:
+                    lev = max(lev, level_of[cname]+1)
+                level_of[cname] = lev
+                while lev >= len(levels):
+                    levels.append([])
+                levels[lev].append(cname)
+            # Components in a level are started in workflow order.
+            position = {}
+            for i, cname in enumerate(self._names):
+                position.setdefault(cname, i)
+            for level in levels:
+                level.sort(key=position.get)
+            self._levels = levels
+        return self._levels
@@ -8,7 +8,7 @@ __all__ = ["Array"]
 import logging
 
 # pylint: disable-msg=E0611,F0401
-from openmdao.units import PhysicalQuantity
+from openmdao.units import PhysicalQuantity, convert_value
 
 from openmdao.main.attrwrapper import AttrWrapper, UnitsAttrWrapper
 from openmdao.main.index import get_indexed_value
@@ -174,24 +174,20 @@ class Array(TraitArray):
         # pylint: disable-msg=E1101
         dst_units = self.units
 
+        if not isinstance(value, ndarray):
+            value = array(value)
+
         try:
-            pq = PhysicalQuantity(1.0, src_units)
-        except NameError:
-            raise NameError("while setting value of %s: undefined unit '%s'" %
-                            (src_units, name))
-        
-        try:
-            pq.convert_to_unit(dst_units)
+            value = convert_value(value, src_units, dst_units)
         except NameError:
-            raise NameError("undefined unit '%s' for variable '%s'" %
-                            (dst_units, name))
+            raise NameError("undefined unit in conversion of '%s' to '%s' "
+                            "for variable '%s'" % (src_units, dst_units, name))
         except TypeError:
             msg = "%s: units '%s' are incompatible " % (name, src_units) + \
                    "with assigning units of '%s'" % (dst_units)
             raise TypeError(msg)
         
         try:
-            value *= pq.value
             return super(Array, self).validate(obj, name, value)
         except Exception:
             self.error(obj, name, value)
@@ -87,6 +87,8 @@ class DependencyGraph(object):
         self._graph = nx.DiGraph()
         self._graph.add_nodes_from(_fakes)
         self._allsrcs = {}
+        # invalidation plans keyed on starting node, see _invalidation_plan
+        self._inv_plans = {}
         
     def __contains__(self, compname):
         """Return True if this graph contains the given component."""
@@ -115,6 +117,7 @@ class DependencyGraph(object):
     def add(self, name):
         """Add the name of a Component to the graph."""
         self._graph.add_node(name)
+        self._inv_plans = {}
 
     def remove(self, name):
         """Remove the name of a Component from the graph. It is not
@@ -122,6 +125,49 @@ class DependencyGraph(object):
         """
         self.disconnect(name)
         self._graph.remove_node(name)
+        self._inv_plans = {}
+
+    def _invalidation_plan(self, cname):
+        """Return the list of nodes downstream of `cname`, in topological
+        order, as tuples of the form (node, preds), where preds is a list of
+        (index, link, alldests) tuples for each incoming link from `cname`
+        (index 0) or another node in the plan (index i+1).  alldests is the
+        list of all destinations of the link, used when every output of
+        the source is invalidated. Plans are cached until the graph changes.
+        """
+        try:
+            return self._inv_plans[cname]
+        except KeyError:
+            pass
+
+        graph = self._graph
+        reached = set([cname])
+        stack = [cname]
+        while stack:
+            node = stack.pop()
+            if node == '@bout':  # invalidation never goes past @bout
+                continue
+            for succ in graph.successors(node):
+                if succ not in reached:
+                    reached.add(succ)
+                    stack.append(succ)
+
+        order = [n for n in nx.topological_sort(graph.subgraph(reached))
+                   if n != cname]
+        index = dict([(n, i+1) for i, n in enumerate(order)])
+        index[cname] = 0
+
+        plan = []
+        for node in order:
+            preds = []
+            for u, v, data in graph.in_edges(node, data=True):
+                if u in index and u != '@bout':
+                    link = data['link']
+                    preds.append((index[u], link, link.get_dests()))
+            plan.append((node, preds))
+
+        self._inv_plans[cname] = plan
+        return plan
                                     
     def invalidate_deps(self, scope, cnames, varsets, force=False):
         """Walk through all dependent nodes in the graph, invalidating all
@@ -141,26 +187,29 @@ class DependencyGraph(object):
             the dependency chain was already invalid.
         """
 
-        stack = zip(cnames, varsets)
         outset = set()  # set of changed boundary outputs
-        while(stack):
-            src, varset = stack.pop()
-            for dest, link in self.out_links(src):
-                #if varset is None:
-                #    srcvars = set(link._srcs.keys())
-                #else:
-                #    srcvars = varset
-                if dest == '@bout':
-                    bouts = link.get_dests(varset)
-                    outset.update(bouts)
-                    scope.set_valid(bouts, False)
+        for cname, varset in zip(cnames, varsets):
+            # newly invalidated outputs of each node in the plan, where None
+            # means all of them
+            invalid = [varset]
+            for dest, preds in self._invalidation_plan(cname):
+                dests = []
+                for i, link, alldests in preds:
+                    outs = invalid[i]
+                    if outs is None:
+                        dests.extend(alldests)
+                    elif outs:
+                        dests.extend(link.get_dests(outs))
+                if not dests:
+                    invalid.append([])
+                elif dest == '@bout':
+                    outset.update(dests)
+                    scope.set_valid(dests, False)
+                    invalid.append([])
                 else:
-                    dests = link.get_dests(varset)
-                    if dests:
-                        comp = getattr(scope, dest)
-                        outs = comp.invalidate_deps(varnames=dests, force=force)
-                        if (outs is None) or outs:
-                            stack.append((dest, outs))
+                    comp = getattr(scope, dest)
+                    invalid.append(comp.invalidate_deps(varnames=dests,
+                                                        force=force))
         return outset
 
     def list_connections(self, show_passthrough=True):
@@ -344,6 +393,7 @@ class DependencyGraph(object):
                                       '.'.join([destcompname, destvarname])))
                     
         self._allsrcs[destpath] = srcpath
+        self._inv_plans = {}
         
     def _comp_connections(self, cname):
         """Returns a list of tuples of the form (srcpath, destpath) for all
@@ -441,6 +491,7 @@ class DependencyGraph(object):
         dpdot = destpath+'.'
         for d in [k for k in self._allsrcs if k.startswith(dpdot)]:
             del self._allsrcs[d]
+        self._inv_plans = {}
 
     def dump(self, stream=sys.stdout):
         """Prints out a simple sorted text representation of the graph."""
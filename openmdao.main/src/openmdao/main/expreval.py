@@ -8,13 +8,16 @@ import math
 import ast
 import copy
 import re
+import imp
 import __builtin__
 
 from openmdao.main.printexpr import _get_attr_node, _get_long_name, transform_expression, ExprPrinter
 from openmdao.util.nameutil import partition_names_by_comp
 from openmdao.main.index import INDEX, ATTR, CALL, SLICE
+from openmdao.util.lazyimport import lazy_import
 
-from openmdao.main.sym import SymGrad, SymbolicDerivativeError
+# sym imports sympy, which is slow and only needed for gradients.
+sym = lazy_import('openmdao.main.sym')
 
 def _import_functs(mod, dct, names=None):
     if names is None:
@@ -40,16 +43,68 @@ else:
     _expr_dict['numpy'] = numpy
     #_import_functs(numpy, _expr_dict, names=[])
     
-# if scipy is available, add some functions
+# if scipy is available, add some functions. scipy is only imported if one
+# of them is actually called.
+def _scipy_special(name):
+    def funct(*args, **kwargs):
+        import scipy.special
+        _expr_dict[name] = getattr(scipy.special, name)
+        return _expr_dict[name](*args, **kwargs)
+    funct.__name__ = name
+    return funct
+
 try:
-    import scipy.special
+    imp.find_module('scipy')
 except ImportError:
     pass
 else:
-    _import_functs(scipy.special, _expr_dict, names=['gamma', 'polygamma'])
+    for _name in ('gamma', 'polygamma'):
+        _expr_dict[_name] = _scipy_special(_name)
 
 _Missing = object()
 
+class _RefTransformer(ast.NodeTransformer):
+    """Replaces references to variables in an expression AST with entries
+    of a local sequence named '_vals_', so that the expression can be 
+    compiled once and evaluated for any set of variable values.
+    """
+    def __init__(self, mapping):
+        self.mapping = mapping
+        super(_RefTransformer, self).__init__()
+        
+    def _ref_node(self, node, name):
+        idx = self.mapping.get(name)
+        if idx is None:
+            return None
+        return ast.copy_location(ast.Subscript(value=ast.Name(id='_vals_', 
+                                                              ctx=ast.Load()),
+                                               slice=ast.Index(value=ast.Num(n=idx)),
+                                               ctx=ast.Load()), node)
+        
+    def visit_Name(self, node):
+        newnode = self._ref_node(node, node.id)
+        return node if newnode is None else newnode
+    
+    def visit_Attribute(self, node):
+        long_name = _get_long_name(node)
+        newnode = None if long_name is None else self._ref_node(node, long_name)
+        return self.generic_visit(node) if newnode is None else newnode
+    
+    def visit_Subscript(self, node):
+        p = ExprPrinter()
+        p.visit(node)
+        newnode = self._ref_node(node, p.get_text())
+        return self.generic_visit(node) if newnode is None else newnode
+
+def _compile_with_refs(text, refs):
+    """Return a code object for the expression text where each reference
+    in refs is replaced by the corresponding entry of '_vals_'.
+    """
+    mapping = dict([(name, i) for i, name in enumerate(refs)])
+    new_ast = _RefTransformer(mapping).visit(ast.parse(text, mode='eval'))
+    ast.fix_missing_locations(new_ast)
+    return compile(new_ast, '<string>', 'eval')
+
 class ExprTransformer(ast.NodeTransformer):
     """Transforms dotted name references, e.g., abc.d.g in an expression AST
     into scope.get('abc.d.g') and turns assignments into the appropriate
@@ -390,6 +445,7 @@ class ExprEvaluator(object):
     def text(self, value):
         self._code = self._assignment_code = None
         self._examiner = self.cached_grad_eq = None
+        self._grad_code = None
         self._text = value
 
     @property
@@ -407,6 +463,7 @@ class ExprEvaluator(object):
         if value is not self.scope:
             self._code = self._assignment_code = None
             self._examiner = self.cached_grad_eq = None
+            self._grad_code = None
             if value is not None:
                 self._scope = weakref.ref(value)
             else:
@@ -439,6 +496,7 @@ class ExprEvaluator(object):
         # remove weakref to scope because it won't pickle
         state['_scope'] = self.scope
         state['_code'] = None  # <type 'code'> won't pickle either.
+        state['_grad_code'] = None
         if state.get('_assignment_code'):
             state['_assignment_code'] = None # more unpicklable <type 'code'>
         return state
@@ -446,6 +504,7 @@ class ExprEvaluator(object):
     def __setstate__(self, state):
         """Restore this component's state."""
         self.__dict__.update(state)
+        self.cached_grad_eq = self._grad_code = None
         if self._scope is not None:
             self._scope = weakref.ref(self._scope)
 
@@ -514,15 +573,22 @@ class ExprEvaluator(object):
             return scope
         return self.scope
 
-    def evaluate(self, scope=None):
+    def evaluate(self, scope=None, proxy=None):
         """Return the value of the scoped string, evaluated 
         using the eval() function.
+
+        proxy: object (optional)
+            If given, it answers the get() calls of the expression in place
+            of the scope. Names are still resolved using the scope, so the
+            expression isn't re-parsed for each proxy.
         """
         global _expr_dict
         scope = self._get_updated_scope(scope)
         try:
             if self._code is None:
                 self._parse()
+            if proxy is not None:
+                scope = proxy
             return eval(self._code, _expr_dict, locals())
         except Exception, err:
             raise type(err)("can't evaluate expression "+
@@ -543,8 +609,10 @@ class ExprEvaluator(object):
     
     def evaluate_gradient(self, stepsize=1.0e-6, wrt=None, scope=None):
         """Return a dict containing the gradient of the expression with respect to 
-        each of the referenced varpaths. The gradient is calculated by 1st order central
-        difference for now. 
+        each of the referenced varpaths. The gradient is calculated
+        symbolically if possible, otherwise by 1st order central difference.
+        Gradient expressions are compiled the first time they're needed and
+        reused until the text or scope of this expression changes.
         
         stepsize: float
             Step size for finite difference.
@@ -565,6 +633,11 @@ class ExprEvaluator(object):
         gradient = {}
         if self.cached_grad_eq is None:
             self.cached_grad_eq = {}
+            self._grad_code = {}
+            self._grad_inputs = None
+            
+        # values of all inputs, fetched once for the whole gradient
+        _vals_ = None
 
         for var in wrt:
 
@@ -581,71 +654,66 @@ class ExprEvaluator(object):
                 gradient[var] = 0.0
                 continue
             
+            if _vals_ is None:
+                _vals_ = self._get_input_values(scope, inputs)
+            
             # First time, try to differentiate symbolically
             if (var not in self.cached_grad_eq) or self._code is None:
                 
                 #Take symbolic gradient of all inputs using sympy
                 try:
-                    for varname, expression in zip(inputs, SymGrad(self.text, inputs)):
+                    for varname, expression in zip(inputs, sym.SymGrad(self.text, inputs)):
                         self.cached_grad_eq[varname] = expression
 
-                except SymbolicDerivativeError, NameError:
+                except sym.SymbolicDerivativeError, NameError:
                     self.cached_grad_eq[var] = False
 
             # If we have a cached gradient expression:
             if self.cached_grad_eq[var]:
                 
-                # This is not the way I wanted to do it, but I didn't want
-                # to mess with everything that's is in self._parse
-                grad_text = self.cached_grad_eq[var]
-                for name in inputs:
-                    if '[' in name:
-                        new_expr = ExprEvaluator(name, scope)
-                        replace_val = new_expr.evaluate()
-                    else:
-                        replace_val = scope.get(name)
-                    grad_text = grad_text.replace(name, str(replace_val))
-                
-                grad_root = ast.parse(grad_text, mode='eval')
-                grad_code = compile(grad_root, '<string>', 'eval')
+                grad_code = self._grad_code.get(var)
+                if grad_code is None:
+                    grad_code = _compile_with_refs(self.cached_grad_eq[var],
+                                                   inputs)
+                    self._grad_code[var] = grad_code
                 gradient[var] = eval(grad_code, _expr_dict, locals())
                 
             # Otherwise resort to finite difference (1st order central)
             else:
-                # Always need to assemble list of constant inputs, for
-                # replacement in the gradient expression text
-                var_dict = {}
-                grad_text = self.text
-                for name in inputs:
-                    if '[' in name:
-                        new_expr = ExprEvaluator(name, scope)
-                        replace_val = new_expr.evaluate()
-                    else:
-                        replace_val = scope.get(name)
-                        
-                    if name==var:
-                        var_dict[name] = replace_val
-                        new_name = "var_dict['%s']" % name
-                        grad_text = grad_text.replace(name, new_name)
-                    else:
-                        # If we don't need derivative of a var, replace with its value
-                        grad_text = grad_text.replace(name, str(replace_val))
-
-                grad_root = ast.parse(grad_text, mode='eval')
-                grad_code = compile(grad_root, '<string>', 'eval')
+                fd_code = self._grad_code.get(None)
+                if fd_code is None:
+                    fd_code = _compile_with_refs(self.text, inputs)
+                    self._grad_code[None] = fd_code
+                    
+                i = inputs.index(var)
+                base = _vals_
+                _vals_ = list(base)
 
                 # Finite difference (Central difference)
-                var_dict[var] += 0.5*stepsize
-                yp = eval(grad_code, _expr_dict, locals())
-                var_dict[var] -= stepsize
-                ym = eval(grad_code, _expr_dict, locals())
+                _vals_[i] = base[i] + 0.5*stepsize
+                yp = eval(fd_code, _expr_dict, locals())
+                _vals_[i] = base[i] - 0.5*stepsize
+                ym = eval(fd_code, _expr_dict, locals())
+                _vals_ = base
                     
                 gradient[var] = (yp-ym)/stepsize
                 
         return gradient
     
-    def set(self, val, scope=None, src=None):
-        """Set the value of the referenced object to the specified value."""
+    def _get_input_values(self, scope, inputs):
+        """Return a list containing the current values of inputs, which
+        must be the list of our refs."""
+        if self._grad_inputs is None:
+            self._grad_inputs = ExprEvaluator('(%s,)' % ','.join(inputs))
+        return list(self._grad_inputs.evaluate(scope))
+    
+    def set(self, val, scope=None, src=None, proxy=None):
+        """Set the value of the referenced object to the specified value.
+
+        proxy: object (optional)
+            If given, it receives the set() call of the expression in place
+            of the scope, as for :meth:`evaluate`.
+        """
         global _expr_dict
         scope = self._get_updated_scope(scope)
 
@@ -660,6 +728,8 @@ class ExprEvaluator(object):
             _local_src_ = src
             if self._assignment_code is None:
                 _, self._assignment_code = self._parse_set()
+            if proxy is not None:
+                scope = proxy
             exec(self._assignment_code, _expr_dict, locals())
         else:
             raise ValueError("expression '%s' can't be set to a value" % self.text)
@@ -8,6 +8,7 @@ import operator
 import ordereddict
 
 from openmdao.main.expreval import ExprEvaluator
+from openmdao.main.numpy_fallback import zeros
 
 _ops = {
     '>': operator.gt,
@@ -84,6 +85,64 @@ class Constraint(object):
         return (self.lhs,self.comparator,self.rhs,self.scaler,self.adder) == \
                (other.lhs,other.comparator,other.rhs,other.scaler,other.adder)
 
+class _ConstraintVector(object):
+    """ Evaluates a sequence of constraints with a single compiled expression
+    that returns the value of each constraint, with the scaler applied, in 
+    the form where a value greater than zero means the constraint is 
+    violated, i.e., lhs-rhs for '<' and '=', and rhs-lhs for '>'. The adder
+    cancels out of the difference so it isn't applied.
+    """
+    
+    def __init__(self, constraints, scope, version):
+        self.constraints = tuple(constraints)
+        self.version = version
+        terms = []
+        for cnst in self.constraints:
+            if '>' in cnst.comparator:
+                term = '(%s)-(%s)' % (cnst.rhs.text, cnst.lhs.text)
+            else:
+                term = '(%s)-(%s)' % (cnst.lhs.text, cnst.rhs.text)
+            if cnst.scaler != 1.0:
+                term = '(%s)*%r' % (term, cnst.scaler)
+            terms.append(term)
+        if terms:
+            self.expr = ExprEvaluator('(%s,)' % ','.join(terms), scope=scope)
+        else:
+            self.expr = None
+        
+    def is_valid(self, version, scope):
+        """Returns True if this object can evaluate the constraints having
+        the given version."""
+        return self.version == version and \
+               (self.expr is None or self.expr.scope is scope)
+        
+    def evaluate(self, out=None):
+        """Returns an array of constraint values. If `out` is given, the 
+        values are written into it.
+        """
+        if out is None:
+            out = zeros(len(self.constraints), 'd')
+        if self.expr is not None:
+            try:
+                out[:] = self.expr.evaluate()
+            except Exception:
+                # Evaluate separately to find the culprit.
+                for cnst in self.constraints:
+                    cnst.evaluate(self.expr.scope)
+                raise
+        return out
+
+def _eval_vector(owner, version, get_constraints, out, scope):
+    """Evaluates constraints using the _ConstraintVector cached in `owner`,
+    creating a new one from the result of `get_constraints` if `version`,
+    which changes whenever the constraints do, doesn't match.
+    """
+    vector = getattr(owner, '_vector', None)
+    if vector is None or not vector.is_valid(version, scope):
+        vector = owner._vector = _ConstraintVector(get_constraints(), scope,
+                                                   version)
+    return vector.evaluate(out)
+
 def _parse_constraint(expr_string):
     """ Parses the constraint expression string and returns the lhs string, 
     the rhs string, and comparator
@@ -118,7 +177,14 @@ class _HasConstraintsBase(object):
     def __init__(self, parent, allowed_types=None):
         self._parent = parent
         self._constraints = ordereddict.OrderedDict()
+        self._version = 0  # incremented whenever _constraints changes
+        self._vector = None
     
+    def _changed(self):
+        """Called whenever our constraints change."""
+        self._version += 1
+        self._parent._invalidate()
+
     def remove_constraint(self, key):
         """Removes the constraint with the given string."""
         try:
@@ -126,7 +192,7 @@ class _HasConstraintsBase(object):
         except KeyError:
             msg = "Constraint '%s' was not found. Remove failed." % key
             self._parent.raise_exception(msg, AttributeError)
-        self._parent._invalidate()
+        self._changed()
 
     def get_references(self, name):
         """Return references to component `name` in preparation for subsequent
@@ -161,6 +227,7 @@ class _HasConstraintsBase(object):
         # Not exactly safe here...
         if isinstance(refs, ordereddict.OrderedDict):
             self._constraints = refs
+            self._version += 1
         else:
             raise TypeError('refs should be ordereddict.OrderedDict, got %r' 
                             % refs)
@@ -168,7 +235,7 @@ class _HasConstraintsBase(object):
     def clear_constraints(self):
         """Removes all constraints."""
         self._constraints = ordereddict.OrderedDict()
-        self._parent._invalidate()
+        self._changed()
         
     def list_constraints(self):
         """Return a list of strings containing constraint expressions."""
@@ -220,6 +287,7 @@ class _HasConstraintsBase(object):
         """
         old_cnst = self._constraints
         self._constraints = ordereddict.OrderedDict()
+        self._version += 1
 
         try:
             for name, cnst in target.copy_constraints().items():
@@ -307,7 +375,7 @@ class HasEqConstraints(_HasConstraintsBase):
         else:
             self._constraints[name] = constraint
             
-        self._parent._invalidate()
+        self._changed()
             
             
     def add_existing_constraint(self, cnst, name=None):
@@ -326,7 +394,7 @@ class HasEqConstraints(_HasConstraintsBase):
             self._parent.raise_exception("Inequality constraint '%s' is not supported on this driver" %
                                          str(cnst), ValueError)
             
-        self._parent._invalidate()
+        self._changed()
 
     def get_eq_constraints(self):
         """Returns an ordered dict of constraint objects."""
@@ -338,6 +406,20 @@ class HasEqConstraints(_HasConstraintsBase):
         """
         return [c.evaluate(_get_scope(self,scope)) for c in self._constraints.values()]
     
+    def eval_eq_constraint_vector(self, out=None, scope=None):
+        """Returns an array containing the value of each equality
+        constraint, in the form lhs-rhs multiplied by the scaler. The 
+        expressions for all of the constraints are compiled together, so
+        this is much faster than :meth:`eval_eq_constraints` when there are
+        many constraints.
+        
+        out: array (optional)
+            Array of length equal to the number of constraints. If given,
+            the values are written into it and it is returned.
+        """
+        return _eval_vector(self, self._version, self._constraints.values,
+                            out, _get_scope(self, scope))
+    
     def allows_constraint_types(self, types):
         """Returns True if types is ['eq']."""
         return types == ['eq']
@@ -407,7 +489,7 @@ class HasIneqConstraints(_HasConstraintsBase):
         else:
             self._constraints[name] = constraint
             
-        self._parent._invalidate()
+        self._changed()
             
         
     def add_existing_constraint(self, cnst, name=None):
@@ -426,7 +508,7 @@ class HasIneqConstraints(_HasConstraintsBase):
             self._parent.raise_exception("Equality constraint '%s' is not supported on this driver" % 
                                          str(cnst), ValueError)
 
-        self._parent._invalidate()
+        self._changed()
 
     def get_ineq_constraints(self):
         """Returns an ordered dict of inequality constraint objects."""
@@ -436,6 +518,22 @@ class HasIneqConstraints(_HasConstraintsBase):
         """Returns a list of constraint values"""
         return [c.evaluate(_get_scope(self,scope)) for c in self._constraints.values()]
     
+    def eval_ineq_constraint_vector(self, out=None, scope=None):
+        """Returns an array containing the value of each inequality
+        constraint, with the scaler applied, in the form where a positive
+        value means that the constraint is violated, i.e., lhs-rhs for '<'
+        and rhs-lhs for '>'. This matches the sign of the constraint 
+        gradients calculated by the differentiators. The expressions for all
+        of the constraints are compiled together, so this is much faster 
+        than :meth:`eval_ineq_constraints` when there are many constraints.
+        
+        out: array (optional)
+            Array of length equal to the number of constraints. If given,
+            the values are written into it and it is returned.
+        """
+        return _eval_vector(self, self._version, self._constraints.values,
+                            out, _get_scope(self, scope))
+    
     def allows_constraint_types(self, typ):
         """Returns True if types is ['ineq']."""
         return types == ['eq']
@@ -453,6 +551,7 @@ class HasConstraints(object):
         self._parent = parent
         self._eq = HasEqConstraints(parent)
         self._ineq = HasIneqConstraints(parent)
+        self._vector = None
 
     def _item_count(self):
         """This is used by the replace function to determine if a delegate from the
@@ -610,6 +709,36 @@ class HasConstraints(object):
         """
         return self._ineq.eval_ineq_constraints(scope)
     
+    def eval_eq_constraint_vector(self, out=None, scope=None):
+        """Returns an array containing the values of the equality
+        constraints. See :meth:`HasEqConstraints.eval_eq_constraint_vector`.
+        """
+        return self._eq.eval_eq_constraint_vector(out, scope)
+    
+    def eval_ineq_constraint_vector(self, out=None, scope=None):
+        """Returns an array containing the values of the inequality
+        constraints. See 
+        :meth:`HasIneqConstraints.eval_ineq_constraint_vector`.
+        """
+        return self._ineq.eval_ineq_constraint_vector(out, scope)
+    
+    def eval_constraint_vector(self, out=None, scope=None):
+        """Returns an array containing the values of the equality
+        constraints followed by the values of the inequality constraints,
+        in the same order as ``get_eq_constraints().keys() + 
+        get_ineq_constraints().keys()``. A positive value means that an
+        inequality constraint is violated.
+        
+        out: array (optional)
+            Array of length equal to the number of constraints. If given,
+            the values are written into it and it is returned.
+        """
+        eq, ineq = self._eq, self._ineq
+        return _eval_vector(self, (eq._version, ineq._version),
+                            lambda: eq._constraints.values() +
+                                    ineq._constraints.values(),
+                            out, _get_scope(eq, scope))
+    
     def list_constraints(self):
         """Return a list of strings containing constraint expressions."""
         lst = self._ineq.list_constraints()
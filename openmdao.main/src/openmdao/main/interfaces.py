@@ -546,6 +546,19 @@ class ISurrogate(Interface):
             which corresponds to the training case input history given by X.
         """
     
+class IIncrementalSurrogate(ISurrogate):
+    
+    def add_points(X, Y):
+        """Adds training data to a surrogate model that has already been
+        trained, without training it again from scratch.
+
+        X: iterator of lists
+            Values representing the new training case inputs.
+        Y: iterator
+            Training case outputs for this surrogate's output,
+            which correspond to the training case inputs given by X.
+        """
+    
 class IHasParameters(Interface):
     
     def add_parameter(param_name, low=None, high=None):
@@ -60,9 +60,9 @@ if sys.platform == 'win32':  #pragma no cover
 from enthought.traits.trait_handlers import TraitDictObject
 
 from openmdao.main.interfaces import obj_has_interface
-from openmdao.main.mp_util import decrypt, encrypt, is_legal_connection, \
-                                  keytype, make_typeid, public_methods, \
-                                  SPECIALS
+from openmdao.main.mp_util import is_legal_connection, keytype, \
+                                  make_typeid, public_methods, \
+                                  send_message, recv_message, SPECIALS
 from openmdao.main.rbac import AccessController, RoleError, check_role, \
                                need_proxy, Credentials, \
                                get_credentials, set_credentials
@@ -356,8 +356,6 @@ class OpenMDAO_Server(Server):
         """
         self._logger.log(LOG_DEBUG2, 'starting server thread to service %r, %s',
                          threading.current_thread().name, keytype(self._authkey))
-        recv = conn.recv
-        send = conn.send
         id_to_obj = self.id_to_obj
         id_to_controller = self._id_to_controller
 
@@ -372,9 +370,10 @@ class OpenMDAO_Server(Server):
             try:
                 ident = methodname = args = kwds = credentials = None
                 obj = exposed = gettypeid = None
-                data = recv()
                 try:
-                    request = decrypt(data, session_key)
+                    request = recv_message(conn, session_key)
+                except EOFError:
+                    raise
                 except Exception as exc:
                     trace = traceback.format_exc()
                     msg = "Can't decrypt/unpack request. This could be the" \
@@ -493,9 +492,10 @@ class OpenMDAO_Server(Server):
 
             try:
                 try:
-                    send(encrypt(msg, session_key))
+                    send_message(conn, msg, session_key)
                 except Exception:
-                    send(encrypt(('#UNSERIALIZABLE', repr(msg)), session_key))
+                    send_message(conn, ('#UNSERIALIZABLE', repr(msg)),
+                                 session_key)
             # Just being defensive, this should never happen.
             except Exception as exc: #pragma no cover
                 self._logger.error('exception in thread serving %r',
@@ -515,8 +515,8 @@ class OpenMDAO_Server(Server):
             raise
 
         client_version = client_data[0]
-        if client_version != 1:  #pragma no cover
-            msg = 'Expected client protocol version 1, got %r' % client_version
+        if client_version != 2:  #pragma no cover
+            msg = 'Expected client protocol version 2, got %r' % client_version
             self._logger.error(msg)
             raise RuntimeError(msg)
 
@@ -533,7 +533,7 @@ class OpenMDAO_Server(Server):
             self._logger.error("Can't recreate client key: %r", exc)
             raise
 
-        server_version = 1
+        server_version = 2
         try:
             session_key = hashlib.sha1(str(id(conn))).hexdigest()
             data = client_key.encrypt(session_key, '')
@@ -1230,15 +1230,15 @@ class OpenMDAO_Proxy(BaseProxy):
                 new_args.append(arg)
 
         try:
-            conn.send(encrypt((self._id, methodname, new_args, kwds,
-                               get_credentials().encode()), session_key))
+            send_message(conn, (self._id, methodname, new_args, kwds,
+                                get_credentials().encode()), session_key)
         except IOError as exc:
             msg = "Can't send to server at %r for %r: %r" \
                   % (self._token.address, methodname, exc)
             logging.error(msg)
             raise RuntimeError(msg)
 
-        kind, result = decrypt(conn.recv(), session_key)
+        kind, result = recv_message(conn, session_key)
 
         if kind == '#RETURN':
             return result
@@ -1283,14 +1283,14 @@ class OpenMDAO_Proxy(BaseProxy):
 
         server_key = self._pubkey
         encrypted = pk_encrypt(text, server_key)
-        client_version = 1
+        client_version = 2
         conn.send((client_version, server_key.n, server_key.e, encrypted))
 
         server_data = conn.recv()
         server_version = server_data[0]
         # Just being defensive, this should never happen.
-        if server_version != 1:  #pragma no cover
-            msg = 'Expecting server protocol version 1, got %r' % server_version
+        if server_version != 2:  #pragma no cover
+            msg = 'Expecting server protocol version 2, got %r' % server_version
             logging.error(msg)
             if server_version == '#TRACEBACK':
                 try:
@@ -5,6 +5,7 @@ Multiprocessing support utilities.
 import atexit
 import ConfigParser
 import cPickle
+import cStringIO
 import errno
 import getpass
 import inspect
@@ -12,11 +13,17 @@ import logging
 import os.path
 import re
 import socket
+import struct
 import sys
 import time
 
 from Crypto.Cipher import AES
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from multiprocessing import current_process, connection
 from multiprocessing.managers import BaseProxy
 
@@ -254,6 +261,140 @@ def decrypt(msg, session_key):
         return msg
 
 
+# Arrays at least this large are sent as raw buffers outside of the pickle.
+_OOB_MIN_SIZE = 1 << 16
+
+# Raw buffers are sent in chunks of this size (a multiple of AES.block_size).
+_CHUNK_SIZE = 1 << 22
+
+
+def _session_cipher(session_key):
+    """ Return a new cipher for one message, or None if no `session_key`. """
+    if not session_key:
+        return None
+    # Just being defensive, this should never happen.
+    if len(session_key) < 16:  #pragma no cover
+        session_key += '!'*16
+    session_key = session_key[:16]
+    return AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
+
+
+def _pad(text):
+    """ Pad `text` to a multiple of ``AES.block_size``. """
+    pad = len(text) % AES.block_size
+    if pad:
+        text += '-'*(AES.block_size - pad)
+    return text
+
+
+def send_message(conn, obj, session_key):
+    """
+    Send `obj` over `conn`, encrypted if `session_key` is specified.
+
+    conn: :class:`multiprocessing.Connection`
+        Connection to send on.
+
+    obj: object
+        Object to be sent.
+
+    session_key: string
+        Key used for encryption. Should be at least 16 bytes long.
+
+    Large :mod:`numpy` arrays anywhere within `obj` (including those within
+    objects such as a :class:`DomainObj`) are not pickled. Instead they are
+    sent after the pickled header as raw buffers, in chunks. The sender does
+    not copy them, except for one chunk at a time when encrypting. `obj` is
+    pickled completely before anything is sent, so a pickling error leaves
+    `conn` usable.
+    """
+    buffers = []
+    buffer_ids = {}
+
+    def persistent_id(item):
+        if type(item) is numpy.ndarray and item.nbytes >= _OOB_MIN_SIZE \
+           and not item.dtype.hasobject and item.dtype.fields is None:
+            index = buffer_ids.get(id(item))
+            if index is None:
+                index = len(buffers)
+                buffer_ids[id(item)] = index
+                buffers.append(item)
+            return index
+        return None
+
+    out = cStringIO.StringIO()
+    pickler = cPickle.Pickler(out, cPickle.HIGHEST_PROTOCOL)
+    if numpy is not None:
+        pickler.inst_persistent_id = persistent_id
+    pickler.dump(obj)
+
+    descriptors = []
+    for i, array in enumerate(buffers):
+        fortran = array.flags.f_contiguous and not array.flags.c_contiguous
+        descriptors.append((array.dtype.str, array.shape, fortran))
+        if not (array.flags.c_contiguous or array.flags.f_contiguous):
+            buffers[i] = numpy.ascontiguousarray(array)
+    header = cPickle.dumps(descriptors, cPickle.HIGHEST_PROTOCOL) \
+           + out.getvalue()
+
+    cipher = _session_cipher(session_key)
+    if cipher is None:
+        conn.send_bytes(header)
+    else:
+        conn.send_bytes(struct.pack('!Q', len(header)) + \
+                        cipher.encrypt(_pad(header)))
+
+    for array in buffers:
+        data = buffer(array.ravel(order='A'))
+        for start in range(0, len(data), _CHUNK_SIZE):
+            size = min(_CHUNK_SIZE, len(data) - start)
+            if cipher is None:
+                conn.send_bytes(data, start, size)
+            else:
+                conn.send_bytes(cipher.encrypt(_pad(data[start:start+size])))
+
+
+def recv_message(conn, session_key):
+    """
+    Receive an object sent by :meth:`send_message` over `conn`.
+
+    conn: :class:`multiprocessing.Connection`
+        Connection to receive from.
+
+    session_key: string
+        Key used for encryption. Should be at least 16 bytes long.
+
+    Raw array buffers are received directly into the memory of the
+    reconstructed arrays.
+    """
+    cipher = _session_cipher(session_key)
+    header = conn.recv_bytes()
+    if cipher is not None:
+        length = struct.unpack('!Q', header[:8])[0]
+        header = cipher.decrypt(header[8:])[:length]
+
+    inp = cStringIO.StringIO(header)
+    descriptors = cPickle.Unpickler(inp).load()
+
+    arrays = []
+    for dtype, shape, fortran in descriptors:
+        array = numpy.empty(shape, dtype, order='F' if fortran else 'C')
+        data = array.ravel(order='A').view(numpy.uint8)
+        nbytes = array.nbytes
+        for start in range(0, nbytes, _CHUNK_SIZE):
+            if cipher is None:
+                conn.recv_bytes_into(data, start)
+            else:
+                size = min(_CHUNK_SIZE, nbytes - start)
+                text = cipher.decrypt(conn.recv_bytes())
+                data[start:start+size] = numpy.frombuffer(text, numpy.uint8,
+                                                          size)
+        arrays.append(array)
+
+    unpickler = cPickle.Unpickler(inp)
+    unpickler.persistent_load = arrays.__getitem__
+    return unpickler.load()
+
+
 def public_methods(obj):
     """
     Returns a list of names of the methods of `obj` to be exposed.
@@ -114,6 +114,10 @@ class ResourceAllocationManager(object):
         self._allocations = 0
         self._allocators = []
         self._deployed_servers = {}
+        # Idle servers kept for reuse, oldest first.
+        self._pool = []
+        self._pool_size = 0
+        self._pool_timeout = 60.
         self._allocators.append(LocalAllocator('LocalHost',
                                                authkey='PublicKey',
                                                allow_shell=True))
@@ -302,9 +306,45 @@ class ResourceAllocationManager(object):
         """
         ResourceAllocationManager.validate_resources(resource_desc)
         ram = ResourceAllocationManager._get_instance()
+        if ram._pool_size > 0:
+            pooled = ram._allocate_pooled(resource_desc)
+            if pooled is not None:
+                return pooled
         with ResourceAllocationManager._lock:
             return ram._allocate(resource_desc)
 
+    def _allocate_pooled(self, resource_desc):
+        """ Return ``(server, server_info)`` from the pool, or None. """
+        user = get_credentials().user
+        while True:
+            with ResourceAllocationManager._lock:
+                expired = self._trim_pool()
+                for i, entry in enumerate(self._pool):
+                    if entry[4] == user and entry[3] == resource_desc:
+                        del self._pool[i]
+                        break
+                else:
+                    entry = None
+            self._shutdown(expired)
+            if entry is None:
+                return None
+
+            allocator, server, server_info, desc = entry[:4]
+            try:
+                server.echo()
+            except Exception as exc:
+                self._logger.warning('pooled %r failed health check: %r',
+                                     server_info['name'], exc)
+                self._shutdown([entry])
+            else:
+                self._logger.info('reusing %r pid %d on %s',
+                                  server_info['name'], server_info['pid'],
+                                  server_info['host'])
+                with ResourceAllocationManager._lock:
+                    self._deployed_servers[id(server)] = \
+                        (allocator, server, server_info, desc, user)
+                return (server, server_info)
+
     def _allocate(self, resource_desc):
         """ Do the allocation. """
         deployment_retries = 0
@@ -327,8 +367,13 @@ class ResourceAllocationManager(object):
                     self._logger.info('allocated %r pid %d on %s',
                                       name, server_info['pid'],
                                       server_info['host'])
+                    if self._pool_size > 0:
+                        user = get_credentials().user
+                    else:
+                        user = None
                     self._deployed_servers[id(server)] = \
-                        (best_allocator, server, server_info)
+                        (best_allocator, server, server_info,
+                         dict(resource_desc), user)
                     return (server, server_info)
                 # Difficult to generate deployable request that won't deploy...
                 else:  #pragma no cover
@@ -423,21 +468,75 @@ class ResourceAllocationManager(object):
         """ Release a server (proxy). """
         with ResourceAllocationManager._lock:
             try:
-                allocator, server, server_info = self._deployed_servers[id(server)]
+                allocator, server, server_info, resource_desc, user = \
+                    self._deployed_servers[id(server)]
             # Just being defensive.
             except KeyError:  #pragma no cover
                 self._logger.error('server %r not found', server)
                 return
             del self._deployed_servers[id(server)]
 
-        self._logger.info('release %r pid %d on %s', server_info['name'],
-                          server_info['pid'], server_info['host'])
-        try:
-            allocator.release(server)
-        # Just being defensive.
-        except Exception as exc:  #pragma no cover
-            self._logger.error("Can't release %r: %r", server_info['name'], exc)
-        server._close.cancel()
+            if self._pool_size > 0:
+                self._logger.info('pooling %r pid %d on %s',
+                                  server_info['name'], server_info['pid'],
+                                  server_info['host'])
+                self._pool.append((allocator, server, server_info,
+                                   resource_desc, user, time.time()))
+                expired = self._trim_pool()
+            else:
+                expired = [(allocator, server, server_info)]
+        self._shutdown(expired)
+
+    def _trim_pool(self):
+        """
+        Remove servers that have been idle too long or exceed the pool size
+        from the pool and return them. Must be called with the lock held.
+        """
+        expired = []
+        limit = time.time() - self._pool_timeout
+        while self._pool and \
+              (len(self._pool) > self._pool_size or self._pool[0][5] < limit):
+            expired.append(self._pool.pop(0))
+        return expired
+
+    def _shutdown(self, entries):
+        """ Release the servers in `entries` via their allocators. """
+        for entry in entries:
+            allocator, server, server_info = entry[:3]
+            self._logger.info('release %r pid %d on %s', server_info['name'],
+                              server_info['pid'], server_info['host'])
+            try:
+                allocator.release(server)
+            # Just being defensive.
+            except Exception as exc:  #pragma no cover
+                self._logger.error("Can't release %r: %r",
+                                   server_info['name'], exc)
+            server._close.cancel()
+
+    @staticmethod
+    def configure_pool(max_size, idle_timeout=60.):
+        """
+        Configure the pool of idle servers. When `max_size` is greater than
+        zero, released servers are kept running rather than shut down, and
+        are reused by later allocations with the same resource description
+        and credentials. This avoids the cost of starting a new server
+        each time. A pooled server is checked to be responsive before it is
+        reused. Pooling is disabled by default; setting `max_size` to zero
+        releases any pooled servers.
+
+        max_size: int
+            Maximum number of idle servers to keep.
+
+        idle_timeout: float
+            Pooled servers which have been idle for more than this many
+            seconds are released the next time the pool is accessed.
+        """
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            ram._pool_size = max_size
+            ram._pool_timeout = idle_timeout
+            expired = ram._trim_pool()
+        ram._shutdown(expired)
 
     @staticmethod
     def add_remotes(server, prefix=''):
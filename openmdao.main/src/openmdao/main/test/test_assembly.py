@@ -526,7 +526,20 @@ class AssemblyTestCase(unittest.TestCase):
         self.asm.disconnect('comp2.r')
         self.asm.connect('3.0*comp1.rout', 'comp2.r')
         self.asm.disconnect('3.0*comp1.rout', 'comp2.r')
-        
+
+    def test_transfers(self):
+        mapper = self.asm._exprmapper
+        self.assertEqual(mapper.get_transfers('comp2'), [])
+        self.asm.connect('2.0*comp1.rout', 'comp2.r')
+        transfers = mapper.get_transfers('comp2')
+        self.assertEqual([(s.text, d.text) for s, d in transfers],
+                         [('2.0*comp1.rout', 'comp2.r')])
+        self.assertTrue(mapper.get_transfers('comp2') is transfers)
+        self.asm.run()
+        self.assertEqual(self.asm.comp2.r, 3.0)
+        self.asm.disconnect('comp2.r')
+        self.assertEqual(mapper.get_transfers('comp2'), [])
+
     def test_input_passthrough_to_2_inputs(self):
         asm = set_as_top(Assembly())
         asm.add('nested', Assembly())
@@ -615,6 +628,11 @@ class AssemblyTestCase(unittest.TestCase):
         self.assertEqual(asm.ModulesInstallPath, 'C:/work/IMOO2/imoo/modules')
         self.assertEqual(asm.propulsion.ModulesInstallPath, 'C:/work/IMOO2/imoo/modules')
 
+    def test_directory_init(self):
+        # Setting the directory invalidates during construction.
+        asm = Assembly(directory=os.getcwd())
+        self.assertEqual(asm.directory, os.getcwd())
+
     def test_wrapper(self):
         # Test that wrapping via passthroughs to proxy traits works.
         top = set_as_top(Wrapper())
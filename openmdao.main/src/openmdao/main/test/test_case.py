@@ -127,6 +127,43 @@ class CaseTestCase(unittest.TestCase):
             self.assertTrue(name in both)
             self.assertEqual(val, both[name])
         
+    def test_batched_io(self):
+        case = Case(inputs=[('comp1.a_lst[1]', 10), ('comp1.b', 1)],
+                    outputs=['comp2.c_lst[1]+comp2.d', 'comp1.c'])
+        case.apply_inputs(self.top, extra=[('comp1.a', 3, None)])
+        self.assertEqual(self.top.comp1.a_lst, [4, 10, 6])
+        self.assertEqual(self.top.comp1.a, 3)
+        self.assertEqual(self.top.comp1.b, 1)
+        self.top.run()
+        case.update_outputs(self.top)
+        self.assertEqual(case['comp2.c_lst[1]+comp2.d'], 42)
+        self.assertEqual(case['comp1.c'], 4)
+        self.assertEqual(case.msg, None)
+        copy.deepcopy(case)  # No dangling references to temporary scopes.
+
+        # The expressions are only parsed the first time.
+        in_expr = case._exprs['comp1.a_lst[1]']
+        out_expr = case._exprs['comp2.c_lst[1]+comp2.d']
+        codes = (in_expr._assignment_code, out_expr._code)
+        case.apply_inputs(self.top)
+        self.top.run()
+        case.update_outputs(self.top)
+        self.assertEqual(case['comp2.c_lst[1]+comp2.d'], 42)
+        self.assertTrue(in_expr._assignment_code is codes[0])
+        self.assertTrue(out_expr._code is codes[1])
+
+        # A bad output doesn't prevent retrieving the others.
+        case.add_output('comp1.z')
+        try:
+            case.update_outputs(self.top)
+        except Exception as err:
+            msg = "comp1 (1-1): 'Simple' object has no attribute 'z'"
+            self.assertEqual(str(err), msg)
+            self.assertEqual(case.msg, msg)
+        else:
+            self.fail('Exception expected')
+        self.assertEqual(case['comp1.c'], 4)
+
     def test_flatten(self):
         dvt = DumbVT()
         inputs = [('comp1.a_lst', [1,2,3,[7,8,9]]),
@@ -69,6 +69,33 @@ class TestCase(unittest.TestCase):
         newvalids = comp.get_valid(['x','xout'])
         self.assertEqual(newvalids, [True, True])
 
+    def test_num_invalid(self):
+        comp = self.comp
+        valids = comp._valid_dict
+
+        def invalid():
+            names = sorted([name for name, valid in valids.items()
+                                                  if not valid])
+            self.assertEqual(valids.num_invalid, len(names))
+            return names
+
+        # xout plus framework outputs such as exec_count and itername.
+        outputs = sorted(comp.list_outputs())
+        self.assertTrue('xout' in outputs)
+        self.assertEqual(invalid(), outputs)
+        self.assertEqual(sorted(comp.list_outputs(valid=False)), outputs)
+        comp.run()
+        self.assertEqual(invalid(), [])
+        self.assertEqual(comp.list_outputs(valid=False), [])
+        self.assertTrue(comp.is_valid())
+        comp.x = 3.
+        self.assertEqual(invalid(), outputs)
+        self.assertFalse(comp.is_valid())
+        comp.connect('parent.blah', 'cont.dyntrait')
+        self.assertEqual(invalid(), sorted(outputs+['cont.dyntrait']))
+        comp.disconnect('parent.blah', 'cont.dyntrait')
+        self.assertEqual(invalid(), outputs)
+
     def test_connect(self):
         comp = self.comp
         
@@ -471,6 +471,24 @@ class ContainerTestCase(unittest.TestCase):
         assert_raises(self, "c.set('out', 666)", globals(), locals(),
                       RuntimeError, ": Cannot set output 'out'")
 
+    def test_set_get_many(self):
+        c = Container()
+        c.add_trait('inp', Float(iotype='in'))
+        c.add_trait('lst', List([1, 2, 3], iotype='in'))
+        c.add('sub', self.root)
+        c.set_many([('inp', 42., None), ('lst', [4, 5, 6], None),
+                    ('sub.c2.c22.c221.number', 1.5, None)])
+        self.assertEqual(c.inp, 42.)
+        self.assertEqual(c.lst, [4, 5, 6])
+        self.assertEqual(self.root.c2.c22.c221.number, 1.5)
+        self.assertEqual(c.get_many(['inp', ('lst', [2]),
+                                     'sub.c2.c22.c221.number']),
+                         [42., 6, 1.5])
+        self.assertEqual(c.get_many([]), [])
+        assert_raises(self, "c.get_many(['inp', 'bogus'])", globals(), locals(),
+                      AttributeError,
+                      ": 'Container' object has no attribute 'bogus'")
+
     def test_get_attributes(self):
         c = Container()
         c.add_trait('inp', Float(desc='Stuff', low=-200, high=200))
@@ -8,6 +8,28 @@ class DumbClass(object):
     def contains(self, name):
         return hasattr(self, name)
 
+class InvalComp(object):
+    """Records invalidated inputs; all outputs are invalidated once."""
+    def __init__(self):
+        self.invalid_ins = set()
+        self.valid_outs = True
+        
+    def invalidate_deps(self, varnames=None, force=False):
+        self.invalid_ins.update(varnames)
+        if self.valid_outs or force:
+            self.valid_outs = False
+            return None
+        return []
+
+class InvalScope(object):
+    def __init__(self, names):
+        self.invalid = set()
+        for name in names:
+            setattr(self, name, InvalComp())
+            
+    def set_valid(self, names, valid):
+        self.invalid.update(names)
+
 _fakes = ['@xin', '@bin', '@bout', '@xout']
 nodes = ['A', 'B', 'C', 'D']
 
@@ -244,6 +266,29 @@ class DepGraphTestCase(unittest.TestCase):
         dep.disconnect('3.4*B.d+2.3')
         self.assertEqual(dep.list_connections(), [])
         
+    def test_invalidate_deps(self):
+        scope = InvalScope(nodes)
+        outs = self.dep.invalidate_deps(scope, ['A'], [['c']])
+        self.assertEqual(outs, set(['c']))
+        self.assertEqual(scope.A.invalid_ins, set())
+        self.assertEqual(scope.B.invalid_ins, set(['b']))
+        self.assertEqual(scope.C.invalid_ins, set())
+        self.assertEqual(scope.D.invalid_ins, set(['a']))
+        self.assertEqual(scope.invalid, set(['c']))
+        
+        # outputs of B and D are already invalid, so nothing propagates
+        outs = self.dep.invalidate_deps(scope, ['@bin'], [['a']])
+        self.assertEqual(outs, set())
+        self.assertEqual(scope.B.invalid_ins, set(['a', 'b']))
+        
+        # cached plan must be rebuilt when connections change
+        scope = InvalScope(nodes)
+        self.dep.connect('C.d', 'B.d')
+        outs = self.dep.invalidate_deps(scope, ['C'], [None])
+        self.assertEqual(outs, set(['c', 'C.d']))
+        self.assertEqual(scope.B.invalid_ins, set(['d']))
+        self.assertEqual(scope.D.invalid_ins, set(['a', 'b']))
+        
     def test_dump(self):
         s = StringIO.StringIO()
         self.dep.dump(s)
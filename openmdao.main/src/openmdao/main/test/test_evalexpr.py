@@ -490,6 +490,13 @@ class ExprEvalTestCase(unittest.TestCase):
         grad = exp.evaluate_gradient(scope=top, wrt=['comp2.b'])
         self.assertEqual(len(grad), 1)
         
+        # compiled gradient must pick up new values at full precision
+        top.comp1.c = 1.0/3.0
+        grad = exp.evaluate_gradient(scope=top)
+        assert_rel_error(self, grad['comp1.c'], 2.0*top.comp2.b/3.0, 1e-14)
+        assert_rel_error(self, grad['comp2.b'], 1.0/9.0, 1e-14)
+        top.comp1.c = 7.0
+        
         exp = ExprEvaluator('pow(comp2.b,2)', top.driver)
         grad = exp.evaluate_gradient(scope=top)
         assert_rel_error(self, grad['comp2.b'], 10.0, 0.00001)
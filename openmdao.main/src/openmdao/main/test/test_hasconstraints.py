@@ -2,6 +2,8 @@
 
 import unittest
 
+from numpy import zeros
+
 from openmdao.main.api import Assembly, Driver, set_as_top
 from openmdao.util.decorators import add_delegate
 from openmdao.main.hasconstraints import HasConstraints, HasEqConstraints, HasIneqConstraints, Constraint
@@ -288,6 +290,38 @@ class HasConstraintsTestCase(unittest.TestCase):
     def test_eval_ineq_constraint(self):
         self._check_ineq_eval_constraints(MyInEqDriver())
 
+    def test_eval_constraint_vector(self):
+        drv = self.asm.add('driver', MyDriver())
+        self.asm.comp1.a = 3000
+        self.asm.comp1.b = 5000
+        drv.add_constraint('comp1.a < comp1.b', scaler=1.0/1000.0, adder=-4000.0)
+        drv.add_constraint('comp1.a > 2*comp1.b')
+        drv.add_constraint('comp1.a = comp1.b')
+
+        self.assertEqual(list(drv.eval_ineq_constraint_vector()), [-2.0, 7000.])
+        self.assertEqual(list(drv.eval_eq_constraint_vector()), [-2000.])
+        self.assertEqual(list(drv.eval_constraint_vector()), [-2000., -2.0, 7000.])
+
+        out = zeros(3)
+        self.asm.comp1.b = 1000
+        self.assertTrue(drv.eval_constraint_vector(out=out) is out)
+        self.assertEqual(list(out), [2000., 2.0, -1000.])
+
+        drv.remove_constraint('comp1.a > 2*comp1.b')
+        self.assertEqual(list(drv.eval_constraint_vector()), [2000., 2.0])
+
+        # The compiled constraints are reused until the constraints change.
+        vector = drv._hasconstraints._vector
+        drv.eval_constraint_vector()
+        self.assertTrue(drv._hasconstraints._vector is vector)
+        drv.clear_constraints()
+        drv.add_constraint('comp1.b < comp1.a')
+        drv.add_constraint('comp1.a = 2*comp1.b')
+        self.assertEqual(list(drv.eval_constraint_vector()), [1000., -2000.])
+
+        drv = self.asm.add('driver', MyInEqDriver())
+        self.assertEqual(len(drv.eval_ineq_constraint_vector()), 0)
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -6,11 +6,17 @@ import logging
 import os.path
 import socket
 import sys
+import threading
 import unittest
 import nose
 
+from multiprocessing import Pipe
+
+import numpy
+
 from openmdao.main.mp_util import read_server_config, read_allowed_hosts, \
-                                  is_legal_connection
+                                  is_legal_connection, send_message, \
+                                  recv_message
 
 from openmdao.util.publickey import make_private, HAVE_PYWIN32
 from openmdao.util.testutil import assert_raises
@@ -125,6 +131,52 @@ class TestCase(unittest.TestCase):
             finally:
                 os.remove('hosts.allow')
 
+    def test_messages(self):
+        logging.debug('')
+        logging.debug('test_messages')
+
+        big = numpy.arange(300000.)
+        fortran = numpy.asfortranarray(numpy.arange(20000.).reshape((200, 100)))
+        strided = big[::3]
+        obj = {'big': big, 'again': big, 'fortran': fortran,
+               'strided': strided, 'small': numpy.arange(5),
+               'records': numpy.zeros(9000, dtype=[('a', int), ('b', float)]),
+               'other': ['stuff', 42]}
+
+        reader, writer = Pipe(duplex=False)
+
+        def transfer(obj, session_key):
+            # The pipe can't hold a big message, so receive it in a thread.
+            results = []
+            receiver = threading.Thread(target=lambda:
+                           results.append(recv_message(reader, session_key)))
+            receiver.daemon = True
+            receiver.start()
+            try:
+                send_message(writer, obj, session_key)
+            finally:
+                receiver.join(60)
+            self.assertEqual(len(results), 1)
+            return results[0]
+
+        for session_key in ('', 'sixteen-byte-key-and-more'):
+            result = transfer(obj, session_key)
+            self.assertEqual(sorted(result.keys()), sorted(obj.keys()))
+            for key in ('big', 'fortran', 'strided', 'small', 'records'):
+                self.assertEqual(result[key].dtype, obj[key].dtype)
+                self.assertEqual(result[key].shape, obj[key].shape)
+                self.assertTrue((result[key] == obj[key]).all())
+            self.assertTrue(result['again'] is result['big'])
+            self.assertTrue(result['fortran'].flags.f_contiguous)
+            self.assertEqual(result['other'], ['stuff', 42])
+
+        # Unpicklable objects are detected before anything is sent.
+        code = compile('3 + 4', '<string>', 'eval')
+        self.assertRaises(Exception, send_message, writer, [big, code], '')
+        self.assertFalse(reader.poll())
+        send_message(writer, 'hello', '')
+        self.assertEqual(recv_message(reader, ''), 'hello')
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=openmdao.main')
@@ -14,6 +14,7 @@ import shutil
 import socket
 import sys
 import tempfile
+import time
 import unittest
 
 from openmdao.main.api import Assembly, Component
@@ -35,6 +36,54 @@ class ExtCode(Component):
                      desc='Resources required to run this component.')
 
 
+class _Closer(object):
+    """ Stands in for the finalizer of a server proxy. """
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _FakeServer(object):
+    """ Just enough of a server proxy to be pooled. """
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.host = 'fake'
+        self.healthy = True
+        self._close = _Closer()
+
+    def echo(self, *args):
+        if not self.healthy:
+            raise RuntimeError('dead')
+        return args
+
+
+class FakeAllocator(ResourceAllocator):
+    """ Deploys :class:`_FakeServer` instances. """
+
+    def __init__(self, name='Fake'):
+        super(FakeAllocator, self).__init__(name)
+        self.deployed = []
+        self.released = []
+
+    def max_servers(self, resource_desc):
+        return 10
+
+    def time_estimate(self, resource_desc):
+        return (0, {})
+
+    def deploy(self, name, resource_desc, criteria):
+        server = _FakeServer(len(self.deployed))
+        self.deployed.append(server)
+        return server
+
+    def release(self, server):
+        self.released.append(server)
+
+
 class TestCase(unittest.TestCase):
     """ Test resource allocation. """
 
@@ -556,6 +605,59 @@ max_load: 100
         assert_raises(self, "allocator.release(None)",
                       globals(), locals(), NotImplementedError, 'release')
 
+    def test_pool(self):
+        logging.debug('')
+        logging.debug('test_pool')
+
+        allocator = FakeAllocator()
+        RAM.insert_allocator(0, allocator)
+        desc = dict(python_version=sys.version[:3])
+
+        # Pooling is off by default.
+        server, info = RAM.allocate(desc)
+        RAM.release(server)
+        self.assertEqual(allocator.released, [server])
+        self.assertTrue(server._close.cancelled)
+
+        RAM.configure_pool(2, idle_timeout=60.)
+        server1, info1 = RAM.allocate(desc)
+        server2, info2 = RAM.allocate(desc)
+        RAM.release(server1)
+        RAM.release(server2)
+        self.assertEqual(len(allocator.released), 1)
+        self.assertFalse(server1._close.cancelled)
+
+        # Reuse the oldest matching server, not for a different request.
+        server, info = RAM.allocate(desc)
+        self.assertTrue(server is server1)
+        self.assertTrue(info is info1)
+        server3, info3 = RAM.allocate(dict(desc, min_cpus=1))
+        self.assertEqual(len(allocator.deployed), 4)
+
+        # Extra servers beyond the pool size are released.
+        RAM.release(server3)
+        RAM.release(server1)
+        self.assertEqual(allocator.released[1:], [server2])
+
+        # Unresponsive servers are released rather than reused.
+        server3.healthy = False
+        server, info = RAM.allocate(dict(desc, min_cpus=1))
+        self.assertFalse(server is server3)
+        self.assertEqual(allocator.released[2:], [server3])
+        RAM.release(server)
+
+        # Idle servers are released once they time out.
+        time.sleep(0.01)
+        RAM.configure_pool(2, idle_timeout=0.)
+        self.assertEqual(allocator.released[3:], [server1, server])
+
+        # Releasing with pooling off.
+        RAM.configure_pool(0)
+        server, info = RAM.allocate(desc)
+        self.assertEqual(len(allocator.deployed), 6)
+        RAM.release(server)
+        self.assertEqual(allocator.released[-1], server)
+
     def test_request(self):
         logging.debug('')
         logging.debug('test_request')
@@ -2,11 +2,14 @@
 Test run/step/stop aspects of a simple workflow.
 """
 
+import threading
+import time
 import unittest
 
-from openmdao.main.api import Assembly, Component, set_as_top, Driver
+from openmdao.main.api import Assembly, Component, set_as_top, Driver, \
+                              ParallelDataflow
 from openmdao.main.exceptions import RunStopped
-from openmdao.lib.datatypes.api import Int, Bool
+from openmdao.lib.datatypes.api import Int, Bool, Float
 
 # pylint: disable-msg=E1101,E1103
 # "Instance of <class> has no <attr> member"
@@ -224,6 +227,117 @@ class TestCase(unittest.TestCase):
             self.fail('Expected AttributeError')
 
 
+class SleepComponent(Component):
+    """ Component which sleeps and tracks how many run concurrently. """
+
+    x1 = Float(0., iotype='in')
+    x2 = Float(0., iotype='in')
+    fail = Bool(False, iotype='in')
+    y = Float(0., iotype='out')
+
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def execute(self):
+        with self.lock:
+            SleepComponent.running += 1
+            SleepComponent.max_running = max(SleepComponent.max_running,
+                                             SleepComponent.running)
+        try:
+            time.sleep(0.2)
+            if self.fail:
+                self.raise_exception('failed', RuntimeError)
+            self.y = self.x1 + self.x2 + 1.
+        finally:
+            with self.lock:
+                SleepComponent.running -= 1
+
+
+class Diamond(Assembly):
+    """ comp_a feeds comp_b and comp_c, which both feed comp_d. """
+
+    def configure(self):
+        self.driver.workflow = ParallelDataflow(self.driver, max_workers=4)
+        for name in ('comp_a', 'comp_b', 'comp_c', 'comp_d'):
+            self.add(name, SleepComponent())
+        self.driver.workflow.add(['comp_a', 'comp_b', 'comp_c', 'comp_d'])
+
+        self.connect('comp_a.y', 'comp_b.x1')
+        self.connect('comp_a.y', 'comp_c.x1')
+        self.connect('comp_b.y', 'comp_d.x1')
+        self.connect('comp_c.y', 'comp_d.x2')
+
+
+class ParallelTestCase(unittest.TestCase):
+    """ Test concurrent execution of independent branches. """
+
+    def setUp(self):
+        SleepComponent.max_running = 0
+        self.model = set_as_top(Diamond())
+
+    def test_levels(self):
+        levels = self.model.driver.workflow._get_levels()
+        self.assertEqual([sorted(level) for level in levels],
+                         [['comp_a'], ['comp_b', 'comp_c'], ['comp_d']])
+
+    def test_order(self):
+        # An unconnected component doesn't run ahead of those before it.
+        self.model.add('comp_e', SleepComponent())
+        workflow = self.model.driver.workflow
+        workflow.add('comp_e')
+        levels = workflow._get_levels()
+        self.assertEqual([sorted(level) for level in levels],
+                         [['comp_a'], ['comp_b', 'comp_c'], ['comp_d'],
+                          ['comp_e']])
+        self.assertEqual([comp.name for comp in workflow],
+                         [name for level in levels for name in level])
+
+    def test_independent_chains(self):
+        # A chain listed after another one runs alongside it.
+        for name in ('comp_x', 'comp_y'):
+            self.model.add(name, SleepComponent())
+        workflow = self.model.driver.workflow
+        workflow.add(['comp_x', 'comp_y'])
+        self.model.connect('comp_x.y', 'comp_y.x1')
+        # Levels are in workflow order.
+        self.assertEqual(workflow._get_levels(),
+                         [['comp_a', 'comp_x'], ['comp_b', 'comp_c', 'comp_y'],
+                          ['comp_d']])
+        self.model.run()
+        self.assertEqual(self.model.comp_y.y, 2.)
+        self.assertEqual(SleepComponent.max_running, 3)
+
+    def test_run(self):
+        self.model.run()
+        self.assertEqual(self.model.comp_a.y, 1.)
+        self.assertEqual(self.model.comp_b.y, 2.)
+        self.assertEqual(self.model.comp_c.y, 2.)
+        self.assertEqual(self.model.comp_d.y, 5.)
+        self.assertEqual(SleepComponent.max_running, 2)
+
+        self.model.comp_a.x1 = 1.
+        self.model.run()
+        self.assertEqual(self.model.comp_d.y, 7.)
+
+    def test_serial(self):
+        self.model.driver.workflow.max_workers = 1
+        self.model.run()
+        self.assertEqual(self.model.comp_d.y, 5.)
+        self.assertEqual(SleepComponent.max_running, 1)
+
+    def test_error(self):
+        self.model.comp_c.fail = True
+        try:
+            self.model.run()
+        except RuntimeError as err:
+            self.assertEqual(str(err), 'comp_c (1-3): failed')
+        else:
+            self.fail('Expected RuntimeError')
+        self.assertEqual(self.model.comp_b.y, 2.)
+        self.assertEqual(self.model.comp_d.y, 0.)
+
+
 if __name__ == '__main__':
     import nose
     import sys
@@ -803,5 +803,25 @@ class test__moduleFunctions(unittest.TestCase):
         else:
             self.fail("Expecting Key Error")            
 
+    def test_convert_value(self):
+        self.assertAlmostEqual(units.convert_value(3.0, 'ft', 'inch'), 36.0)
+        self.assertAlmostEqual(units.convert_value(212.0, 'degF', 'degC'),
+                               100.0)
+        self.assertEqual(units.get_conversion_tuple('cm', 'm'), (0.01, 0))
+        self.assertTrue(units.get_conversion_tuple('cm', 'm') is
+                        units.get_conversion_tuple('cm', 'm'))
+        self.assertRaises(TypeError, units.convert_value, 1.0, 'm', 'kg')
+
+        try:
+            import numpy
+        except ImportError:
+            pass
+        else:
+            arr = numpy.array([32.0, 212.0])
+            result = units.convert_value(arr, 'degF', 'degC')
+            self.assertAlmostEqual(result[0], 0.0)
+            self.assertAlmostEqual(result[1], 100.0)
+            self.assertEqual(list(arr), [32.0, 212.0])
+
 if __name__ == "__main__":
     unittest.main()
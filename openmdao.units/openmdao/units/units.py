@@ -539,6 +539,9 @@ class PhysicalUnit(object):
 
 _UNIT_CACHE = {}
 
+# (src_units, dst_units) -> (factor, offset), cleared when units are added
+_CONVERSION_CACHE = {}
+
 def _find_unit(unit):
     """Find unit helper function."""
     if isinstance(unit, str):
@@ -611,6 +614,7 @@ def add_offset_unit(name, baseunit, factor, offset, comment=''):
                             "different factor or powers"
     _UNIT_LIB.unit_table[name] = unit
     _UNIT_LIB.set('units', name, unit)   
+    _CONVERSION_CACHE.clear()
     if comment: 
         _UNIT_LIB.help.append((name, comment, unit))
         
@@ -631,6 +635,7 @@ def add_unit(name, unit, comment=''):
         
     _UNIT_LIB.unit_table[name] = unit
     _UNIT_LIB.set('units', name, unit)
+    _CONVERSION_CACHE.clear()
 
 
 _UNIT_LIB = ConfigParser.ConfigParser()
@@ -760,10 +765,34 @@ def convert_units(value, units, convunits):
     """Return the given value (given in units) converted 
     to convunits.
     """
-    pq = PhysicalQuantity(value, units)
-    pq.convert_to_unit(convunits)
-    return pq.value
-    
+    return convert_value(value, units, convunits)
+
+
+def get_conversion_tuple(src_units, dst_units):
+    """Return the tuple (factor, offset) that converts a value in
+    `src_units` to `dst_units` via ``(value + offset) * factor``.
+    Results are cached, so only the first conversion between a given
+    pair of unit strings has to parse and compare the units.
+    """
+    try:
+        return _CONVERSION_CACHE[(src_units, dst_units)]
+    except KeyError:
+        conv = _find_unit(src_units).conversion_tuple_to(_find_unit(dst_units))
+        _CONVERSION_CACHE[(src_units, dst_units)] = conv
+        return conv
+
+
+def convert_value(value, src_units, dst_units):
+    """Return `value` (a number or a numpy array) given in `src_units`
+    converted to `dst_units`. Unlike :func:`convert_units`, no
+    :class:`PhysicalQuantity` is created, and arrays are converted with a
+    single vectorized operation, resulting in a new array.
+    """
+    factor, offset = get_conversion_tuple(src_units, dst_units)
+    if offset:
+        return (value + offset) * factor
+    return value * factor
+
 
 try:
     default_lib = resource_stream(__name__, 'unitLibdefault.ini')
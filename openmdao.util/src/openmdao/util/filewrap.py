@@ -4,6 +4,7 @@ A collection of utilities for file wrapping.
 Note: This is a work in progress.
 """
 
+import os
 import re
 import logging
 
@@ -15,7 +16,7 @@ from openmdao.util.decorators import stub_if_missing_deps
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import append, array, zeros
+    from numpy import append, array, zeros, fromstring
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -122,10 +123,20 @@ class ToInf(TokenConverter):
         return float('inf')
     
     
+_GRAMMARS = {}
+
 def _parse_line(delimiters=' \t'):
     """Parse a single data line that may contain string or numerical data.
     Float and Int 'words' are converted to their appropriate type. 
-    Exponentiation is supported, as are NaN and Inf."""
+    Exponentiation is supported, as are NaN and Inf. The grammar depends on
+    the delimiters and on pyparsing's default whitespace characters, and is
+    built once for each combination of the two."""
+    
+    key = (delimiters, ParserElement.DEFAULT_WHITE_CHARS)
+    try:
+        return _GRAMMARS[key]
+    except KeyError:
+        pass
     
     # Somewhat of a hack, but we can only use printables if the delimiter is
     # just whitespace. Otherwise, some seprators (like ',' or '=') potentially
@@ -172,15 +183,238 @@ def _parse_line(delimiters=' \t'):
     data = ( OneOrMore( (nan | num_float | mixed_exp | num_int |
                          string_text) ) )
     
+    _GRAMMARS[key] = data
     return data
 
+# Regular expression for plain numbers as the grammar from _parse_line sees
+# them. Note that, as in the grammar, a number written like "3e5" can't have
+# a leading sign.
+NUMBER_PATTERN = r'[+-]?(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eEdD][+-]?[0-9]+)?' \
+                 r'|[0-9]+[eEdD][+-]?[0-9]+|[+-]?[0-9]+'
+_NUMBERS_RE = re.compile(r'(?:%s)(?: (?:%s))*$' % (NUMBER_PATTERN, NUMBER_PATTERN))
+_INT_RE = re.compile(r'[+-]?[0-9]+$')
+_SPLITTERS = {}
+
+
+def _split_fields(line):
+    """Splits a line into fields the way the pyparsing grammar would if all
+    of the fields were plain numbers. The fields are not checked."""
+    
+    white = ParserElement.DEFAULT_WHITE_CHARS
+    try:
+        splitter, stop = _SPLITTERS[white]
+    except KeyError:
+        splitter = re.compile('[%s]+' % re.escape(white))
+        # Line ends that aren't whitespace end the parse.
+        ends = ''.join([c for c in '\r\n' if c not in white])
+        stop = re.compile('[%s]' % ends) if ends else None
+        _SPLITTERS[white] = (splitter, stop)
+        
+    if '\t' in line:
+        line = line.expandtabs()
+    if stop is not None:
+        match = stop.search(line)
+        if match:
+            line = line[:match.start()]
+    fields = splitter.split(line)
+    if fields and not fields[-1]:
+        fields.pop()
+    if fields and not fields[0]:
+        del fields[0]
+    return fields
+
+
+def _all_numbers(fields):
+    """Returns True if all of the fields are plain numbers."""
+    
+    text = ' '.join(fields)
+    # Spaces aren't always whitespace, so a field may contain one.
+    return text.count(' ') == len(fields)-1 and \
+           _NUMBERS_RE.match(text) is not None
+
+
+def to_number(field):
+    """Converts a field that matched NUMBER_PATTERN to an int or a float."""
+    
+    if _INT_RE.match(field):
+        return int(field)
+    return float(field.replace('D', 'E').replace('d', 'E'))
+
+
+def _fast_fields(line, count=None, text=()):
+    """Returns the first `count` (default all) fields of a line, converted
+    the same way the grammar from :func:`_parse_line` would, provided they
+    are all plain numbers or one of the words in `text`. Returns None if
+    they aren't, in which case the line has to be parsed with pyparsing."""
+    
+    fields = _split_fields(line)
+    # Negative field numbers count from the end of the whole line.
+    if count > 0:
+        fields = fields[:count]
+    if not fields:
+        return None
+    if text:
+        numbers = [field for field in fields if field not in text]
+    else:
+        numbers = fields
+    if numbers and not _all_numbers(numbers):
+        return None
+    return [field if field in text else to_number(field)
+            for field in fields]
+
+
+def _to_array(fields):
+    """Converts a list of fields that matched NUMBER_PATTERN to a float array in
+    one go."""
+    
+    text = ' '.join(fields).replace('D', 'E').replace('d', 'E')
+    return fromstring(text, dtype=float, sep=' ')
+
+
+def _numeric_block(block):
+    """Returns the selected fields of a block of lines if they, and the
+    fields before them, are all plain numbers. Otherwise returns None.
+    `block` is a list of ``(fields, start, end)`` with the fields of each
+    line from :func:`_split_fields` and the slice of them to select."""
+    
+    checked = []
+    selected = []
+    for fields, start, end in block:
+        if not fields:
+            return None
+        checked.extend(fields[:end])
+        selected.extend(fields[start:end])
+    if not _all_numbers(checked):
+        return None
+    return selected
+
+
+def format_floats(values):
+    """Returns the text of each float in the 1D float array `values`, as
+    FileParser and InputFileGenerator write floats: with a single zero after
+    the decimal point if the value is an integer, else with 16 places of
+    accuracy. The whole array is checked for integers in one pass."""
+    
+    integral = (values == values.round()).tolist()
+    return [("%.1f" if whole else "%.16g") % val
+            for val, whole in zip(values.tolist(), integral)]
+
+
+def _format_values(values):
+    """Returns the text that _SubHelper would substitute for each of
+    `values`. One-dimensional float arrays are formatted in one pass."""
+    
+    if getattr(values, 'ndim', None) == 1 and values.dtype.kind == 'f':
+        return format_floats(values)
+    
+    return [_getformat(val) % val if isinstance(val, float) else str(val)
+            for val in values]
+
+
+def _split_template_line(line, reg):
+    """Splits a line into a list that alternates between the text between
+    fields and the fields matched by `reg`, so that field n (counting from
+    1) is at index 2n-1."""
+    
+    fragments = []
+    pos = 0
+    for match in reg.finditer(line):
+        fragments.append(line[pos:match.start()])
+        fragments.append(match.group())
+        pos = match.end()
+    fragments.append(line[pos:])
+    return fragments
+
+
+class _CompiledTemplate(object):
+    """A template file that has been read in and whose anchors and fields
+    are located only once. It is shared by all compiled InputFileGenerators
+    using the same file and is never modified, so what was found for one
+    generation is still valid for the next."""
+    
+    _cache = {}
+    
+    def __init__(self, lines):
+        self.lines = lines
+        self.anchors = {}
+        self._fragments = {}
+        self._num_fields = {}
+    
+    @classmethod
+    def get(cls, filename):
+        """Returns the compiled template for `filename`, reading the file
+        only if it has changed since the last call."""
+        
+        path = os.path.abspath(filename)
+        info = os.stat(path)
+        stamp = (info.st_mtime, info.st_size)
+        try:
+            old_stamp, template = cls._cache[path]
+        except KeyError:
+            pass
+        else:
+            if old_stamp == stamp:
+                return template
+        
+        templatefile = open(filename, 'r')
+        template = cls(templatefile.readlines())
+        templatefile.close()
+        cls._cache[path] = (stamp, template)
+        return template
+    
+    def fragments(self, j, reg):
+        """Returns the fragments of line `j` split at the fields matched by
+        `reg`. The list must not be modified."""
+        
+        key = (j, reg.pattern)
+        try:
+            return self._fragments[key]
+        except KeyError:
+            fragments = _split_template_line(self.lines[j], reg)
+            self._fragments[key] = fragments
+            return fragments
+    
+    def num_fields(self, j, reg):
+        """Returns the number of fields in line `j`."""
+        
+        try:
+            return self._num_fields[(j, reg.pattern)]
+        except KeyError:
+            count = len(self.fragments(j, reg)) // 2
+            self._num_fields[(j, reg.pattern)] = count
+            return count
+    
+    def render(self, j, subs):
+        """Returns line `j` with the substitutions in `subs` applied. `subs`
+        is a list of ``(reg, {field: text})``."""
+        
+        line = self.lines[j]
+        for i, (reg, fields) in enumerate(subs):
+            if i == 0:
+                fragments = list(self.fragments(j, reg))
+            else:
+                fragments = _split_template_line(line, reg)
+            for field, text in fields.iteritems():
+                if 2*field-1 < len(fragments):
+                    fragments[2*field-1] = text
+            line = ''.join(fragments)
+        return line
+
 
 class InputFileGenerator(object):
     """Utility to generate an input file from a template.
     Substitution of values is supported. Data is located with
-    a simple API."""
+    a simple API.
     
-    def __init__(self):
+    compiled: bool (optional)
+        If True, the template file is read only once per process and the
+        locations of anchors and fields are remembered, so generating the
+        same file over and over again (once per case, say) only has to
+        format the new values. Substitutions are recorded and applied in
+        ``generate``, so anchors and fields always refer to the template
+        as it was read rather than to previously substituted text."""
+    
+    def __init__(self, compiled=False):
         
         self.template_filename = []
         self.output_filename = []
@@ -191,6 +425,12 @@ class InputFileGenerator(object):
         self.data = []
         self.current_row = 0
         self.anchored = False
+        
+        self.compiled = compiled
+        self._template = None
+        self._subs = {}
+        self._tails = {}
+        self._cleared = set()
     
     def set_template_file(self, filename):
         """Set the name of the template file to be used The template
@@ -201,6 +441,14 @@ class InputFileGenerator(object):
         
         self.template_filename = filename
         
+        if self.compiled:
+            self._template = _CompiledTemplate.get(filename)
+            self.data = self._template.lines
+            self._subs = {}
+            self._tails = {}
+            self._cleared = set()
+            return
+        
         templatefile = open(filename, 'r')
         self.data = templatefile.readlines()
         templatefile.close()
@@ -237,6 +485,22 @@ class InputFileGenerator(object):
             find last occurrence. Reverse searches always start at the end
             of the file no matter the state of any previous anchor."""
         
+        if self._template is not None:
+            key = (self.current_row, self.anchored, anchor, occurrence)
+            try:
+                row = self._template.anchors[key]
+            except KeyError:
+                row = self._find_anchor(anchor, occurrence)
+                self._template.anchors[key] = row
+        else:
+            row = self._find_anchor(anchor, occurrence)
+            
+        self.current_row = row
+        self.anchored = True
+        
+    def _find_anchor(self, anchor, occurrence):
+        """Returns the row of the anchor for ``mark_anchor``."""
+        
         if not isinstance(occurrence, int):
             raise ValueError("The value for occurrence must be an integer")
         
@@ -255,9 +519,7 @@ class InputFileGenerator(object):
                     
                     instance += 1
                     if instance == occurrence:
-                        self.current_row += count
-                        self.anchored = True
-                        return
+                        return self.current_row + count
             
                 count += 1
                 
@@ -274,9 +536,7 @@ class InputFileGenerator(object):
                 if line.find(anchor) > -1:
                     instance += -1
                     if instance == occurrence:
-                        self.current_row = count
-                        self.anchored = True
-                        return
+                        return count
             
                 count -= 1
         else:
@@ -300,6 +560,16 @@ class InputFileGenerator(object):
         
         field - which word in line to replace, as denoted by delimiter(s)"""
 
+        if self._template is not None:
+            j = self._row(row)
+            if 1 <= field <= self._num_fields(j):
+                if isinstance(value, float):
+                    text = _getformat(value) % value
+                else:
+                    text = str(value)
+                self._substitute(j, {field: text})
+            return
+        
         j = self.current_row + row
         line = self.data[j]
         
@@ -340,6 +610,28 @@ class InputFileGenerator(object):
         if row_end == None:
             row_end = row_start
             
+        if self._template is not None:
+            texts = _format_values(value)
+            counter = 0
+            for row in range(row_start, row_end+1):
+                j = self._row(row)
+                nfields = self._num_fields(j)
+                if row == row_end:
+                    nfields = min(nfields, field_end)
+                fields = zip(range(max(field_start, 1), nfields+1),
+                             texts[counter:])
+                self._substitute(j, dict(fields))
+                counter += len(fields)
+                field_start = 0
+            
+            # Extra values go at the end of the last line (see below).
+            if counter < len(value):
+                tail = ''.join([sep + str(val) for val in value[counter:]])
+                self._tails.setdefault(j, []).append((True, tail + "\n"))
+            else:
+                self._tails.setdefault(j, []).append((False, "\n"))
+            return
+        
         sub = _SubHelper()
         for row in range(row_start, row_end+1):
             
@@ -401,6 +693,15 @@ class InputFileGenerator(object):
         sep: str (optional) (currently unsupported)
             Separator to append between values if we go beyond the template."""
 
+        if self._template is not None:
+            for i, row in enumerate(range(row_start, row_end+1)):
+                j = self._row(row)
+                nfields = min(self._num_fields(j), field_end)
+                fields = zip(range(max(field_start, 1), nfields+1),
+                             _format_values(value[i, :]))
+                self._substitute(j, dict(fields))
+            return
+        
         sub = _SubHelper()
         i = 0
         for row in range(row_start, row_end+1):
@@ -426,15 +727,71 @@ class InputFileGenerator(object):
         row: integer
             row number to clear, relative to current anchor."""
 
+        if self._template is not None:
+            j = self._row(row)
+            self._subs.pop(j, None)
+            self._tails.pop(j, None)
+            self._cleared.add(j)
+            return
+        
         self.data[self.current_row + row] = "\n"
         
     def generate(self):
         """Use the template file to generate the input file."""
 
+        if self._template is not None:
+            lines = list(self._template.lines)
+            for j in set(self._subs) | set(self._tails) | self._cleared:
+                lines[j] = self._render(j)
+            infile = open(self.output_filename, 'w')
+            infile.write(''.join(lines))
+            infile.close()
+            return
+        
         infile = open(self.output_filename, 'w')
         infile.writelines(self.data)
         infile.close()
 
+    def _row(self, row):
+        """Returns the index in the template of `row` relative to the
+        current anchor."""
+        
+        j = self.current_row + row
+        if 0 <= j < len(self.data):
+            return j
+        self.data[j]   # IndexError if it doesn't exist
+        return j % len(self.data)
+    
+    def _num_fields(self, j):
+        """Returns the number of fields in template line `j`."""
+        
+        if j in self._cleared:
+            return 0
+        return self._template.num_fields(j, self.reg)
+    
+    def _substitute(self, j, fields):
+        """Records the text to put into some fields of template line `j`.
+        `fields` maps field numbers to text."""
+        
+        subs = self._subs.setdefault(j, [])
+        if subs and subs[-1][0].pattern == self.reg.pattern:
+            subs[-1][1].update(fields)
+        else:
+            subs.append((self.reg, fields))
+    
+    def _render(self, j):
+        """Returns template line `j` with all recorded changes applied."""
+        
+        if j in self._cleared:
+            line = "\n"
+        else:
+            line = self._template.render(j, self._subs.get(j, []))
+        for strip, tail in self._tails.get(j, []):
+            if strip:
+                line = line.rstrip()
+            line += tail
+        return line
+
 
 @stub_if_missing_deps('numpy')
 class FileParser(object):
@@ -601,7 +958,9 @@ class FileParser(object):
             
             # Let pyparsing figure out if this is a number, and return it
             # as a float or int as appropriate
-            data = _parse_line().parseString(line)
+            data = _fast_fields(line)
+            if data is None:
+                data = _parse_line().parseString(line)
             
             # data might have been split if it contains whitespace. If so,
             # just return the whole string
@@ -610,7 +969,9 @@ class FileParser(object):
             else:
                 return data[0]
         else:
-            data = _parse_line(self.delimiter).parseString(line)
+            data = _fast_fields(line, field)
+            if data is None:
+                data = _parse_line(self.delimiter).parseString(line)
             return data[field-1]
 
     def transfer_keyvar(self, key, field, occurrence=1, rowoffset=0):
@@ -660,7 +1021,10 @@ class FileParser(object):
         j = self.current_row + row + rowoffset
         line = self.data[j]
         
-        fields = _parse_line(self.delimiter).parseString(line.replace(key,"KeyField"))
+        line = line.replace(key, "KeyField")
+        fields = _fast_fields(line, field+1, ("KeyField",))
+        if fields is None:
+            fields = _parse_line(self.delimiter).parseString(line)
         
         return fields[field]
 
@@ -697,6 +1061,19 @@ class FileParser(object):
             
         lines = self.data[j1:j2]
 
+        # Purely numeric blocks are converted in one go.
+        if self.delimiter == "columns":
+            block = [(_split_fields(line[(fieldstart-1):fieldend].strip()),
+                      0, None) for line in lines]
+        else:
+            block = [(_split_fields(line), 0, None) for line in lines]
+            if block:
+                block[0] = (block[0][0], fieldstart-1, None)
+                block[-1] = (block[-1][0], block[-1][1], fieldend)
+        fields = _numeric_block(block)
+        if fields is not None:
+            return _to_array(fields)
+
         data = zeros(shape=(0, 0))
 
         for i, line in enumerate(lines):
@@ -762,6 +1139,21 @@ class FileParser(object):
         j2 = self.current_row + rowend + 1
         lines = list(self.data[j1:j2])
         
+        # Purely numeric blocks are converted in one go.
+        end = fieldend or None
+        if self.delimiter == "columns":
+            block = [(_split_fields(line[(fieldstart-1):end]), 0, None)
+                     for line in lines]
+        else:
+            block = [(_split_fields(line), fieldstart-1, end)
+                     for line in lines]
+        fields = _numeric_block(block)
+        if fields is not None:
+            ncols = len(fields) // len(lines)
+            if all([len(row[start:end]) == ncols
+                    for row, start, end in block]):
+                return _to_array(fields).reshape((len(lines), ncols))
+        
         if self.delimiter == "columns":
             
             if fieldend:
@@ -0,0 +1,101 @@
+"""
+Support for deferring the import of modules until they are actually used.
+This keeps the startup time of short-lived processes (remote servers,
+external code workers) from being dominated by heavy optional dependencies
+such as sympy or scipy.
+"""
+
+import sys
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """
+    Stand-in for the module `name` that imports it on first attribute
+    access. Use :func:`lazy_import` to create one.
+    """
+
+    def __init__(self, name):
+        super(LazyModule, self).__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        """ Import the real module (once) and return it. """
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            __import__(self.__name__)
+            module = sys.modules[self.__name__]
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __repr__(self):
+        if self.__dict__['_lazy_module'] is None:
+            return '<lazy module %r (not loaded)>' % self.__name__
+        return repr(self.__dict__['_lazy_module'])
+
+
+def lazy_import(name):
+    """
+    Return the module `name` if it has already been imported, otherwise
+    a :class:`LazyModule` that will import it when it's first used.
+    Import errors are therefore reported on first use rather than here.
+    """
+    try:
+        return sys.modules[name]
+    except KeyError:
+        return LazyModule(name)
+
+
+class _LazyAttrModule(ModuleType):
+    """
+    Replacement for a module in ``sys.modules`` which resolves some of its
+    attributes by importing them from other modules on first access.
+    """
+
+    def __init__(self, module, attrs):
+        super(_LazyAttrModule, self).__init__(module.__name__, module.__doc__)
+        self.__dict__.update(module.__dict__)
+        # Keep the original module alive, otherwise its globals get cleared.
+        self.__dict__['_lazy_orig_module'] = module
+        self.__dict__['_lazy_attrs'] = attrs
+        # So that ``from modname import *`` still sees the lazy attributes.
+        if '__all__' not in self.__dict__:
+            self.__dict__['__all__'] = \
+                sorted([name for name in module.__dict__
+                                 if not name.startswith('_')] + attrs.keys())
+
+    def __getattr__(self, name):
+        try:
+            modname = self.__dict__['_lazy_attrs'][name]
+        except KeyError:
+            raise AttributeError("'module' object has no attribute '%s'"
+                                 % name)
+        __import__(modname)
+        value = getattr(sys.modules[modname], name)
+        self.__dict__[name] = value
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__.keys()) |
+                      set(self.__dict__['_lazy_attrs'].keys()))
+
+
+def lazy_attributes(modname, attrs):
+    """
+    Make the attributes of module `modname` listed in `attrs` lazy. `attrs`
+    maps each attribute name to the name of the module to import it from.
+    Typically called at the end of the module itself::
+
+        lazy_attributes(__name__, {'create': 'openmdao.main.factorymanager'})
+
+    After this, ``from modname import create`` or ``modname.create`` will
+    import :mod:`openmdao.main.factorymanager` the first time it is done.
+    """
+    module = sys.modules[modname]
+    sys.modules[modname] = _LazyAttrModule(module, dict(attrs))
@@ -3,12 +3,13 @@ Utilities for reading and writing Fortran namelists.
 """
 
 import logging
+import re
 
 # pylint: disable-msg=E0611,F0401
 import ordereddict
 
 try:
-    from numpy import ndarray, array, append, vstack, zeros, \
+    from numpy import ndarray, array, append, vstack, zeros, fromstring, \
          int32, int64, float32, float64
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
@@ -17,9 +18,10 @@ from enthought.traits.trait_handlers import TraitListObject
 
 from pyparsing import CaselessLiteral, Combine, ZeroOrMore, Literal, \
                       Optional, QuotedString, Suppress, Word, alphanums, \
-                      oneOf, nums, TokenConverter, Group
+                      oneOf, nums, TokenConverter, Group, ParserElement
 
-from openmdao.util.filewrap import ToFloat, ToInteger
+from openmdao.util.filewrap import ToFloat, ToInteger, NUMBER_PATTERN, \
+                                   to_number, format_floats
 from openmdao.util.decorators import stub_if_missing_deps
 
 def _floatfmt(val):
@@ -51,6 +53,15 @@ def _boolfmt(val):
     else:
         return 'F%.0s'
     
+def _format_array(values, fmt):
+    """ Returns the text of each entry of the 1D array `values` as formatted
+    by the format function `fmt`. Floats are formatted in one pass."""
+    
+    if fmt is _floatfmt:
+        return format_floats(values)
+    
+    return [fmt(val) % val for val in values.tolist()]
+    
     
 def _process_card_info(card):
     """ Function to extract info from a card as returned from PyParsing a
@@ -108,6 +119,149 @@ class ToBool(TokenConverter):
             raise RuntimeError('Unexpected error while trying to identify a'
                                ' Boolean value in the namelist.')
 
+_GRAMMARS = {}
+
+def _namelist_grammar():
+    """ Returns the pyparsing tokens used to parse a namelist file. Like all
+    pyparsing grammars they depend on the default whitespace characters, so
+    they are built once for each set of those. """
+    
+    try:
+        return _GRAMMARS[ParserElement.DEFAULT_WHITE_CHARS]
+    except KeyError:
+        pass
+    
+    # Lots of numerical tokens for recognizing various kinds of numbers
+    digits = Word(nums)
+    dot = "."
+    sign = oneOf("+ -")
+    ee = CaselessLiteral('E') | CaselessLiteral('D')
+
+    num_int = ToInteger(Combine( Optional(sign) + digits ))
+    
+    num_float = ToFloat(Combine( Optional(sign) + 
+                        ((digits + dot + Optional(digits)) |
+                         (dot + digits)) +
+                         Optional(ee + Optional(sign) + digits)
+                        ))
+    
+    # special case for a float written like "3e5"
+    mixed_exp = ToFloat(Combine( digits + ee + Optional(sign) + digits ))
+    
+    # I don't suppose we need these, but just in case (plus it's easy)
+    nan = ToFloat(oneOf("NaN Inf -Inf"))
+    
+    numval = num_float | mixed_exp | num_int | nan
+    strval =  QuotedString(quoteChar='"') | QuotedString(quoteChar="'")
+    b_list = "T TRUE True true F FALSE False false .TRUE. .FALSE. .T. .F."
+    boolval = ToBool(oneOf(b_list))
+    fieldval = Word(alphanums)
+    
+    # Tokens for parsing a line of data
+    numstr_token = numval + ZeroOrMore(Suppress(',') + numval) \
+               | strval
+    data_token = numstr_token | boolval
+    index_token = Suppress('(') + num_int + Suppress(')')
+    
+    card_token = Group(fieldval("name") + \
+                       Optional(index_token("index")) + \
+                       Suppress('=') + \
+                       Optional(num_int("dimension") + Suppress('*')) + \
+                       data_token("value") + \
+                       Optional(Suppress('*') + num_int("dimension")))
+    multi_card_token = (card_token + ZeroOrMore(Suppress(',') + card_token))
+    array_continuation_token = numstr_token.setResultsName("value")
+    array2D_token = fieldval("name") + Suppress("(") + \
+                    Suppress(num_int) + Suppress(',') + \
+                    num_int("index") + Suppress(')') + \
+                    Suppress('=') + numval + \
+                    ZeroOrMore(Suppress(',') + numval)
+    
+    # Tokens for parsing the group head and tail
+    group_end_token = Literal("/") | Literal("$END") | Literal("$end")
+    group_name_token = (Literal("$") | Literal("&")) + \
+                       Word(alphanums).setResultsName("name") + \
+                       Optional(multi_card_token) + \
+                       Optional(group_end_token)
+    
+    # Comment Token
+    comment_token = Literal("!")
+    
+    grammar = (comment_token, multi_card_token, array2D_token,
+               array_continuation_token, group_end_token, group_name_token)
+    _GRAMMARS[ParserElement.DEFAULT_WHITE_CHARS] = grammar
+    return grammar
+
+# The most common lines inside a group are handled by a simple scanner
+# instead of the pyparsing grammar: a single card holding a number, a
+# list of numbers, a quoted string or a logical, and lines that continue
+# an array. The patterns only accept what the grammar would parse the
+# same way; anything else is left to pyparsing.
+_BOOLS = {'T': True, 'TRUE': True, 'True': True, 'true': True,
+          '.TRUE.': True, '.T.': True,
+          'F': False, 'FALSE': False, 'False': False, 'false': False,
+          '.FALSE.': False, '.F.': False}
+_NUMBERS = r'(?:%s)(?: *, *(?:%s))*' % (NUMBER_PATTERN, NUMBER_PATTERN)
+_CARD_RE = re.compile(r"([A-Za-z0-9]+) *= *(?:(%s)|'([^'\\]*)'|"
+                      r'"([^"\\]*)"|(%s)) *,? */?$' % \
+                      (_NUMBERS, '|'.join([re.escape(b) for b in _BOOLS])))
+_CONTINUATION_RE = re.compile(r'(%s) *,? */?$' % _NUMBERS)
+_COMMA_RE = re.compile(r' *, *')
+_INTS_RE = re.compile(r'[+-]?[0-9]+(?: [+-]?[0-9]+)*$')
+_GROUP_ENDS = ('/', '$END', '$end')
+
+
+def _number_list(text):
+    """ Converts a comma-separated list of numbers matched by _NUMBERS into
+    a number if there is only one, otherwise into an array, converting all
+    of them at once."""
+    
+    tokens = _COMMA_RE.split(text)
+    if len(tokens) == 1:
+        return to_number(tokens[0])
+    
+    text = ' '.join(tokens)
+    if _INTS_RE.match(text):
+        return fromstring(text, dtype=int, sep=' ')
+    return fromstring(text.replace('D', 'E').replace('d', 'E'),
+                      dtype=float, sep=' ')
+
+
+def _scan_line(line):
+    """ Scans a stripped line from inside a namelist group, which must be
+    parsed with pyparsing's default whitespace characters. Returns
+    ``(kind, name, value)``, where kind is 'comment', 'card', 'continuation'
+    or 'end', or None if the line has to be parsed with pyparsing."""
+    
+    if '!' in line:
+        return ('comment', None, None)
+    
+    if '\t' in line:
+        line = line.expandtabs()
+        
+    match = _CARD_RE.match(line)
+    if match:
+        name, numbers, squoted, dquoted, logical = match.groups()
+        if numbers is not None:
+            value = _number_list(numbers)
+        elif squoted is not None:
+            value = squoted
+        elif dquoted is not None:
+            value = dquoted
+        else:
+            value = _BOOLS[logical]
+        return ('card', name, value)
+        
+    match = _CONTINUATION_RE.match(line)
+    if match:
+        return ('continuation', None, _number_list(match.group(1)))
+    
+    if line in _GROUP_ENDS:
+        return ('end', None, None)
+    
+    return None
+
+
 @stub_if_missing_deps('numpy')
 class Namelist(object):
     """Utility to ease the task of constructing a formatted output file."""
@@ -211,116 +365,111 @@ class Namelist(object):
         """Generates the input file. This should be called after all cards
         and groups are added to the namelist."""
 
-        data = []
-        data.append("%s\n" % self.title)
-        for i, group_name in enumerate(self.groups):
+        outfile = open(self.filename, 'w')
+        try:
+            outfile.write("%s\n" % self.title)
+            for i, group_name in enumerate(self.groups):
+                
+                # Groups get a '&', freeform cards don't.
+                if self.cards[i]:
+                    outfile.write("&%s\n" % group_name)
+                else:
+                    outfile.write("%s\n" % group_name)
+                    
+                for card in self.cards[i]:
+                    line = self._card_text(card, group_name)
+                    if line is not None:
+                        outfile.write(line)
+    
+                # A group with no cards is treated like a free-form entity.
+                if len(self.cards[i])>0:        
+                    outfile.write("%s\n" % self.terminator)
+        finally:
+            outfile.close()
+        
+    def _card_text(self, card, group_name):
+        """Returns the text written to the input file for a card, or None if
+        the card is skipped."""
+        
+        if card.is_comment:
+            return "  %s\n" % (card.value)
             
-            # Groups get a '&', freeform cards don't.
-            if self.cards[i]:
-                data.append("&%s\n" % group_name)
-            else:
-                data.append("%s\n" % group_name)
+        elif isinstance(card.value, bool):
+            fstring = "  %s = " + _boolfmt(card.value) + "\n"
+            return fstring % (card.name, card.value)
+            
+        elif isinstance(card.value, int):
+            fstring = "  %s = " + _intfmt(card.value) + "\n"
+            return fstring % (card.name, card.value)
+            
+        elif isinstance(card.value, float):
+            fstring = "  %s = " + _floatfmt(card.value) + "\n"
+            return fstring % (card.name, card.value)
+            
+        elif isinstance(card.value, str):
+            fstring = "  %s = " + _strfmt(card.value) + "\n"
+            return fstring % (card.name, card.value)
+            
+        # Lists are mainly supported for the Enum Array
+        elif isinstance(card.value, list):
+            texts = []
+            for val in card.value:
                 
-            for card in self.cards[i]:
+                # We can have integer, real, or string lists
+                if isinstance(val, bool):
+                    fmt = _boolfmt
+                elif isinstance(val, (int, int32, int64)):
+                    fmt = _intfmt
+                elif isinstance(val, (float, float32, float64)):
+                    fmt = _floatfmt
+                else:
+                    fmt = _strfmt
+            
+                texts.append(fmt(val) % val)
                 
-                if card.is_comment:
-                    line = "  %s\n" % (card.value)
-                    
-                elif isinstance(card.value, bool):
-                    fstring = "  %s = " + _boolfmt(card.value) + "\n"
-                    line = fstring % (card.name, card.value)
-                    
-                elif isinstance(card.value, int):
-                    fstring = "  %s = " + _intfmt(card.value) + "\n"
-                    line = fstring % (card.name, card.value)
-                    
-                elif isinstance(card.value, float):
-                    fstring = "  %s = " + _floatfmt(card.value) + "\n"
-                    line =  fstring % (card.name, card.value)
-                    
-                elif isinstance(card.value, str):
-                    fstring = "  %s = " + _strfmt(card.value) + "\n"
-                    line =  fstring % (card.name, card.value)
-                    
-                # Lists are mainly supported for the Enum Array
-                elif isinstance(card.value, list):
-                    line = "  %s = " % (card.name)
-                    sep = ""
-                    for val in card.value:
-                        
-                        # We can have integer, real, or string lists
-                        if isinstance(val, bool):
-                            fmt = _boolfmt
-                        elif isinstance(val, (int, int32, int64)):
-                            fmt = _intfmt
-                        elif isinstance(val, (float, float32, float64)):
-                            fmt = _floatfmt
-                        else:
-                            fmt = _strfmt
-                    
-                        fstring = sep + fmt(val)
-                        line += fstring % val
-                        sep = self.delimiter
-                        
-                    line += "\n"
+            return "  %s = %s\n" % (card.name, self.delimiter.join(texts))
 
-                elif isinstance(card.value, (ndarray)):
-                    
-                    # We can have integer, real, or string arrays
-                    if card.value.dtype == bool:
-                        fmt = _boolfmt
-                    elif card.value.dtype in (int, int32, int64):
-                        fmt = _intfmt
-                    elif card.value.dtype in (float, float32, float64):
-                        fmt = _floatfmt
-                    else:
-                        fmt = _strfmt
-                    
-                    # We don't need to output 0D arrays
-                    if len(card.value) == 0:
-                        continue
-                    
-                    elif len(card.value.shape) == 1:
-                        line = "  %s = " % (card.name)
-                        sep = ""
-                        for val in card.value:
-                            fstring = "%s" + fmt(val)
-                            line += fstring % (sep, val)
-                            sep = self.delimiter
-                        line += "\n"
-                            
-                    elif len(card.value.shape) == 2:
-                        
-                        line = "  "
-                        for row in range(0, card.value.shape[0]):
-                            line += card.name + "(1," + str(row+1) + ") ="
-                            for col in range(0, card.value.shape[1]):
-                                val = card.value[row, col]
-                                fstring = " " + fmt(val) + "%s"
-                                line += fstring % (val, self.delimiter)
-                            line += "\n"
-                        
-                    else:
-                        raise RuntimeError("Don't know how to handle array" + \
-                                           " of %s dimensions" \
-                                           % len(card.value.shape))
+        elif isinstance(card.value, (ndarray)):
+            
+            # We can have integer, real, or string arrays
+            if card.value.dtype == bool:
+                fmt = _boolfmt
+            elif card.value.dtype in (int, int32, int64):
+                fmt = _intfmt
+            elif card.value.dtype in (float, float32, float64):
+                fmt = _floatfmt
+            else:
+                fmt = _strfmt
+            
+            # We don't need to output 0D arrays
+            if len(card.value) == 0:
+                return None
+            
+            elif len(card.value.shape) == 1:
+                texts = _format_array(card.value, fmt)
+                return "  %s = %s\n" % (card.name, 
+                                        self.delimiter.join(texts))
                     
-                else:
-                    raise RuntimeError("Error generating input file. Don't" + \
-                                       " know how to handle data in variable" + \
-                                       " %s in group %s." % (card.name, \
-                                                            group_name))
-
-                data.append(line)
-
-            # A group with no cards is treated like a free-form entity.
-            if len(self.cards[i])>0:        
-                data.append("%s\n" % self.terminator)
+            elif len(card.value.shape) == 2:
                 
+                lines = ["  "]
+                for row in range(0, card.value.shape[0]):
+                    lines.append("%s(1,%d) =" % (card.name, row+1))
+                    for text in _format_array(card.value[row], fmt):
+                        lines.append(" %s%s" % (text, self.delimiter))
+                    lines.append("\n")
+                return ''.join(lines)
+                
+            else:
+                raise RuntimeError("Don't know how to handle array" + \
+                                   " of %s dimensions" \
+                                   % len(card.value.shape))
             
-        outfile = open(self.filename, 'w')
-        outfile.writelines(data)
-        outfile.close()
+        else:
+            raise RuntimeError("Error generating input file. Don't" + \
+                               " know how to handle data in variable" + \
+                               " %s in group %s." % (card.name, \
+                                                    group_name))
         
     def parse_file(self):
         """Parses an existing namelist file and creates a deck of cards to
@@ -331,61 +480,13 @@ class Namelist(object):
         data = infile.readlines()
         infile.close()
         
-        # Lots of numerical tokens for recognizing various kinds of numbers
-        digits = Word(nums)
-        dot = "."
-        sign = oneOf("+ -")
-        ee = CaselessLiteral('E') | CaselessLiteral('D')
-    
-        num_int = ToInteger(Combine( Optional(sign) + digits ))
-        
-        num_float = ToFloat(Combine( Optional(sign) + 
-                            ((digits + dot + Optional(digits)) |
-                             (dot + digits)) +
-                             Optional(ee + Optional(sign) + digits)
-                            ))
-        
-        # special case for a float written like "3e5"
-        mixed_exp = ToFloat(Combine( digits + ee + Optional(sign) + digits ))
-        
-        # I don't suppose we need these, but just in case (plus it's easy)
-        nan = ToFloat(oneOf("NaN Inf -Inf"))
-        
-        numval = num_float | mixed_exp | num_int | nan
-        strval =  QuotedString(quoteChar='"') | QuotedString(quoteChar="'")
-        b_list = "T TRUE True true F FALSE False false .TRUE. .FALSE. .T. .F."
-        boolval = ToBool(oneOf(b_list))
-        fieldval = Word(alphanums)
-        
-        # Tokens for parsing a line of data
-        numstr_token = numval + ZeroOrMore(Suppress(',') + numval) \
-                   | strval
-        data_token = numstr_token | boolval
-        index_token = Suppress('(') + num_int + Suppress(')')
-        
-        card_token = Group(fieldval("name") + \
-                           Optional(index_token("index")) + \
-                           Suppress('=') + \
-                           Optional(num_int("dimension") + Suppress('*')) + \
-                           data_token("value") + \
-                           Optional(Suppress('*') + num_int("dimension")))
-        multi_card_token = (card_token + ZeroOrMore(Suppress(',') + card_token))
-        array_continuation_token = numstr_token.setResultsName("value")
-        array2D_token = fieldval("name") + Suppress("(") + \
-                        Suppress(num_int) + Suppress(',') + \
-                        num_int("index") + Suppress(')') + \
-                        Suppress('=') + numval + \
-                        ZeroOrMore(Suppress(',') + numval)
-        
-        # Tokens for parsing the group head and tail
-        group_end_token = Literal("/") | Literal("$END") | Literal("$end")
-        group_name_token = (Literal("$") | Literal("&")) + \
-                           Word(alphanums).setResultsName("name") + \
-                           Optional(multi_card_token) + \
-                           Optional(group_end_token)
-        
-        # Comment Token
-        comment_token = Literal("!")
+        comment_token, multi_card_token, array2D_token, \
+            array_continuation_token, group_end_token, group_name_token = \
+            _namelist_grammar()
+        
+        # The scanner splits on the same whitespace as the grammar only if
+        # that hasn't been changed.
+        scan = ParserElement.DEFAULT_WHITE_CHARS == " \n\t\r"
         
         # Loop through each line and parse.
         
@@ -400,8 +501,20 @@ class Namelist(object):
                 
             if current_group:
                 
+                scanned = _scan_line(line) if scan else None
+                
+                # Lines the scanner understands
+                if scanned:
+                    kind, name, value = scanned
+                    if kind == 'card':
+                        self.cards[-1].append(Card(name, value))
+                    elif kind == 'continuation':
+                        self._continue_array(value)
+                    elif kind == 'end':
+                        current_group = None
+                
                 # Skip comment cards
-                if comment_token.searchString(line):
+                elif comment_token.searchString(line):
                     pass
                 
                 # Process orindary cards
@@ -438,12 +551,7 @@ class Namelist(object):
                     else:
                         element = card.value
                         
-                    if isinstance(self.cards[-1][-1].value, ndarray):
-                        new_value = append(self.cards[-1][-1].value, element)
-                    else:
-                        new_value = array([self.cards[-1][-1].value, element])
-                    
-                    self.cards[-1][-1].value = new_value
+                    self._continue_array(element)
                     
                 # Lastly, look for the group footer
                 elif group_end_token.searchString(line):
@@ -493,6 +601,16 @@ class Namelist(object):
                     self.add_group(line_base.rstrip())
                     
 
+    def _continue_array(self, element):
+        """Appends the value(s) from an array continuation line to the value
+        of the most recent card, turning it into an array if needed."""
+        
+        card = self.cards[-1][-1]
+        if isinstance(card.value, ndarray):
+            card.value = append(card.value, element)
+        else:
+            card.value = array([card.value, element])
+                    
     def load_model(self, rules=None, ignore=None, single_group=-1):
         """Loads the current deck into an OpenMDAO component.
         
@@ -548,6 +666,7 @@ class Namelist(object):
         unlisted_groups = ordereddict.OrderedDict()
         unlinked_vars = []
         used_groups = []
+        varnames = None
         for i, group_name in use_group:
             
             # Report all groups with no cards
@@ -564,7 +683,9 @@ class Namelist(object):
             else:
                 used_groups.append(group_name)
                 
-            # Process the cards in this group
+            # Process the cards in this group. Their values are all set
+            # at once when the group is done.
+            items = []
             for card in self.cards[i]:
                 
                 name = card.name
@@ -594,8 +715,11 @@ class Namelist(object):
                                 break
                         
                 else:
+                    if varnames is None:
+                        varnames = set(self.comp.list_vars())
+                        
                     for item in [name, name.lower()]:
-                        if item in self.comp.list_vars():
+                        if item in varnames:
                             found = True
                             varpath = item
                             break
@@ -624,10 +748,12 @@ class Namelist(object):
                         else:
                             value = [value]
                         
-                    self.comp.set(varpath, value)
+                    items.append((varpath, value, None))
                     
                     #print varpath, value
                 
+            self.comp.set_many(items)
+            
         return empty_groups, unlisted_groups, unlinked_vars
 
     def find_card(self, group, name):
@@ -190,6 +190,54 @@ class TestCase(unittest.TestCase):
     
         self.assertEqual(answer, result)
 
+    def test_templated_input_compiled(self):
+
+        template = "Junk\n" + \
+                   "Anchor\n" + \
+                   " A 1, 2 34, Test 1e65\n" + \
+                   " B 4 Stuff\n" + \
+                   "Anchor\n" + \
+                   " C 77 False Inf 333.444\n" + \
+                   "0 0 0 0 0\n"
+
+        outfile = open(self.templatename, 'w')
+        outfile.write(template)
+        outfile.close()
+
+        for case in range(2):
+            gen = InputFileGenerator(compiled=True)
+            gen.set_template_file(self.templatename)
+            gen.set_generated_file(self.filename)
+            gen.set_delimiters(', ')
+
+            gen.mark_anchor('Anchor')
+            gen.transfer_var(3.0+case, 1, 3)
+            gen.reset_anchor()
+            gen.mark_anchor('Anchor', 2)
+            gen.transfer_var('NaN', 1, 4)
+            gen.transfer_array(array([1, 2, 3, 4.75+case]), 2, 4, 5,
+                               sep=' ')
+            gen.clearline(-4)
+
+            gen.generate()
+
+            infile = open(self.filename, 'r')
+            result = infile.read()
+            infile.close()
+
+            answer = "\n" + \
+                     "Anchor\n" + \
+                     " A 1, %.1f 34, Test 1e65\n" % (3.0+case) + \
+                     " B 4 Stuff\n" + \
+                     "Anchor\n" + \
+                     " C 77 False NaN 333.444\n" + \
+                     "0 0 0 1.0 2.0 3.0 %s\n" % (4.75+case)
+
+            self.assertEqual(answer, result)
+
+        # The template is shared and never modified.
+        self.assertEqual(gen.data[2], " A 1, 2 34, Test 1e65\n")
+
     def test_output_parse(self):
         
         data = "Junk\n" + \
@@ -584,7 +632,41 @@ class TestCase(unittest.TestCase):
         self.assertEqual(isnan(val), True)
         val = op.transfer_var(4, 4)
         self.assertEqual(val, '#$%')
-        
+
+    def test_numeric_blocks(self):
+
+        data = "Anchor\n" + \
+               "1.5D+02  -2  .25    3.e-1\n" + \
+               "2.5d-01  4   -1e5   7\n" + \
+               "-3.0E2   6   1.0    8\n"
+
+        outfile = open(self.filename, 'w')
+        outfile.write(data)
+        outfile.close()
+
+        op = FileParser()
+        op.set_file(self.filename)
+        op.set_delimiters(' ')
+        op.mark_anchor('Anchor')
+
+        val = op.transfer_var(1, 1)
+        self.assertEqual(val, 150.0)
+        val = op.transfer_var(1, 2)
+        self.assertEqual(val, -2)
+        self.assertTrue(isinstance(val, int))
+
+        val = op.transfer_array(1, 3, 2, 2)
+        self.assertEqual(list(val), [0.25, 0.3, 0.25, 4.0])
+
+        # '-1e5' is parsed as -1 followed by the string 'e5'
+        val = op.transfer_2Darray(1, 1, 3, 2)
+        self.assertEqual(val.shape, (3, 2))
+        self.assertEqual(list(val[:, 0]), [150.0, 0.25, -300.0])
+        val = op.transfer_array(2, 3, 2, 5)
+        self.assertEqual(list(val), ['-1', 'e5', '7'])
+        val = op.transfer_var(2, 4)
+        self.assertEqual(val, 'e5')
+
 
             
 if __name__ == '__main__':
@@ -0,0 +1,45 @@
+
+import sys
+import types
+import unittest
+
+from openmdao.util.lazyimport import lazy_import, lazy_attributes, LazyModule
+
+
+class LazyImportTestCase(unittest.TestCase):
+
+    def test_lazy_import(self):
+        sys.modules.pop('colorsys', None)
+        colorsys = lazy_import('colorsys')
+        self.assertTrue(isinstance(colorsys, LazyModule))
+        self.assertFalse('colorsys' in sys.modules)
+        self.assertEqual(colorsys.rgb_to_hsv(1., 0., 0.), (0., 1., 1.))
+        self.assertTrue('colorsys' in sys.modules)
+
+        # Already imported modules are returned directly.
+        self.assertTrue(lazy_import('colorsys') is sys.modules['colorsys'])
+
+        # Errors are reported on first use.
+        missing = lazy_import('no_such_module_here')
+        self.assertRaises(ImportError, getattr, missing, 'anything')
+
+    def test_lazy_attributes(self):
+        module = types.ModuleType('_lazy_test_api')
+        module.eager = 42
+        sys.modules['_lazy_test_api'] = module
+        try:
+            sys.modules.pop('colorsys', None)
+            lazy_attributes('_lazy_test_api', {'hls_to_rgb': 'colorsys'})
+            api = sys.modules['_lazy_test_api']
+            self.assertEqual(api.eager, 42)
+            self.assertFalse('colorsys' in sys.modules)
+            self.assertEqual(api.hls_to_rgb(0., 0., 0.), (0., 0., 0.))
+            self.assertTrue('colorsys' in sys.modules)
+            self.assertTrue('hls_to_rgb' in api.__all__)
+            self.assertRaises(AttributeError, getattr, api, 'nothing')
+        finally:
+            del sys.modules['_lazy_test_api']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -449,6 +449,40 @@ class TestCase(unittest.TestCase):
 
         self.assertEqual(contents, compare)
 
+    def test_large_array_roundtrip(self):
+
+        my_comp = VarComponent()
+        sb = Namelist(my_comp)
+
+        my_comp.arrayvar = array([0.125*i for i in range(-500, 500)])
+        my_comp.arrayvar[7] = 1.0/3.0
+        my_comp.singleint = array(range(1000))
+
+        sb.set_filename(self.filename)
+        sb.add_group('Test')
+        sb.add_var("arrayvar")
+        sb.add_var("singleint")
+        sb.generate()
+
+        # Split the arrays over several lines, as a code would write them.
+        f = open(self.filename, 'r')
+        contents = f.read().replace('5, ', '5,\n    ')
+        f.close()
+
+        outfile = open(self.filename, 'w')
+        outfile.write(contents)
+        outfile.close()
+
+        new_comp = VarComponent()
+        sb = Namelist(new_comp)
+        sb.set_filename(self.filename)
+        sb.parse_file()
+        sb.load_model()
+
+        self.assertEqual(new_comp.arrayvar.tolist(), my_comp.arrayvar.tolist())
+        self.assertEqual(new_comp.singleint.tolist(), range(1000))
+        self.assertEqual(type(new_comp.singleint[2]), numpy_int32)
+
     def test_unsupported_array(self):
         
         my_comp = VarComponent()